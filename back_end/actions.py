@@ -0,0 +1,165 @@
+"""
+アクションの登録
+アクション名から、実行する関数とその性質（書き込みか、重さ、タイムアウト、キャッシュ・バッチの可否）を引く
+性質は ACTION_TABLE に書き、関数は back_end.functions が register_action で結び付ける
+"""
+
+from typing import Any, Callable, Dict
+
+# 重さの区分
+COST_LIGHT = "light"  # 索引を引くだけの読み書き
+COST_HEAVY = "heavy"  # 全件の読み書きやファイルの入出力
+COST_CPU = "cpu"  # CPU を使う計算（別プロセスで実行してよい）
+
+# 複数のリクエストをまとめて送るアクション
+BATCH_ACTION = "batch"
+
+# 応答を待つ時間（秒。フロントエンドは action_timeout() / request_timeout() で引く）
+DEFAULT_TIMEOUT = 10.0
+IMPORT_TIMEOUT = 30.0
+
+
+class ActionSpec:
+    """
+    1つのアクションの定義
+
+    Attributes:
+        name: アクション名（リクエストの action）
+        handler: payload を受け取りレスポンスを返す関数（register_action で結び付くまでは None）
+        write: 予定を書き換えるか（書き込みスレッドで直列に実行し、データバージョンを進める）
+        cost: 重さの区分（COST_LIGHT / COST_HEAVY / COST_CPU。Dispatcher が実行先を選ぶのに使う）
+        timeout: フロントエンドが応答を待つ時間（秒）
+        cacheable: 同じデータバージョンの間は結果を使い回してよいか
+        batchable: batch にまとめて送ってよいか
+    """
+
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[dict], dict] | None,
+        write: bool = False,
+        cost: str = COST_LIGHT,
+        timeout: float = DEFAULT_TIMEOUT,
+        cacheable: bool = False,
+        batchable: bool = True,
+    ):
+        self.name = name
+        self.handler = handler
+        self.write = write
+        self.cost = cost
+        self.timeout = timeout
+        self.cacheable = cacheable
+        self.batchable = batchable
+
+    def describe(self) -> Dict[str, Any]:
+        """関数を除いた定義を dict で返す（list_actions のレスポンス用）"""
+        return {
+            "name": self.name,
+            "write": self.write,
+            "cost": self.cost,
+            "timeout": self.timeout,
+            "cacheable": self.cacheable,
+            "batchable": self.batchable,
+        }
+
+
+# アクションの性質（ActionSpec の既定値と異なるものだけ）。
+# フロントエンドもここを引くので、back_end.functions を読み込まなくても分かるようにする
+ACTION_TABLE: Dict[str, Dict[str, Any]] = {
+    "add_schedule": {"write": True},
+    "update_schedule": {"write": True},
+    "delete_schedule": {"write": True},
+    "import_schedules": {
+        "write": True,
+        "cost": COST_HEAVY,
+        "timeout": IMPORT_TIMEOUT,
+        "batchable": False,
+    },
+    "get_schedule": {"cacheable": True},
+    "get_monthly_schedule": {"cacheable": True},
+    "get_monthly_schedule_by_mode": {"cacheable": True},
+    "get_month_density": {"cacheable": True},
+    "get_all_schedules": {"cost": COST_HEAVY, "cacheable": True},
+    "export_schedules": {
+        "cost": COST_HEAVY,
+        "timeout": IMPORT_TIMEOUT,
+        "batchable": False,
+    },
+    "calc_payroll": {"cost": COST_CPU},
+    "calc_wage": {"cacheable": True},
+    "get_payroll_summary": {"cacheable": True},
+    "list_actions": {},
+    "get_cache_stats": {},
+    BATCH_ACTION: {"batchable": False},
+}
+
+# アクション名 → 定義（handler は back_end.functions の読み込み時に register_action で結び付く）
+ACTIONS: Dict[str, ActionSpec] = {
+    name: ActionSpec(name, None, **options) for name, options in ACTION_TABLE.items()
+}
+
+
+def register_action(name: str):
+    """
+    関数を ACTION_TABLE のアクションの handler にするデコレータ
+
+    例:
+        @register_action("add_schedule")
+        def add_schedule(payload: dict) -> dict: ...
+
+    Args:
+        name: アクション名（ACTION_TABLE に載っていること）
+    """
+
+    def decorator(handler: Callable[[dict], dict]) -> Callable[[dict], dict]:
+        spec = ACTIONS.get(name)
+        if spec is None:
+            raise ValueError(f"action not declared in ACTION_TABLE: {name}")
+        if spec.handler is not None:
+            raise ValueError(f"action already registered: {name}")
+        spec.handler = handler
+        return handler
+
+    return decorator
+
+
+def get_action(name) -> ActionSpec | None:
+    """アクションの定義（無ければ None）"""
+    return ACTIONS.get(name)
+
+
+def write_actions() -> frozenset:
+    """予定を書き換えるアクション名の集合"""
+    return frozenset(name for name, spec in ACTIONS.items() if spec.write)
+
+
+def action_timeout(name) -> float:
+    """アクションの応答を待つ時間（秒。未登録なら DEFAULT_TIMEOUT）"""
+    spec = ACTIONS.get(name)
+    return spec.timeout if spec is not None else DEFAULT_TIMEOUT
+
+
+def is_batch(payload: dict) -> bool:
+    """batch（複数のリクエストをまとめたもの）か"""
+    return payload.get("action") == BATCH_ACTION
+
+
+def request_timeout(payload: dict) -> float:
+    """リクエストの応答を待つ時間（秒。batch は中のリクエストのうち最も長いもの）"""
+    timeout = action_timeout(payload.get("action"))
+    if is_batch(payload) and isinstance(payload.get("requests"), list):
+        for sub in payload["requests"]:
+            if isinstance(sub, dict):
+                timeout = max(timeout, request_timeout(sub))
+    return timeout
+
+
+def is_write(payload: dict) -> bool:
+    """予定を書き換えるリクエストか（batch は書き込みを1件でも含むか）"""
+    if is_batch(payload):
+        requests = payload.get("requests")
+        return isinstance(requests, list) and any(
+            isinstance(r, dict) and is_write(r) for r in requests
+        )
+    spec = ACTIONS.get(payload.get("action"))
+    return spec is not None and spec.write
@@ -0,0 +1,66 @@
+"""
+データベース接続の管理
+
+peewee の SqliteDatabase はスレッドごとに別の接続を持つ（thread_safe=True）。
+ここでは、その接続をスレッドごとに開いたまま使い回し（PRAGMA は開くたびに
+db.py の PRAGMAS が適用される）、スキーマの確認はプロセスで1回だけ行う。
+WAL モードなので、書き込み中でも他のスレッドの接続から読み込める。
+"""
+
+import threading
+from contextlib import contextmanager
+
+from back_end.db.db import db
+from back_end.db.init import ensure_schema
+
+# スキーマ（日付バケット・給料集計のトリガー等）を確認済みか
+_schema_ready = False
+_schema_lock = threading.Lock()
+
+
+def open_connection() -> bool:
+    """
+    このスレッドの接続を開き（開いていればそのまま使う）、初回だけスキーマを確認する
+
+    Returns:
+        bool: この呼び出しで接続を開いたか
+    """
+    global _schema_ready
+    opened = db.connect(reuse_if_open=True)
+    if not _schema_ready:
+        with _schema_lock:
+            if not _schema_ready:
+                ensure_schema()
+                _schema_ready = True
+    return bool(opened)
+
+
+def close_connection() -> None:
+    """このスレッドの接続を閉じる（開いていなければ何もしない）"""
+    if not db.is_closed():
+        db.close()
+
+
+def reset_schema_state() -> None:
+    """次に接続を開いたときにスキーマを確認し直す（db.init で接続先を替えたとき用）"""
+    global _schema_ready
+    with _schema_lock:
+        _schema_ready = False
+
+
+@contextmanager
+def connection_scope(close: bool = False):
+    """
+    このスレッドの接続を使う区間
+
+    Args:
+        close: True なら、この区間で開いた接続を抜けるときに閉じる
+            （スレッドを使い捨てるときや、初期化処理など）。
+            False なら開いたまま次のリクエストで使い回す
+    """
+    opened = open_connection()
+    try:
+        yield db
+    finally:
+        if close and opened:
+            close_connection()
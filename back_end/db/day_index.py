@@ -0,0 +1,112 @@
+"""
+日付バケットによる区間インデックスの管理
+schedule テーブルのトリガーで schedule_day を自動的に保守する
+"""
+
+from datetime import datetime, timedelta
+
+from back_end.db.db import db as _default_db
+
+# 1件の予定がまたげる最大日数（day_offset テーブルの行数。約100年）
+MAX_SPAN_DAYS = 36600
+# 給料集計（payroll_summary）は1時間ごとの枠の番号にも day_offset を使うので、
+# 1件の予定の最後の枠は最初の枠から MAX_SPAN_HOURS 時間先まで（約4年）
+MAX_SPAN_HOURS = MAX_SPAN_DAYS
+
+
+def exceeds_max_span(start: datetime, end: datetime) -> bool:
+    """
+    予定が day_offset で展開できる長さを超えるか
+
+    超える予定は schedule_day・payroll_summary から日や時間が黙って欠けるので、
+    登録前にこれで弾く。
+    """
+    first_hour = start.replace(minute=0, second=0, microsecond=0)
+    last_hour = (end - timedelta(minutes=1)).replace(minute=0, second=0, microsecond=0)
+    return last_hour - first_hour > timedelta(hours=MAX_SPAN_HOURS)
+
+_EXPAND_DAYS = """
+    SELECT date({alias}.start_date, '+' || o.n || ' days'), {alias}.id
+    FROM day_offset AS o
+    WHERE o.n <= CAST(julianday({alias}.end_date) - julianday({alias}.start_date) AS INTEGER)
+"""
+
+_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS schedule_day_after_insert AFTER INSERT ON schedule
+    BEGIN
+        INSERT OR IGNORE INTO schedule_day (day, schedule_id)
+        {_EXPAND_DAYS.format(alias="NEW")};
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS schedule_day_after_update
+    AFTER UPDATE OF start_date, end_date ON schedule
+    BEGIN
+        DELETE FROM schedule_day WHERE schedule_id = OLD.id;
+        INSERT OR IGNORE INTO schedule_day (day, schedule_id)
+        {_EXPAND_DAYS.format(alias="NEW")};
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS schedule_day_after_delete AFTER DELETE ON schedule
+    BEGIN
+        DELETE FROM schedule_day WHERE schedule_id = OLD.id;
+    END
+    """,
+]
+
+
+def install_day_index(database=None) -> None:
+    """
+    day_offset（0〜MAX_SPAN_DAYS の連番）とトリガーを作成し、
+    既存データのバケットが無ければ作り直す（既存の my_database.db の移行）
+
+    Args:
+        database: 対象のデータベース（省略時は back_end.db.db.db）
+    """
+    db = database or _default_db
+    with db.atomic():
+        db.execute_sql("CREATE TABLE IF NOT EXISTS day_offset (n INTEGER PRIMARY KEY)")
+        count = db.execute_sql("SELECT COUNT(*) FROM day_offset").fetchone()[0]
+        if count != MAX_SPAN_DAYS + 1:
+            db.execute_sql(
+                """
+                INSERT OR IGNORE INTO day_offset (n)
+                WITH RECURSIVE c(n) AS (SELECT 0 UNION ALL SELECT n + 1 FROM c WHERE n < ?)
+                SELECT n FROM c
+                """,
+                (MAX_SPAN_DAYS,),
+            )
+        for sql in _TRIGGERS:
+            db.execute_sql(sql)
+
+        has_schedules = db.execute_sql("SELECT EXISTS (SELECT 1 FROM schedule)").fetchone()[0]
+        has_buckets = db.execute_sql(
+            "SELECT EXISTS (SELECT 1 FROM schedule_day)"
+        ).fetchone()[0]
+        if has_schedules and not has_buckets:
+            rebuild_day_index(db)
+
+
+def rebuild_day_index(database=None) -> int:
+    """
+    schedule テーブルから schedule_day を作り直す（整合性の回復用）
+
+    Args:
+        database: 対象のデータベース（省略時は back_end.db.db.db）
+
+    Returns:
+        int: 作成したバケット行数
+    """
+    db = database or _default_db
+    with db.atomic():
+        db.execute_sql("DELETE FROM schedule_day")
+        cursor = db.execute_sql(
+            "INSERT OR IGNORE INTO schedule_day (day, schedule_id) "
+            + _EXPAND_DAYS.replace(
+                # CROSS JOIN で schedule を外側に固定し、day_offset は範囲検索にする
+                "FROM day_offset AS o", "FROM schedule AS s CROSS JOIN day_offset AS o"
+            ).format(alias="s")
+        )
+        return cursor.rowcount
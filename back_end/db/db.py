@@ -1,8 +1,29 @@
-from peewee import SqliteDatabase, Model, DateField, CharField, AutoField, TimeField
+from peewee import (
+    SqliteDatabase,
+    Model,
+    DateField,
+    CharField,
+    AutoField,
+    TimeField,
+    IntegerField,
+    CompositeKey,
+)
 import os
 
-# データベース接続の定義
-db = SqliteDatabase("my_database.db", timeout=10.0)
+# 接続を開くたびに適用する PRAGMA
+PRAGMAS = {
+    # 書き込み中も読み込みを止めない（読み手は書き込み前のスナップショットを読む）
+    "journal_mode": "wal",
+    # WAL では NORMAL でもコミット済みのデータは壊れない（fsync はチェックポイント時）
+    "synchronous": "normal",
+    # ページキャッシュ 16MB（負の値は KiB 単位）
+    "cache_size": -16 * 1024,
+    "mmap_size": 64 * 1024 * 1024,
+    "temp_store": "memory",
+}
+
+# データベース接続の定義（接続はスレッドごと。管理は back_end/db/connection.py）
+db = SqliteDatabase("my_database.db", timeout=10.0, pragmas=PRAGMAS)
 
 
 def is_database_exists() -> bool:
@@ -19,5 +40,47 @@ class Schedule(Model):
     end_date = DateField()
     end_time = TimeField()
 
+    # 日付・月での絞り込みは schedule_day（ScheduleDay）経由で行うので、
+    # 日付範囲の複合インデックスは持たない
+    class Meta:
+        database = db
+
+
+class ScheduleDay(Model):
+    """
+    予定が重なる日ごとのバケット（日付 → 予定ID の区間インデックス）
+
+    「ある日・ある月に重なる予定」を day の範囲検索だけで求めるための補助テーブル。
+    行の追加・更新・削除は schedule テーブルのトリガーが行う（back_end/db/day_index.py）。
+    """
+
+    day = DateField()
+    schedule_id = IntegerField()
+
+    class Meta:
+        database = db
+        table_name = "schedule_day"
+        primary_key = CompositeKey("day", "schedule_id")
+        without_rowid = True
+        indexes = ((("schedule_id",), False),)
+
+
+class PayrollSummary(Model):
+    """
+    バイト（mode B）の勤務分数を日・時間帯ごとに集計したテーブル
+
+    シフトを実際に働いた日 (work_date) と時 (hour, 0〜23) に分けて分数を足し込む。
+    深夜時間帯は時単位で設定するので、月・年の勤務時間と深夜時間は
+    この表の範囲集計だけで求まる。保守は schedule テーブルのトリガーが行う
+    （back_end/db/payroll_summary.py）。
+    """
+
+    work_date = DateField()
+    hour = IntegerField()
+    minutes = IntegerField(default=0)
+
     class Meta:
         database = db
+        table_name = "payroll_summary"
+        primary_key = CompositeKey("work_date", "hour")
+        without_rowid = True
@@ -1,16 +1,48 @@
 from peewee import SqliteDatabase
-from back_end.db.db import db, Schedule
+from back_end.db.db import db, Schedule, ScheduleDay, PayrollSummary
+from back_end.db.day_index import install_day_index
+from back_end.db.payroll_summary import install_payroll_summary
 
 MODELS = [
     Schedule,
+    ScheduleDay,
+    PayrollSummary,
 ]
 
+# 日付バケット導入前に作っていた、今はどのクエリも使わない複合インデックス
+OBSOLETE_INDEXES = (
+    "schedule_start_date_end_date_start_time",
+    "schedule_mode_start_date_end_date",
+)
+
 def initialize_database():
-    """Initialize database tables"""
+    """Initialize database tables
+
+    create_tables(safe=True) は既存のテーブルを残したまま、足りないインデックスだけを
+    CREATE INDEX IF NOT EXISTS で追加し、使わなくなったインデックスは削除するので、
+    既存の my_database.db もそのまま移行される。
+    """
     try:
-        db.connect(reuse_if_open=True)
-        db.create_tables(MODELS, safe=True)
-        db.close()
+        opened = db.connect(reuse_if_open=True)
+        ensure_schema()
+        # 追加したインデックスの統計情報をクエリプランナーに反映する
+        db.execute_sql("PRAGMA optimize")
+        # 呼び出し側で開いていた接続は閉じない
+        if opened:
+            db.close()
     except Exception as e:
         print(f"Database initialization failed: {e}")
-        raise
\ No newline at end of file
+        raise
+
+
+def ensure_schema():
+    """
+    テーブル・インデックスと日付バケット・給料集計のトリガーを作成する（何度呼んでもよい）
+
+    接続済みの状態で呼ぶこと。schedule_day / payroll_summary が空なら既存の予定から作り直す。
+    """
+    db.create_tables(MODELS, safe=True)
+    for name in OBSOLETE_INDEXES:
+        db.execute_sql(f"DROP INDEX IF EXISTS {name}")
+    install_day_index()
+    install_payroll_summary()
@@ -0,0 +1,174 @@
+"""
+給料集計テーブル（payroll_summary）の管理
+schedule テーブルのトリガーで、バイトの勤務分数を日・時間帯ごとに増減させる
+"""
+
+from contextlib import contextmanager
+
+from back_end.db.db import db as _default_db
+
+
+def _stamp(alias: str, side: str) -> str:
+    """SQL 式: 日付・時刻の列から 1970-01-01 0:00 からの通算分"""
+    return (
+        f"(CAST(strftime('%s', {alias}.{side}_date || ' ' || {alias}.{side}_time)"
+        " AS INTEGER) / 60)"
+    )
+
+
+def _hour_slots(source: str, alias: str, sign: str = "") -> str:
+    """
+    SELECT 文: source の各シフトを1時間ごとの枠に分け、(枠, 分数) を返す
+
+    枠 slot は通算の時（通算分 / 60）。分数はシフトと枠 [slot*60, slot*60+60) の重なり。
+    枠の番号は day_offset の連番を使うので、1件のシフトは約4年（MAX_SPAN_HOURS）まで。
+    これより長い予定は登録時に弾く（day_index.exceeds_max_span）。
+    CROSS JOIN でシフト側を外側のループに固定し、day_offset は主キーの範囲検索にする。
+    """
+    # LIMIT -1 はサブクエリの平坦化を防ぎ、strftime をシフトごとに1回だけ評価させる
+    return f"""
+        SELECT x.slot AS slot,
+               {sign}(MIN(x.b, x.slot * 60 + 60) - MAX(x.a, x.slot * 60)) AS minutes
+        FROM (
+            SELECT t.a, t.b, t.a / 60 + o.n AS slot
+            FROM (
+                SELECT {_stamp(alias, "start")} AS a, {_stamp(alias, "end")} AS b
+                FROM {source}
+                LIMIT -1
+            ) AS t
+            CROSS JOIN day_offset AS o
+            WHERE t.b > t.a AND o.n <= (t.b - 1) / 60 - t.a / 60
+        ) AS x
+    """
+
+
+def _apply(alias: str, sign: str = "") -> str:
+    """トリガー本体: alias（NEW / OLD）の行がバイトなら分数を足し込む（sign="-" で引く）"""
+    # トリガー内では FROM に NEW/OLD を書けないので、1行の SELECT で包む
+    source = f"(SELECT 1 WHERE {alias}.mode = 'B')"
+    return f"""
+        INSERT INTO payroll_summary (work_date, hour, minutes)
+        SELECT date(slot * 3600, 'unixepoch'), slot % 24, minutes
+        FROM ({_hour_slots(source, alias, sign)})
+        WHERE 1
+        ON CONFLICT (work_date, hour) DO UPDATE SET minutes = minutes + excluded.minutes;
+    """
+
+
+_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS payroll_summary_after_insert AFTER INSERT ON schedule
+    WHEN NEW.mode = 'B'
+    BEGIN
+        {_apply("NEW")}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS payroll_summary_after_update
+    AFTER UPDATE OF mode, start_date, start_time, end_date, end_time ON schedule
+    WHEN OLD.mode = 'B' OR NEW.mode = 'B'
+    BEGIN
+        {_apply("OLD", "-")}
+        {_apply("NEW")}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS payroll_summary_after_delete AFTER DELETE ON schedule
+    WHEN OLD.mode = 'B'
+    BEGIN
+        {_apply("OLD", "-")}
+    END
+    """,
+]
+
+# 全予定から集計し直した内容（再構築・整合性チェック用）
+_EXPECTED = f"""
+    SELECT date(slot * 3600, 'unixepoch') AS work_date, slot % 24 AS hour, minutes
+    FROM (
+        SELECT slot, SUM(minutes) AS minutes
+        FROM ({_hour_slots("schedule AS s WHERE s.mode = 'B'", "s")})
+        GROUP BY slot
+    )
+"""
+
+
+def install_payroll_summary(database=None) -> None:
+    """
+    給料集計のトリガーを作成し、既存のバイト予定があって集計が空なら作り直す
+    （day_offset を使うので install_day_index の後に呼ぶこと）
+
+    Args:
+        database: 対象のデータベース（省略時は back_end.db.db.db）
+    """
+    db = database or _default_db
+    with db.atomic():
+        for sql in _TRIGGERS:
+            db.execute_sql(sql)
+
+        has_shifts = db.execute_sql(
+            "SELECT EXISTS (SELECT 1 FROM schedule WHERE mode = 'B')"
+        ).fetchone()[0]
+        has_summary = db.execute_sql(
+            "SELECT EXISTS (SELECT 1 FROM payroll_summary)"
+        ).fetchone()[0]
+        if has_shifts and not has_summary:
+            rebuild_payroll_summary(db)
+
+
+@contextmanager
+def deferred_payroll_summary(database=None):
+    """
+    with ブロックの間はトリガーによる集計を止め、抜けるときにまとめて作り直す
+
+    全件の置き換え（インポート）では、行ごとに集計を更新するより最後に
+    1回の GROUP BY で作り直す方が速い。トリガーの削除・作成もトランザクションに
+    含まれるので、途中で失敗すればトリガーも元に戻る。
+    """
+    db = database or _default_db
+    with db.atomic():
+        for name in ("insert", "update", "delete"):
+            db.execute_sql(f"DROP TRIGGER IF EXISTS payroll_summary_after_{name}")
+        yield
+        rebuild_payroll_summary(db)
+        for sql in _TRIGGERS:
+            db.execute_sql(sql)
+
+
+def rebuild_payroll_summary(database=None) -> int:
+    """
+    schedule テーブルから payroll_summary を作り直す
+
+    Returns:
+        int: 作成した行数
+    """
+    db = database or _default_db
+    with db.atomic():
+        db.execute_sql("DELETE FROM payroll_summary")
+        cursor = db.execute_sql(
+            "INSERT INTO payroll_summary (work_date, hour, minutes) "
+            f"SELECT work_date, hour, minutes FROM ({_EXPECTED})"
+        )
+        return cursor.rowcount
+
+
+def check_payroll_summary(database=None) -> list[tuple[str, int, int, int]]:
+    """
+    payroll_summary と schedule から集計し直した結果を比べる
+
+    Returns:
+        list: 食い違う (日付, 時, 表の分数, 正しい分数) の一覧（空なら整合している）
+    """
+    db = database or _default_db
+    cursor = db.execute_sql(
+        f"""
+        SELECT work_date, hour, SUM(stored), SUM(expected) FROM (
+            SELECT work_date, hour, minutes AS stored, 0 AS expected FROM payroll_summary
+            UNION ALL
+            SELECT work_date, hour, 0, minutes FROM ({_EXPECTED})
+        )
+        GROUP BY work_date, hour
+        HAVING SUM(stored) != SUM(expected)
+        ORDER BY work_date, hour
+        """
+    )
+    return [tuple(row) for row in cursor.fetchall()]
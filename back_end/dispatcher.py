@@ -0,0 +1,127 @@
+"""
+リクエストの振り分け
+バックエンドのアクションを Tk のスレッドの外で実行する（読み込みは並列、書き込みは直列）
+"""
+
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+from back_end import functions
+from back_end.actions import COST_CPU, COST_HEAVY, get_action, is_write
+from back_end.writer import ScheduleWriter
+
+# 読み込みを並列に実行するスレッド数（各スレッドが自分の接続を持つ）
+READ_WORKERS = 4
+# 全件を読む重いアクションを実行するスレッド数（軽い読み込みのスレッドを塞がない）
+HEAVY_WORKERS = 1
+# CPU を使うアクションを実行するプロセス数（0 なら読み込み用のスレッドで実行する）
+CPU_WORKERS = 2
+
+
+def _handle_in_process(payload: dict) -> dict:
+    """別プロセスで handle_request を実行する（接続はそのプロセスで開く）"""
+    return functions.handle_request(payload)
+
+
+class Dispatcher:
+    """
+    アクションの種類ごとに実行先を選ぶ
+
+    - 書き込み: ScheduleWriter の専用スレッド（直列。続く書き込みは1トランザクション）
+    - 書き込みが残っている間の読み込み: 同じ書き込みスレッドの後ろ（書き込み後の内容を返す）
+    - cost が COST_CPU のアクション: ProcessPoolExecutor（GIL を避ける）
+    - cost が COST_HEAVY の読み込み: 専用の ThreadPoolExecutor（一覧・エクスポートが続いても、
+      日・月の表示の読み込みを待たせない）
+    - その他の読み込み: ThreadPoolExecutor で並列に実行
+
+    submit() はどれも Future を返す。完了はワーカーのスレッドで起きるので、
+    Tk に戻すときはキューや after() を介すこと。
+    """
+
+    def __init__(
+        self,
+        read_workers: int = READ_WORKERS,
+        cpu_workers: int = CPU_WORKERS,
+        writer: ScheduleWriter | None = None,
+        heavy_workers: int = HEAVY_WORKERS,
+    ):
+        self.writer = writer or ScheduleWriter()
+        self._reads = ThreadPoolExecutor(
+            max_workers=read_workers, thread_name_prefix="backend-read"
+        )
+        self._heavy = ThreadPoolExecutor(
+            max_workers=heavy_workers, thread_name_prefix="backend-heavy"
+        )
+        self._cpu_workers = cpu_workers
+        self._cpu: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._pending = 0
+
+    def start(self) -> "Dispatcher":
+        self.writer.start()
+        return self
+
+    def shutdown(self, timeout: float | None = None) -> None:
+        """実行中・待機中のリクエストを処理し終えてから止める"""
+        self.writer.stop(timeout)
+        self._reads.shutdown(wait=True)
+        self._heavy.shutdown(wait=True)
+        if self._cpu is not None:
+            self._cpu.shutdown(wait=True)
+
+    def pending(self) -> int:
+        """完了していないリクエストの件数"""
+        with self._lock:
+            return self._pending
+
+    def submit(self, payload: dict) -> Future:
+        """リクエストを実行先に渡し、レスポンスで完了する Future を返す"""
+        spec = get_action(payload.get("action"))
+        if is_write(payload) or self.writer.pending():
+            future = self.writer.submit(payload)
+        elif spec is not None and spec.cost == COST_CPU and self._cpu_workers > 0:
+            future = self._submit_cpu(payload)
+        elif spec is not None and spec.cost == COST_HEAVY:
+            future = self._heavy.submit(functions.handle_request, payload)
+        else:
+            future = self._reads.submit(functions.handle_request, payload)
+
+        with self._lock:
+            self._pending += 1
+        future.add_done_callback(self._on_done)
+        return future
+
+    def _on_done(self, _future: Future) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    def _submit_cpu(self, payload: dict) -> Future:
+        # データバージョンはこのプロセスのもの（送信時点の値）を付ける
+        version = functions.data_version()
+        result: Future = Future()
+
+        def _done(f: Future) -> None:
+            try:
+                resp = f.result()
+            except Exception as e:
+                resp = {
+                    "ok": False,
+                    "action": payload.get("action") or "unknown",
+                    "error": {"code": "EXCEPTION", "message": str(e)},
+                }
+            resp["data_version"] = version
+            result.set_result(resp)
+
+        self._cpu_pool().submit(_handle_in_process, payload).add_done_callback(_done)
+        return result
+
+    def _cpu_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._cpu is None:
+                # Tk やワーカーのスレッドがいるので fork ではなく spawn で起動する
+                self._cpu = ProcessPoolExecutor(
+                    max_workers=self._cpu_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._cpu
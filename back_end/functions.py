@@ -1,7 +1,83 @@
+import json
+import sqlite3
+import threading
+import time as _time
 from datetime import datetime, date, time
+from functools import lru_cache
 from typing import Dict, Any, List, cast
 
-from back_end.db.db import db, Schedule, is_database_exists
+from peewee import Case, fn
+
+from back_end.db.db import (
+    db,
+    Schedule,
+    ScheduleDay,
+    PayrollSummary,
+    is_database_exists,
+)
+from back_end.actions import (
+    ACTIONS,
+    BATCH_ACTION,
+    get_action,
+    is_batch,
+    is_write,
+    register_action,
+)
+from back_end.db.connection import connection_scope, open_connection
+from back_end.db.day_index import MAX_SPAN_HOURS, exceeds_max_span
+from back_end.result_cache import cache_key, result_cache
+from back_end.db.payroll_summary import deferred_payroll_summary
+from back_end.payroll import (
+    calculate_payroll,
+    calculate_payroll_minutes,
+    DEFAULT_WAGE,
+    DEFAULT_NIGHT_RATE,
+    DEFAULT_NIGHT_START,
+    DEFAULT_NIGHT_END,
+)
+from ipc.atomic import atomic_open
+
+# import_schedules で一括 INSERT する列（この順で値を並べる）
+IMPORT_FIELDS = (
+    Schedule.mode,
+    Schedule.name,
+    Schedule.start_date,
+    Schedule.start_time,
+    Schedule.end_date,
+    Schedule.end_time,
+)
+
+# export_schedules でまとめて書き込む行数
+EXPORT_CHUNK_SIZE = 1000
+
+# batch 1回に含められるリクエストの上限
+MAX_BATCH_REQUESTS = 64
+
+# 日付バケット・給料集計で展開できない長さの予定を弾くときのメッセージ
+SPAN_TOO_LONG = f"schedule must not span more than {MAX_SPAN_HOURS} hours"
+
+# データバージョン（全レスポンスに data_version として付ける）。
+# 起動時刻（マイクロ秒）から始めるので、再起動しても前より小さくならない
+_data_version = _time.time_ns() // 1000
+_data_version_lock = threading.Lock()
+
+
+def data_version() -> int:
+    """現在のデータバージョンを返す"""
+    return _data_version
+
+
+def _bump_data_version() -> int:
+    """予定の書き込み後にデータバージョンを進める"""
+    global _data_version
+    with _data_version_lock:
+        _data_version += 1
+        return _data_version
+
+
+def _connect() -> None:
+    """このスレッドの接続を開き、初回だけスキーマ（日付バケットのトリガー等）を確認する"""
+    open_connection()
 
 
 def ok(action: str, data: Dict[str, Any]) -> Dict[str, Any]:
@@ -30,6 +106,79 @@ def schedule_to_dict(s: Schedule) -> Dict[str, Any]:
     }
 
 
+@lru_cache(maxsize=4096)
+def _parse_date(value: str) -> date:
+    """YYYY-MM-DD を date に変換（インポートでは同じ日付が繰り返し現れるのでキャッシュする）"""
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+@lru_cache(maxsize=2048)
+def _parse_time(value: str) -> time:
+    """HH:MM を time に変換（同上）"""
+    return datetime.strptime(value, "%H:%M").time()
+
+
+def _schedule_ids_between(first_day: date, last_day: date):
+    """期間 [first_day, last_day] に1日でも重なる予定IDのサブクエリ（日付バケットの範囲検索）"""
+    return (
+        ScheduleDay.select(ScheduleDay.schedule_id)
+        .where(ScheduleDay.day.between(first_day, last_day))
+        .distinct()
+    )
+
+
+def _travel_snapshot(payload: dict) -> tuple[int, int] | None:
+    """
+    リクエストに付いた移動時間の設定 {"commute_time", "school_time"}（分）を取り出す
+
+    Raises:
+        ValueError: 値が整数でない場合
+    """
+    travel = payload.get("travel")
+    if travel is None:
+        return None
+    return int(travel.get("commute_time", 0)), int(travel.get("school_time", 0))
+
+
+def _travel_dict(travel: tuple[int, int] | None) -> Dict[str, int] | None:
+    if travel is None:
+        return None
+    return {"commute_time": travel[0], "school_time": travel[1]}
+
+
+def _with_minutes(query, travel: tuple[int, int] | None):
+    """
+    予定のクエリに、開始・終了の通算分（1970-01-01 0:00 から）と、
+    travel があれば外出時刻（開始から A は通学時間、それ以外は通勤時間を引いた HH:MM）の列を足す
+    """
+    start = _epoch_minutes(Schedule.start_date, Schedule.start_time)
+    columns = [
+        start.alias("start_minutes"),
+        _epoch_minutes(Schedule.end_date, Schedule.end_time).alias("end_minutes"),
+    ]
+    if travel is not None:
+        commute, school = travel
+        departure = start - Case(None, [(Schedule.mode == "A", school)], commute)
+        columns.append(
+            fn.strftime("%H:%M", departure * 60, "unixepoch").alias("departure_time")
+        )
+    return query.select_extend(*columns)
+
+
+def _schedules_with_minutes(query, travel: tuple[int, int] | None) -> List[Dict[str, Any]]:
+    """_with_minutes のクエリ結果を schedule_to_dict の形に追加の列を足して返す"""
+    schedules = []
+    for s in query:
+        sc = schedule_to_dict(s)
+        sc["start_minutes"] = s.start_minutes
+        sc["end_minutes"] = s.end_minutes
+        if travel is not None:
+            sc["departure_time"] = s.departure_time
+        schedules.append(sc)
+    return schedules
+
+
+@register_action("add_schedule")
 def add_schedule(payload: dict) -> dict:
     action = "add_schedule"
 
@@ -44,7 +193,10 @@ def add_schedule(payload: dict) -> dict:
     if datetime.combine(ed, et) <= datetime.combine(sd, st):
         return ng(action, "VALIDATION_ERROR", "end must be after start")
 
-    db.connect(reuse_if_open=True)
+    if exceeds_max_span(datetime.combine(sd, st), datetime.combine(ed, et)):
+        return ng(action, "BAD_REQUEST", SPAN_TOO_LONG)
+
+    _connect()
     with db.atomic():
         s = Schedule.create(
             mode=payload.get("mode"),
@@ -58,6 +210,7 @@ def add_schedule(payload: dict) -> dict:
     return ok(action, {"schedule": schedule_to_dict(s)})
 
 
+@register_action("get_schedule")
 def get_schedule(payload: dict) -> dict:
     action = "get_schedule"
 
@@ -72,22 +225,32 @@ def get_schedule(payload: dict) -> dict:
     except Exception:
         return ng(action, "BAD_REQUEST", "invalid date format")
 
-    db.connect(reuse_if_open=True)
+    try:
+        travel = _travel_snapshot(payload)
+    except Exception:
+        return ng(action, "BAD_REQUEST", "invalid travel settings")
+
+    _connect()
 
+    # 日付バケットの主キー (day, schedule_id) を1点検索して、その日に重なる予定だけを引く
     query = (
-        Schedule.select()
-        .where(
-            (Schedule.start_date <= target_date) & (Schedule.end_date >= target_date)
-        )
+        _with_minutes(Schedule.select(), travel)
+        .join(ScheduleDay, on=(ScheduleDay.schedule_id == Schedule.id))
+        .where(ScheduleDay.day == target_date)
         .order_by(Schedule.start_time)
     )
 
     return ok(
         action,
-        {"date": payload["date"], "schedules": [schedule_to_dict(s) for s in query]},
+        {
+            "date": payload["date"],
+            "schedules": _schedules_with_minutes(query, travel),
+            "travel": _travel_dict(travel),
+        },
     )
 
 
+@register_action("delete_schedule")
 def delete_schedule(payload: dict) -> dict:
     action = "delete_schedule"
 
@@ -97,7 +260,7 @@ def delete_schedule(payload: dict) -> dict:
     if "id" not in payload:
         return ng(action, "BAD_REQUEST", "id required")
 
-    db.connect(reuse_if_open=True)
+    _connect()
 
     s = Schedule.get_or_none(Schedule.id == payload["id"])
     if not s:
@@ -107,6 +270,7 @@ def delete_schedule(payload: dict) -> dict:
     return ok(action, {"deleted": payload["id"]})
 
 
+@register_action("update_schedule")
 def update_schedule(payload: dict) -> dict:
     action = "update_schedule"
 
@@ -132,7 +296,10 @@ def update_schedule(payload: dict) -> dict:
     if datetime.combine(ed, et) <= datetime.combine(sd, st):
         return ng(action, "VALIDATION_ERROR", "end must be after start")
 
-    db.connect(reuse_if_open=True)
+    if exceeds_max_span(datetime.combine(sd, st), datetime.combine(ed, et)):
+        return ng(action, "BAD_REQUEST", SPAN_TOO_LONG)
+
+    _connect()
 
     s = Schedule.get_or_none(Schedule.id == schedule_id)
     if not s:
@@ -150,6 +317,7 @@ def update_schedule(payload: dict) -> dict:
     return ok(action, {"schedule": schedule_to_dict(s)})
 
 
+@register_action("get_monthly_schedule_by_mode")
 def get_monthly_schedule_by_mode(payload: dict, mode: str = "B") -> dict:
     action = "get_monthly_schedule_by_mode"
 
@@ -168,7 +336,7 @@ def get_monthly_schedule_by_mode(payload: dict, mode: str = "B") -> dict:
     if month < 1 or month > 12:
         return ng(action, "BAD_REQUEST", "month must be between 1 and 12")
 
-    db.connect(reuse_if_open=True)
+    _connect()
 
     # 月の最初の日と最後の日を計算
     import calendar
@@ -181,10 +349,7 @@ def get_monthly_schedule_by_mode(payload: dict, mode: str = "B") -> dict:
         Schedule.select()
         .where(
             (Schedule.mode == mode)
-            & (
-                # スケジュールが月の範囲内に含まれる
-                ((Schedule.start_date <= last_day) & (Schedule.end_date >= first_day))
-            )
+            & Schedule.id.in_(_schedule_ids_between(first_day, last_day))
         )
         .order_by(Schedule.start_date, Schedule.start_time)
     )
@@ -200,6 +365,7 @@ def get_monthly_schedule_by_mode(payload: dict, mode: str = "B") -> dict:
     )
 
 
+@register_action("get_monthly_schedule")
 def get_monthly_schedule(payload: dict) -> dict:
     """月全体の予定を取得（モード指定なし）"""
     action = "get_monthly_schedule"
@@ -219,7 +385,12 @@ def get_monthly_schedule(payload: dict) -> dict:
     if month < 1 or month > 12:
         return ng(action, "BAD_REQUEST", "month must be between 1 and 12")
 
-    db.connect(reuse_if_open=True)
+    try:
+        travel = _travel_snapshot(payload)
+    except Exception:
+        return ng(action, "BAD_REQUEST", "invalid travel settings")
+
+    _connect()
 
     # 月の最初の日と最後の日を計算
     import calendar
@@ -229,8 +400,8 @@ def get_monthly_schedule(payload: dict) -> dict:
 
     # 指定された月に含まれる全てのスケジュールを取得
     query = (
-        Schedule.select()
-        .where((Schedule.start_date <= last_day) & (Schedule.end_date >= first_day))
+        _with_minutes(Schedule.select(), travel)
+        .where(Schedule.id.in_(_schedule_ids_between(first_day, last_day)))
         .order_by(Schedule.start_date, Schedule.start_time)
     )
 
@@ -239,11 +410,75 @@ def get_monthly_schedule(payload: dict) -> dict:
         {
             "year": year,
             "month": month,
-            "schedules": [schedule_to_dict(s) for s in query],
+            "schedules": _schedules_with_minutes(query, travel),
+            "travel": _travel_dict(travel),
         },
     )
 
 
+# get_month_density の modes ビット（予定のモードごと）
+MODE_BITS = {"A": 1, "B": 2}
+MODE_BIT_OTHER = 4
+
+
+@register_action("get_month_density")
+def get_month_density(payload: dict) -> dict:
+    """
+    月の各日の予定件数とモードのビットマスクだけを返す（カレンダーの色付け用）
+
+    modes は A=1, B=2, その他=4 の OR。予定のある日だけを返す。
+    """
+    action = "get_month_density"
+
+    if not is_database_exists():
+        return ng(action, "DATABASE_NOT_FOUND", "database not initialized")
+
+    if "year" not in payload or "month" not in payload:
+        return ng(action, "BAD_REQUEST", "year and month required")
+
+    try:
+        year = int(payload["year"])
+        month = int(payload["month"])
+    except Exception:
+        return ng(action, "BAD_REQUEST", "invalid year or month format")
+
+    if month < 1 or month > 12:
+        return ng(action, "BAD_REQUEST", "month must be between 1 and 12")
+
+    _connect()
+
+    import calendar
+
+    first_day = date(year, month, 1)
+    last_day = date(year, month, calendar.monthrange(year, month)[1])
+
+    bits = [
+        fn.MAX(Case(None, [(Schedule.mode == mode, bit)], 0))
+        for mode, bit in MODE_BITS.items()
+    ]
+    other = fn.MAX(
+        Case(None, [(Schedule.mode.in_(list(MODE_BITS)), 0)], MODE_BIT_OTHER)
+    )
+    query = (
+        ScheduleDay.select(ScheduleDay.day, fn.COUNT(Schedule.id), *bits, other)
+        .join(Schedule, on=(ScheduleDay.schedule_id == Schedule.id))
+        .where(ScheduleDay.day.between(first_day, last_day))
+        .group_by(ScheduleDay.day)
+        .order_by(ScheduleDay.day)
+        .tuples()
+    )
+
+    days = []
+    for day, count, *mode_bits in query:
+        modes = 0
+        for bit in mode_bits:
+            modes |= bit
+        days.append({"date": day.strftime("%Y-%m-%d"), "count": count, "modes": modes})
+
+    return ok(action, {"year": year, "month": month, "days": days})
+
+
+@register_action("get_all_schedules")
 def get_all_schedules(payload: dict) -> dict:
     """全ての予定を取得（エクスポート用）"""
     action = "get_all_schedules"
@@ -251,7 +486,7 @@ def get_all_schedules(payload: dict) -> dict:
     if not is_database_exists():
         return ng(action, "DATABASE_NOT_FOUND", "database not initialized")
 
-    db.connect(reuse_if_open=True)
+    _connect()
 
     query = Schedule.select().order_by(Schedule.start_date, Schedule.start_time)
 
@@ -263,6 +498,300 @@ def get_all_schedules(payload: dict) -> dict:
     )
 
 
+@register_action("calc_payroll")
+def calc_payroll(payload: dict) -> dict:
+    """
+    シフトの給料を一括計算する
+
+    payload の shifts（予定の配列）を計算する。shifts が無ければ year（と month）の
+    バイト（mode B）の予定を対象にする。month を省略すると1年分になる。
+    期間をまたぐシフトは期間内の部分だけを数える（月ごとの合計が年の合計に一致する）。
+    wage / night_rate / night_start / night_end は省略時に既定値を使う。
+    """
+    action = "calc_payroll"
+
+    try:
+        wage = int(payload.get("wage", DEFAULT_WAGE))
+        night_rate = float(payload.get("night_rate", DEFAULT_NIGHT_RATE))
+        night_start = int(payload.get("night_start", DEFAULT_NIGHT_START))
+        night_end = int(payload.get("night_end", DEFAULT_NIGHT_END))
+    except Exception:
+        return ng(action, "BAD_REQUEST", "invalid wage parameters")
+
+    if "shifts" in payload:
+        shifts = payload["shifts"]
+        if not isinstance(shifts, list):
+            return ng(action, "BAD_REQUEST", "shifts must be a list")
+    else:
+        if not is_database_exists():
+            return ng(action, "DATABASE_NOT_FOUND", "database not initialized")
+        if "year" not in payload:
+            return ng(action, "BAD_REQUEST", "shifts or year required")
+        try:
+            year = int(payload["year"])
+            month = int(payload["month"]) if payload.get("month") else None
+        except Exception:
+            return ng(action, "BAD_REQUEST", "invalid year or month format")
+        if month is not None and (month < 1 or month > 12):
+            return ng(action, "BAD_REQUEST", "month must be between 1 and 12")
+
+        import calendar
+
+        first_day = date(year, month or 1, 1)
+        last_month = month or 12
+        last_day = date(year, last_month, calendar.monthrange(year, last_month)[1])
+
+        # 開始・終了は SQL で通算分の整数にして読む（行ごとに文字列を作って解析し直さない）
+        _connect()
+        rows = (
+            Schedule.select(
+                Schedule.id,
+                Schedule.name,
+                _epoch_minutes(Schedule.start_date, Schedule.start_time),
+                _epoch_minutes(Schedule.end_date, Schedule.end_time),
+            )
+            .where(
+                (Schedule.mode == "B")
+                & Schedule.id.in_(_schedule_ids_between(first_day, last_day))
+            )
+            .order_by(Schedule.start_date, Schedule.start_time)
+            .tuples()
+        )
+        ids, names, t0, t1 = list(zip(*rows)) or ([], [], [], [])
+        result = calculate_payroll_minutes(
+            ids,
+            names,
+            t0,
+            t1,
+            wage,
+            night_rate,
+            night_start,
+            night_end,
+            period=(first_day, last_day),
+        )
+        return ok(action, result)
+
+    try:
+        result = calculate_payroll(shifts, wage, night_rate, night_start, night_end)
+    except (KeyError, TypeError, ValueError):
+        return ng(action, "BAD_REQUEST", "invalid shift date/time format")
+
+    return ok(action, result)
+
+
+def _epoch_minutes(date_field, time_field):
+    """SQL 式: 日付と時刻の列から 1970-01-01 0:00 からの通算分を求める"""
+    stamp = date_field.concat(" ").concat(time_field)
+    return fn.strftime("%s", stamp).cast("INTEGER") / 60
+
+
+@register_action("calc_wage")
+def calc_wage(payload: dict) -> dict:
+    """
+    year / month のバイト（mode B）の給料を日ごとに集計する（MoneyWindow 用）
+
+    get_payroll_summary の月単位版で、month が必須、レスポンスの action が
+    calc_wage_result になる点だけが異なる。
+    """
+    action = "calc_wage_result"
+
+    if "year" not in payload or payload.get("month") in (None, ""):
+        return ng(action, "BAD_REQUEST", "year and month required")
+
+    return _payroll_summary(action, payload)
+
+
+def _wage_summary(rows, wage: int, night_wage: int) -> dict:
+    """
+    (日付, 勤務分, 深夜分) の行から MoneyWindow が表示する形の集計結果を作る
+
+    Returns:
+        dict: wage / night_wage / total_hours / night_hours / total_wage / detail
+    """
+    detail = []
+    total_minutes = total_night = 0
+    for work_date, minutes, night_minutes in rows:
+        normal = minutes - night_minutes
+        detail.append(
+            {
+                "date": work_date.strftime("%Y-%m-%d"),
+                "hours": round(minutes / 60, 2),
+                "night_hours": round(night_minutes / 60, 2),
+                "wage": wage,
+                "amount": round((normal * wage + night_minutes * night_wage) / 60),
+            }
+        )
+        total_minutes += minutes
+        total_night += night_minutes
+
+    total_normal = total_minutes - total_night
+    return {
+        "wage": wage,
+        "night_wage": night_wage,
+        "total_hours": round(total_minutes / 60, 2),
+        "night_hours": round(total_night / 60, 2),
+        "total_wage": round((total_normal * wage + total_night * night_wage) / 60),
+        "detail": detail,
+    }
+
+
+@register_action("get_payroll_summary")
+def get_payroll_summary(payload: dict) -> dict:
+    """
+    給料集計テーブル（payroll_summary）から月・年の勤務時間と給料を求める
+
+    month を省略すると1年分。明細は実際に働いた日ごと（日をまたぐシフトは日で分かれる）。
+    集計テーブルは予定の追加・更新・削除時にトリガーで更新されるので、
+    シフトの件数に関係なく、期間内の日数 × 24 行を読むだけで済む。
+    """
+    return _payroll_summary("get_payroll_summary", payload)
+
+
+def _payroll_summary(action: str, payload: dict) -> dict:
+    """get_payroll_summary / calc_wage の本体（action はレスポンスのアクション名）"""
+    if not is_database_exists():
+        return ng(action, "DATABASE_NOT_FOUND", "database not initialized")
+
+    if "year" not in payload:
+        return ng(action, "BAD_REQUEST", "year required")
+
+    try:
+        year = int(payload["year"])
+        month = (
+            int(payload["month"]) if payload.get("month") not in (None, "") else None
+        )
+        wage = int(payload.get("wage", DEFAULT_WAGE))
+        night_rate = float(payload.get("night_rate", DEFAULT_NIGHT_RATE))
+        night_start = int(payload.get("night_start", DEFAULT_NIGHT_START))
+        night_end = int(payload.get("night_end", DEFAULT_NIGHT_END))
+    except Exception:
+        return ng(action, "BAD_REQUEST", "invalid year, month or wage parameters")
+
+    if month is not None and (month < 1 or month > 12):
+        return ng(action, "BAD_REQUEST", "month must be between 1 and 12")
+
+    _connect()
+
+    import calendar
+
+    first_day = date(year, month or 1, 1)
+    last_month = month or 12
+    last_day = date(year, last_month, calendar.monthrange(year, last_month)[1])
+
+    rows = _summary_by_day(first_day, last_day, night_start, night_end)
+    result = _wage_summary(rows, wage, int(wage * night_rate))
+    return ok(action, {"year": year, "month": month, **result})
+
+
+def _summary_by_day(first_day: date, last_day: date, night_start: int, night_end: int):
+    """
+    給料集計テーブルから、期間内の (働いた日, 勤務分, 深夜分) を日付順に返すクエリ
+
+    Args:
+        night_start: 深夜開始時刻（時）
+        night_end: 深夜終了時刻（時）
+    """
+    # 深夜時間帯は時単位なので、該当する時 (hour) の分数を足せば深夜分になる
+    if night_start > night_end:
+        night_hours = [h for h in range(24) if h >= night_start or h < night_end]
+    elif night_start < night_end:
+        night_hours = list(range(night_start, night_end))
+    else:
+        night_hours = list(range(24))
+
+    minutes = fn.SUM(PayrollSummary.minutes)
+    night = fn.SUM(
+        Case(None, [(PayrollSummary.hour.in_(night_hours), PayrollSummary.minutes)], 0)
+    )
+    return (
+        PayrollSummary.select(PayrollSummary.work_date, minutes, night)
+        .where(PayrollSummary.work_date.between(first_day, last_day))
+        .group_by(PayrollSummary.work_date)
+        .having(minutes > 0)
+        .order_by(PayrollSummary.work_date)
+        .tuples()
+    )
+
+
+def _iter_export_rows():
+    """全予定を開始日時順に1行ずつ dict で返す（結果をまとめてメモリに載せない）"""
+    query = (
+        Schedule.select(
+            Schedule.id,
+            Schedule.mode,
+            Schedule.name,
+            Schedule.start_date,
+            Schedule.start_time,
+            Schedule.end_date,
+            Schedule.end_time,
+        )
+        .order_by(Schedule.start_date, Schedule.start_time)
+        .tuples()
+        .iterator()
+    )
+    for sid, mode, name, sd, st, ed, et in query:
+        yield {
+            "id": sid,
+            "mode": mode,
+            "name": name,
+            "start_date": sd.strftime("%Y-%m-%d"),
+            "start_time": st.strftime("%H:%M"),
+            "end_date": ed.strftime("%Y-%m-%d"),
+            "end_time": et.strftime("%H:%M"),
+        }
+
+
+@register_action("export_schedules")
+def export_schedules(payload: dict) -> dict:
+    """
+    全ての予定を path のファイルへ直接書き出す（ストリーミング・エクスポート）
+
+    拡張子が .jsonl なら1行1予定の JSON Lines、それ以外は get_all_schedules と
+    同じ要素の JSON 配列で書く。EXPORT_CHUNK_SIZE 行ずつ書き込むので、
+    件数が増えてもメモリ使用量は増えない。
+    """
+    action = "export_schedules"
+
+    if not is_database_exists():
+        return ng(action, "DATABASE_NOT_FOUND", "database not initialized")
+
+    path = payload.get("path")
+    if not isinstance(path, str) or not path:
+        return ng(action, "BAD_REQUEST", "path required")
+
+    jsonl = path.lower().endswith(".jsonl")
+
+    _connect()
+
+    count = 0
+    try:
+        with atomic_open(path, "w", encoding="utf-8") as f:
+            if not jsonl:
+                f.write("[")
+            lines = []
+            for row in _iter_export_rows():
+                text = json.dumps(row, ensure_ascii=False)
+                if jsonl:
+                    lines.append(text + "\n")
+                else:
+                    lines.append(("\n  " if count == 0 else ",\n  ") + text)
+                count += 1
+                if len(lines) >= EXPORT_CHUNK_SIZE:
+                    f.write("".join(lines))
+                    lines = []
+            f.write("".join(lines))
+            if not jsonl:
+                f.write("\n]\n" if count else "]\n")
+    except OSError as e:
+        return ng(action, "IO_ERROR", str(e))
+
+    return ok(
+        action,
+        {"path": path, "format": "jsonl" if jsonl else "json", "exported": count},
+    )
+
+
+@register_action("import_schedules")
 def import_schedules(payload: dict) -> dict:
     """スケジュールをインポート"""
     action = "import_schedules"
@@ -274,80 +803,231 @@ def import_schedules(payload: dict) -> dict:
     if not isinstance(schedules, list):
         return ng(action, "BAD_REQUEST", "schedules must be a list")
 
-    # データベース接続を明示的に初期化（古い接続をクリア）
-    try:
-        db.close()
-    except Exception:
-        pass
-    db.connect(reuse_if_open=True)
+    _connect()
 
-    # テーブルが存在しなければ作成
-    try:
-        db.create_tables([Schedule], safe=True)
-    except Exception:
-        pass
-
-    # 既存のデータをクリア（重複を防ぐため）
-    try:
-        Schedule.delete().execute()
-    except Exception:
-        pass
-
-    imported_count = 0
-    errors = []
+    # 先に全行を検証・変換し、エラーは行番号付きで従来どおり報告する
+    rows = []
+    indexes = []  # rows の各行が schedules の何番目か
+    errors: List[tuple] = []
 
     for idx, sc in enumerate(schedules):
         try:
-            sd = datetime.strptime(sc["start_date"], "%Y-%m-%d").date()
-            st = datetime.strptime(sc["start_time"], "%H:%M").time()
-            ed = datetime.strptime(sc["end_date"], "%Y-%m-%d").date()
-            et = datetime.strptime(sc["end_time"], "%H:%M").time()
+            sd = _parse_date(sc["start_date"])
+            st = _parse_time(sc["start_time"])
+            ed = _parse_date(sc["end_date"])
+            et = _parse_time(sc["end_time"])
 
             if datetime.combine(ed, et) <= datetime.combine(sd, st):
-                errors.append(f"Index {idx}: end must be after start")
+                errors.append((idx, "end must be after start"))
+                continue
+            if exceeds_max_span(datetime.combine(sd, st), datetime.combine(ed, et)):
+                errors.append((idx, SPAN_TOO_LONG))
                 continue
 
-            Schedule.create(
-                mode=sc.get("mode"),
-                name=sc.get("name"),
-                start_date=sd,
-                start_time=st,
-                end_date=ed,
-                end_time=et,
+            values = (sc.get("mode"), sc.get("name"), sd, st, ed, et)
+            missing = _missing_not_null(values)
+            if missing is not None:
+                errors.append((idx, missing))
+                continue
+            rows.append(
+                tuple(f.db_value(v) for f, v in zip(IMPORT_FIELDS, values))
             )
-            imported_count += 1
+            indexes.append(idx)
 
         except Exception as e:
-            errors.append(f"Index {idx}: {str(e)}")
+            errors.append((idx, str(e)))
             continue
 
+    # 既存データの削除と INSERT を1つのトランザクションで行う
+    # （1行ごとのコミット・fsync をせず、同じ INSERT 文を executemany で使い回す）
+    columns = ", ".join(f'"{f.column_name}"' for f in IMPORT_FIELDS)
+    placeholders = ", ".join("?" for _ in IMPORT_FIELDS)
+    sql = (
+        f'INSERT INTO "{Schedule._meta.table_name}" ({columns}) '
+        f"VALUES ({placeholders})"
+    )
+    # 給料集計は行ごとに更新せず、最後にまとめて作り直す
+    with db.atomic(), deferred_payroll_summary():
+        # 既存のデータをクリア（重複を防ぐため）
+        Schedule.delete().execute()
+        try:
+            with db.atomic():
+                db.cursor().executemany(sql, rows)
+            imported_count = len(rows)
+        except sqlite3.IntegrityError:
+            # 検証で拾えない制約違反があった。1行ずつ入れ直し、失敗した行だけ報告する
+            imported_count = 0
+            for idx, row in zip(indexes, rows):
+                try:
+                    with db.atomic():
+                        db.cursor().execute(sql, row)
+                    imported_count += 1
+                except sqlite3.IntegrityError as e:
+                    errors.append((idx, str(e)))
+
     return ok(
         action,
         {
             "imported": imported_count,
-            "errors": errors,
+            "errors": [f"Index {idx}: {message}" for idx, message in sorted(errors)],
         },
     )
 
 
+def _missing_not_null(values: tuple) -> str | None:
+    """NOT NULL の列に None があれば、データベースと同じエラーメッセージを返す"""
+    for field, value in zip(IMPORT_FIELDS, values):
+        if value is None and not field.null:
+            return (
+                "NOT NULL constraint failed: "
+                f"{Schedule._meta.table_name}.{field.column_name}"
+            )
+    return None
+
+
+@register_action("list_actions")
+def list_actions(payload: dict) -> dict:
+    """登録されているアクションとその性質の一覧"""
+    return ok(
+        "list_actions",
+        {"actions": [spec.describe() for _, spec in sorted(ACTIONS.items())]},
+    )
+
+
+@register_action(BATCH_ACTION)
+def batch(payload: dict) -> dict:
+    """
+    複数のリクエストを1回の往復で処理する
+
+    requests のリクエストを順に実行し、同じ順のレスポンスを返す。続けて並んだ
+    書き込みは handle_write_batch で1つのトランザクションにまとめ（すべて書き込みなら
+    全体が1トランザクション）、後ろの読み込みにはコミット後の内容が返る。
+
+    例: {"action": "batch", "requests": [
+            {"action": "delete_schedule", "id": 1},
+            {"action": "get_monthly_schedule", "year": 2026, "month": 1}]}
+    """
+    action = BATCH_ACTION
+    requests = payload.get("requests")
+    if not isinstance(requests, list) or not requests:
+        return ng(action, "BAD_REQUEST", "requests must be a non-empty list")
+    if len(requests) > MAX_BATCH_REQUESTS:
+        return ng(
+            action, "BAD_REQUEST", f"too many requests (max {MAX_BATCH_REQUESTS})"
+        )
+
+    responses: List[Dict[str, Any]] = []
+    writes: List[dict] = []
+    for sub in requests:
+        spec = get_action(sub.get("action")) if isinstance(sub, dict) else None
+        if spec is not None and spec.write and spec.batchable:
+            writes.append(sub)
+            continue
+        # 読み込みの前に、それまでの書き込みをコミットしておく
+        if writes:
+            responses.extend(handle_write_batch(writes))
+            writes = []
+        if not isinstance(sub, dict):
+            responses.append(ng("unknown", "BAD_REQUEST", "request must be an object"))
+        elif spec is not None and not spec.batchable:
+            responses.append(
+                ng(spec.name, "BAD_REQUEST", "action cannot be used in batch")
+            )
+        else:
+            responses.append(handle_request(sub))
+    if writes:
+        responses.extend(handle_write_batch(writes))
+
+    resp = ok(action, {"responses": responses})
+    versions = [r["data_version"] for r in responses if "data_version" in r]
+    if versions:
+        # 中の書き込みで進んだ分も含めた、最も新しいバージョン
+        resp["data_version"] = max(versions)
+    return resp
+
+
+@register_action("get_cache_stats")
+def get_cache_stats(payload: dict) -> dict:
+    """読み込み結果のキャッシュのヒット・ミスの回数と保持件数"""
+    return ok("get_cache_stats", result_cache.stats())
+
+
 def handle_request(payload: dict) -> dict:
-    action = payload.get("action")
+    # batch は書き込みを含んでも、中で書き込みの区切りごとにコミットする
+    if is_write(payload) and not is_batch(payload):
+        return handle_write_batch([payload])[0]
+
+    # 読み込みを始める前のバージョン。実行中に書き込みがコミットされても、
+    # 結果はこのバージョン以降の内容なので、この値を付ける
+    version = _data_version
+    # 接続はスレッドごとに開いたまま使い回す
+    with connection_scope():
+        resp = _read(payload, version)
+    # クライアントはこの値が進んだらキャッシュを捨てる（batch は自分で付ける）
+    resp.setdefault("data_version", version)
+    return resp
+
+
+def _read(payload: dict, version: int) -> dict:
+    """
+    読み込みを実行する
+
+    cacheable なアクションは、データバージョンが進むまで同じパラメータの結果を
+    result_cache から返す（SQL の実行と行の変換を省く）。
+    """
+    spec = get_action(payload.get("action"))
+    if spec is None or not spec.cacheable:
+        return _dispatch(payload)
+    key = cache_key(payload)
+    resp = result_cache.get(key, version)
+    if resp is not None:
+        return resp
+    resp = _dispatch(payload)
+    if resp.get("ok") is True:
+        result_cache.put(key, version, resp)
+    return resp
+
+
+def handle_write_batch(payloads: List[dict]) -> List[dict]:
+    """
+    書き込みリクエストをまとめて1つのトランザクションで処理する
+
+    各リクエストはセーブポイントの中で実行するので、例外で失敗したものだけが
+    取り消される。データバージョンはコミットの後に進める（別スレッドの読み手が
+    新しいバージョンでコミット前の内容を受け取らないようにするため）。
+
+    Returns:
+        list[dict]: payloads と同じ順のレスポンス
+    """
+    results: List[Dict[str, Any]] = []
+    with connection_scope():
+        try:
+            with db.atomic():
+                for payload in payloads:
+                    try:
+                        with db.atomic():
+                            results.append(_dispatch(payload))
+                    except Exception as e:
+                        results.append(
+                            ng(payload.get("action") or "unknown", "EXCEPTION", str(e))
+                        )
+        except Exception as e:
+            # コミットに失敗したらすべて取り消されている
+            results = [
+                ng(p.get("action") or "unknown", "EXCEPTION", str(e)) for p in payloads
+            ]
+
+    for resp in results:
+        if resp.get("ok") is True and is_write(resp):
+            _bump_data_version()
+    for resp in results:
+        resp["data_version"] = _data_version
+    return results
 
-    if action == "add_schedule":
-        return add_schedule(payload)
-    if action == "get_schedule":
-        return get_schedule(payload)
-    if action == "delete_schedule":
-        return delete_schedule(payload)
-    if action == "update_schedule":
-        return update_schedule(payload)
-    if action == "get_monthly_schedule_by_mode":
-        return get_monthly_schedule_by_mode(payload)
-    if action == "get_monthly_schedule":
-        return get_monthly_schedule(payload)
-    if action == "get_all_schedules":
-        return get_all_schedules(payload)
-    if action == "import_schedules":
-        return import_schedules(payload)
-
-    return ng(action or "unknown", "BAD_REQUEST", "unsupported action")
+
+def _dispatch(payload: dict) -> dict:
+    action = payload.get("action")
+    spec = get_action(action)
+    if spec is None:
+        return ng(action or "unknown", "BAD_REQUEST", "unsupported action")
+    return spec.handler(payload)
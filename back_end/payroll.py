@@ -0,0 +1,252 @@
+"""
+給料の一括計算
+複数のシフトの総勤務分・深夜分・給料をまとめて計算する（NumPy があれば配列演算で行う）
+深夜分数の区間演算は common/worktime.py（SalaryWindow と共有）を使う
+"""
+
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, List, Sequence
+
+from common.worktime import (
+    EPOCH_MINUTES,
+    night_minutes_before,
+    to_minutes,
+)
+
+try:
+    import numpy as np
+except ImportError:  # NumPy は任意。無ければ純 Python で同じ計算をする
+    np = None
+
+# 既定の給料パラメータ（front_end/utils/settings_manager.py の既定値と同じ）
+DEFAULT_WAGE = 1000
+DEFAULT_NIGHT_RATE = 1.25
+DEFAULT_NIGHT_START = 22
+DEFAULT_NIGHT_END = 5
+
+
+def has_numpy() -> bool:
+    """NumPy による一括計算が使えるか"""
+    return np is not None
+
+
+# 予定の日付・時刻の文字列の長さ（YYYY-MM-DD / HH:MM）
+DATE_LENGTH = 10
+TIME_LENGTH = 5
+
+
+def _bad_stamp(date_text: str, time_text: str) -> ValueError:
+    return ValueError(f"invalid date/time: {date_text!r} {time_text!r}")
+
+
+def _stamps_numpy(shifts: List[Dict[str, Any]], date_key: str, time_key: str):
+    """
+    NumPy の datetime64 で全シフトの日時を通算分の配列にする
+
+    固定長の文字列型は長い値を黙って切り詰めるので、先に長さを確かめる
+    （純 Python の strptime と同じ値だけを受け付ける）。
+    """
+    dates = np.array([f"{s[date_key]}" for s in shifts], dtype=str)
+    times = np.array([f"{s[time_key]}" for s in shifts], dtype=str)
+    bad = (np.char.str_len(dates) != DATE_LENGTH) | (np.char.str_len(times) != TIME_LENGTH)
+    if bad.any():
+        k = int(np.argmax(bad))
+        raise _bad_stamp(dates[k], times[k])
+    text = np.char.add(np.char.add(dates, "T"), times)
+    return text.astype("datetime64[m]").astype(np.int64) + EPOCH_MINUTES
+
+
+def _stamps_python(shifts: List[Dict[str, Any]], date_key: str, time_key: str):
+    """純 Python で全シフトの日時を通算分のリストにする"""
+    stamps = []
+    for s in shifts:
+        date_text, time_text = f"{s[date_key]}", f"{s[time_key]}"
+        if len(date_text) != DATE_LENGTH or len(time_text) != TIME_LENGTH:
+            raise _bad_stamp(date_text, time_text)
+        t = datetime.strptime(f"{date_text} {time_text}", "%Y-%m-%d %H:%M")
+        stamps.append(to_minutes(t))
+    return stamps
+
+
+def _minutes_numpy(t0, t1, start: int, end: int, bounds):
+    """NumPy で通算分の配列から全シフトの (総分, 深夜分) を求める"""
+    t0 = np.asarray(t0, dtype=np.int64)
+    t1 = np.asarray(t1, dtype=np.int64)
+    if bounds is not None:
+        t0 = np.maximum(t0, bounds[0])
+        t1 = np.minimum(t1, bounds[1])
+    valid = t1 > t0
+    total = np.where(valid, t1 - t0, 0)
+    night = np.where(
+        valid,
+        night_minutes_before(t1, start, end) - night_minutes_before(t0, start, end),
+        0,
+    )
+    return total.tolist(), night.tolist()
+
+
+def _minutes_python(t0, t1, start: int, end: int, bounds):
+    """純 Python で通算分のリストから全シフトの (総分, 深夜分) を求める"""
+    totals, nights = [], []
+    for m0, m1 in zip(t0, t1):
+        if bounds is not None:
+            m0, m1 = max(m0, bounds[0]), min(m1, bounds[1])
+        if m1 <= m0:
+            totals.append(0)
+            nights.append(0)
+            continue
+        totals.append(m1 - m0)
+        nights.append(
+            night_minutes_before(m1, start, end) - night_minutes_before(m0, start, end)
+        )
+    return totals, nights
+
+
+def period_bounds(first_day: date, last_day: date) -> tuple[int, int]:
+    """期間 [first_day, last_day] を通算分の区間 [first_day 0:00, 翌日 0:00) にする"""
+    return (
+        to_minutes(datetime.combine(first_day, time())),
+        to_minutes(datetime.combine(last_day + timedelta(days=1), time())),
+    )
+
+
+def calculate_payroll(
+    shifts: List[Dict[str, Any]],
+    wage: int = DEFAULT_WAGE,
+    night_rate: float = DEFAULT_NIGHT_RATE,
+    night_start: int = DEFAULT_NIGHT_START,
+    night_end: int = DEFAULT_NIGHT_END,
+    use_numpy: bool | None = None,
+    period: tuple[date, date] | None = None,
+) -> Dict[str, Any]:
+    """
+    シフトの一覧から、シフトごとと合計の勤務分・深夜分・給料を計算する
+
+    深夜時給は SalaryWindow と同じく int(wage * night_rate)。分は整数で数え、
+    給料は (通常分 × 時給 + 深夜分 × 深夜時給) / 60 で求める。
+
+    Args:
+        shifts: schedule_to_dict と同じ形式の予定（start_date/start_time/end_date/end_time）
+        wage: 通常時給（円）
+        night_rate: 深夜割増率（倍）
+        night_start: 深夜開始時刻（時）
+        night_end: 深夜終了時刻（時）
+        use_numpy: NumPy を使うか（None なら使える場合に使う）
+        period: (初日, 最終日)。指定すると期間外の部分は数えない（月や年を
+            またぐシフトは、実際に働いた日のある期間に分けて数える）
+
+    Returns:
+        dict: {"shifts": [シフトごとの結果], "totals": 合計}
+
+    Raises:
+        ValueError: 日付・時刻の形式が不正な場合
+    """
+    use_numpy = _resolve_numpy(use_numpy)
+    stamps = _stamps_numpy if use_numpy else _stamps_python
+    if shifts:
+        t0 = stamps(shifts, "start_date", "start_time")
+        t1 = stamps(shifts, "end_date", "end_time")
+    else:
+        t0 = t1 = []
+    return _payroll_result(
+        [s.get("id") for s in shifts],
+        [s.get("name") for s in shifts],
+        t0,
+        t1,
+        wage,
+        night_rate,
+        night_start,
+        night_end,
+        use_numpy,
+        period,
+    )
+
+
+def calculate_payroll_minutes(
+    ids: Sequence[Any],
+    names: Sequence[Any],
+    start_minutes: Sequence[int],
+    end_minutes: Sequence[int],
+    wage: int = DEFAULT_WAGE,
+    night_rate: float = DEFAULT_NIGHT_RATE,
+    night_start: int = DEFAULT_NIGHT_START,
+    night_end: int = DEFAULT_NIGHT_END,
+    use_numpy: bool | None = None,
+    period: tuple[date, date] | None = None,
+) -> Dict[str, Any]:
+    """
+    開始・終了の通算分の列から calculate_payroll と同じ結果を求める
+
+    データベースから開始・終了を整数の列で読んだ場合に使う（日時の文字列を介さない）。
+
+    Args:
+        ids: シフトの ID の列
+        names: シフトの名前の列
+        start_minutes: 開始の 1970-01-01 0:00 からの分（SQL の strftime('%s') / 60）
+        end_minutes: 終了の 1970-01-01 0:00 からの分
+        その他: calculate_payroll と同じ
+    """
+    use_numpy = _resolve_numpy(use_numpy)
+    if use_numpy:
+        t0 = np.asarray(start_minutes, dtype=np.int64) + EPOCH_MINUTES
+        t1 = np.asarray(end_minutes, dtype=np.int64) + EPOCH_MINUTES
+    else:
+        t0 = [m + EPOCH_MINUTES for m in start_minutes]
+        t1 = [m + EPOCH_MINUTES for m in end_minutes]
+    return _payroll_result(
+        ids, names, t0, t1, wage, night_rate, night_start, night_end, use_numpy, period
+    )
+
+
+def _resolve_numpy(use_numpy: bool | None) -> bool:
+    if use_numpy is None:
+        return has_numpy()
+    if use_numpy and not has_numpy():
+        raise RuntimeError("numpy is not installed")
+    return use_numpy
+
+
+def _payroll_result(
+    ids, names, t0, t1, wage, night_rate, night_start, night_end, use_numpy, period
+) -> Dict[str, Any]:
+    """通算分の列から、シフトごとと合計の勤務分・深夜分・給料を求める"""
+    start, end = int(night_start) * 60, int(night_end) * 60
+    night_wage = int(wage * night_rate)
+
+    bounds = period_bounds(*period) if period is not None else None
+    if len(ids) == 0:
+        totals, nights = [], []
+    elif use_numpy:
+        totals, nights = _minutes_numpy(t0, t1, start, end, bounds)
+    else:
+        totals, nights = _minutes_python(t0, t1, start, end, bounds)
+
+    results = []
+    for shift_id, name, total, night in zip(ids, names, totals, nights):
+        normal = total - night
+        results.append(
+            {
+                "id": shift_id,
+                "name": name,
+                "total_minutes": total,
+                "night_minutes": night,
+                "normal_minutes": normal,
+                "salary": (normal * wage + night * night_wage) / 60,
+            }
+        )
+
+    total_minutes = sum(totals)
+    night_minutes = sum(nights)
+    normal_minutes = total_minutes - night_minutes
+    return {
+        "wage": wage,
+        "night_wage": night_wage,
+        "shifts": results,
+        "totals": {
+            "count": len(results),
+            "total_minutes": total_minutes,
+            "night_minutes": night_minutes,
+            "normal_minutes": normal_minutes,
+            "salary": (normal_minutes * wage + night_minutes * night_wage) / 60,
+        },
+    }
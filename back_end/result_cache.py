@@ -0,0 +1,112 @@
+"""
+読み込み結果のキャッシュ
+cacheable なアクションのレスポンスを、アクションとパラメータをキーにデータバージョンごとに保持する
+"""
+
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict
+
+# 保持するレスポンスの件数
+RESULT_CACHE_SIZE = 64
+
+
+def cache_key(payload: dict) -> str:
+    """
+    アクションとパラメータからキャッシュのキーを作る
+
+    キーの順序によらず同じ文字列になる。_request_id など "_" で始まる項目
+    （送信ごとに変わる付加情報）は含めない。
+    """
+    params = {k: v for k, v in payload.items() if not str(k).startswith("_")}
+    return json.dumps(
+        params, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str
+    )
+
+
+class ResultCache:
+    """
+    レスポンスの LRU キャッシュ
+
+    値は保存したときのデータバージョンでのみ有効で、get()・put() に渡された
+    バージョンが進んでいたら中身をすべて捨てる。読み込みを始める前のバージョンを
+    put() に渡すので、実行中に書き込みがあった結果は保存されない。
+
+    返すレスポンスは浅いコピー（呼び出し側が data_version や _request_id を
+    付けても、キャッシュの中身は変わらない）。data の中は共有なので書き換えないこと。
+    """
+
+    def __init__(self, maxsize: int = RESULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.version: int | None = None
+        self.hits = 0
+        self.misses = 0
+        self._items: "OrderedDict[str, dict]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, version: int) -> dict | None:
+        """version で有効なレスポンスのコピー（無ければ None）を返す"""
+        with self._lock:
+            self._observe(version)
+            resp = self._items.get(key)
+            if resp is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return dict(resp)
+
+    def put(self, key: str, version: int, resp: dict) -> bool:
+        """
+        レスポンスを保存する
+
+        Args:
+            key: cache_key() の値
+            version: 読み込みを始める前のデータバージョン
+            resp: 保存するレスポンス
+
+        Returns:
+            bool: 保存したか（その間にバージョンが進んでいた場合は False）
+        """
+        with self._lock:
+            self._observe(version)
+            if version != self.version:
+                return False
+            self._items[key] = dict(resp)
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+            return True
+
+    def _observe(self, version: int) -> None:
+        if self.version is not None and version <= self.version:
+            return
+        self._items.clear()
+        self.version = version
+
+    def clear(self) -> None:
+        """すべて破棄する（データベースを直接書き換えたとき用）"""
+        with self._lock:
+            self._items.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """ヒット・ミスの回数と保持件数"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "size": len(self._items),
+                "maxsize": self.maxsize,
+                "version": self.version,
+            }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._items)
+
+
+# バックエンドのプロセスで共有するキャッシュ
+result_cache = ResultCache()
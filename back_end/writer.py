@@ -0,0 +1,134 @@
+"""
+書き込みスレッド
+予定の書き込みを1つのスレッドで到着順に実行し、続けて届いた書き込みは1つのトランザクションにまとめる
+"""
+
+import threading
+from collections import deque
+from concurrent.futures import Future
+from typing import Callable, List
+
+from back_end.actions import is_batch, is_write
+from back_end.db.connection import close_connection
+from back_end.functions import handle_request, handle_write_batch
+
+# 1つのトランザクションにまとめる書き込みの上限
+MAX_WRITE_BATCH = 64
+
+
+def _joinable(payload: dict) -> bool:
+    """他の書き込みと1つのトランザクションにまとめられるか（batch は自分で区切る）"""
+    return is_write(payload) and not is_batch(payload)
+
+
+class ScheduleWriter:
+    """
+    書き込みを専用スレッドで実行するキュー
+
+    submit() したリクエストは到着順に実行する。書き込みが続く間は最大
+    max_batch 件を handle_write_batch で1トランザクションにまとめ、
+    コミットしてから各 Future を完了させる。書き込みの後ろに積まれた読み込みも
+    このスレッドで順に実行するので、書き込み後の内容が返る。
+
+    Future の完了（add_done_callback）はこのスレッドで呼ばれる。Tk に戻すときは
+    キューを介して after() で受け取ること。
+    """
+
+    def __init__(
+        self,
+        read_handler: Callable[[dict], dict] = handle_request,
+        write_handler: Callable[[List[dict]], List[dict]] = handle_write_batch,
+        max_batch: int = MAX_WRITE_BATCH,
+    ):
+        self._read_handler = read_handler
+        self._write_handler = write_handler
+        self.max_batch = max_batch
+        self._items: "deque[tuple[dict, Future]]" = deque()
+        self._cond = threading.Condition()
+        self._stopping = False
+        self._busy = 0  # 取り出したが完了していない件数
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> "ScheduleWriter":
+        """書き込みスレッドを起動する（起動済みなら何もしない）"""
+        with self._cond:
+            if self._thread is None:
+                self._stopping = False
+                self._thread = threading.Thread(
+                    target=self._run, name="schedule-writer", daemon=True
+                )
+                self._thread.start()
+        return self
+
+    def stop(self, timeout: float | None = None) -> None:
+        """積まれているリクエストを処理し終えてからスレッドを止める"""
+        with self._cond:
+            thread = self._thread
+            self._stopping = True
+            self._cond.notify_all()
+        if thread is not None:
+            thread.join(timeout)
+        with self._cond:
+            if self._thread is thread:
+                self._thread = None
+
+    def submit(self, payload: dict) -> Future:
+        """リクエストを積み、レスポンスで完了する Future を返す"""
+        future: Future = Future()
+        with self._cond:
+            if self._stopping:
+                raise RuntimeError("writer is stopped")
+            self._items.append((payload, future))
+            self._cond.notify()
+        return future
+
+    def pending(self) -> int:
+        """積まれている・実行中のリクエストの件数"""
+        with self._cond:
+            return len(self._items) + self._busy
+
+    def _take(self) -> "list[tuple[dict, Future]] | None":
+        """次に実行する塊（続く書き込み、または読み込み・batch 1件）を取り出す"""
+        with self._cond:
+            while not self._items and not self._stopping:
+                self._cond.wait()
+            if not self._items:
+                return None
+            batch = [self._items.popleft()]
+            if _joinable(batch[0][0]):
+                while (
+                    self._items
+                    and len(batch) < self.max_batch
+                    and _joinable(self._items[0][0])
+                ):
+                    batch.append(self._items.popleft())
+            self._busy = len(batch)
+            return batch
+
+    def _run(self) -> None:
+        try:
+            while True:
+                batch = self._take()
+                if batch is None:
+                    return
+                payloads = [payload for payload, _ in batch]
+                try:
+                    if _joinable(payloads[0]):
+                        results = self._write_handler(payloads)
+                    else:
+                        results = [self._read_handler(payloads[0])]
+                except Exception as e:
+                    results = [
+                        {
+                            "ok": False,
+                            "action": p.get("action") or "unknown",
+                            "error": {"code": "EXCEPTION", "message": str(e)},
+                        }
+                        for p in payloads
+                    ]
+                with self._cond:
+                    self._busy = 0
+                for (_, future), result in zip(batch, results):
+                    future.set_result(result)
+        finally:
+            close_connection()
@@ -0,0 +1 @@
+# common module: フロントエンドとバックエンドの両方で使う計算
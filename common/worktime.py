@@ -0,0 +1,92 @@
+"""
+勤務時間の区間演算
+シフトと深夜時間帯の重なりを、整数の分単位で求める（SalaryWindow とバックエンドの給料計算で共有）
+
+時刻は「通算の分」（0001-01-01 0:00 からの分数。to_minutes() の値）で扱う。
+深夜分数の関数は int でも NumPy 配列でも同じように計算する。
+"""
+
+from datetime import date, datetime
+
+try:
+    import numpy as np
+except ImportError:  # NumPy は任意。無ければ int だけを扱う
+    np = None
+
+MINUTES_PER_DAY = 24 * 60
+
+# 1970-01-01 0:00 の通算分（datetime64[m] の値に足すと通算分になる）
+EPOCH_MINUTES = date(1970, 1, 1).toordinal() * MINUTES_PER_DAY
+
+
+def _is_array(value) -> bool:
+    return np is not None and isinstance(value, np.ndarray)
+
+
+def night_in_day(minute, start: int, end: int):
+    """
+    その日の 0:00 から minute 分までに含まれる深夜の分数
+
+    Args:
+        minute: その日の 0:00 からの分（int または NumPy 配列）
+        start: 深夜開始（日の始まりからの分）
+        end: 深夜終了（日の始まりからの分）。start > end なら日をまたぐ時間帯、
+            start == end なら終日
+    """
+    if start > end:
+        # 22:00〜翌5:00 のような日をまたぐ時間帯は [0, end) と [start, 24:00) の2区間
+        if _is_array(minute):
+            return np.minimum(minute, end) + np.maximum(minute - start, 0)
+        return min(minute, end) + max(0, minute - start)
+    if start < end:
+        if _is_array(minute):
+            return np.maximum(np.minimum(minute, end) - start, 0)
+        return max(0, min(minute, end) - start)
+    return minute
+
+
+def night_minutes_per_day(start: int, end: int) -> int:
+    """深夜時間帯の1日あたりの分数"""
+    return night_in_day(MINUTES_PER_DAY, start, end)
+
+
+def night_minutes_before(t, start: int, end: int):
+    """
+    通算分 0 から t 分までに含まれる深夜の分数
+
+    丸1日分は定数なので、日数に関係なく O(1) で求まる。
+    区間 [t0, t1) の深夜分数は night_minutes_before(t1) - night_minutes_before(t0)。
+    """
+    days = t // MINUTES_PER_DAY
+    minute = t - days * MINUTES_PER_DAY
+    return days * night_minutes_per_day(start, end) + night_in_day(minute, start, end)
+
+
+def to_minutes(value: datetime) -> int:
+    """datetime を通算の分（0001-01-01 0:00 からの分数）に変換する"""
+    return value.toordinal() * MINUTES_PER_DAY + value.hour * 60 + value.minute
+
+
+def split_minutes(
+    start: datetime, end: datetime, night_start: int, night_end: int
+) -> tuple[int, int]:
+    """
+    勤務の総分数と、そのうち深夜時間帯の分数を返す
+
+    Args:
+        start: 勤務開始日時
+        end: 勤務終了日時
+        night_start: 深夜開始（日の始まりからの分）
+        night_end: 深夜終了（日の始まりからの分）
+
+    Returns:
+        tuple[int, int]: (総分数, 深夜分数)。終了が開始以前なら (0, 0)
+    """
+    t0 = to_minutes(start)
+    t1 = to_minutes(end)
+    if t1 <= t0:
+        return 0, 0
+    night = night_minutes_before(t1, night_start, night_end) - night_minutes_before(
+        t0, night_start, night_end
+    )
+    return t1 - t0, night
@@ -7,7 +7,16 @@ import json
 import os
 
 # 共通のリクエスト送信モジュールをインポート
-from .request_handler import write_request, wait_for_response, try_read_response
+from .request_handler import (
+    BATCH_ACTION,
+    batch_payload,
+    batch_responses,
+    send_request,
+    wait_for_response_async,
+    write_request,
+    add_write_listener,
+    remove_write_listener,
+)
 
 # データI/O機能のインポート
 from .utils.data_io import export_schedules, import_schedules
@@ -15,9 +24,28 @@ from .utils.data_io import export_schedules, import_schedules
 # 設定管理のインポート
 from .utils.settings_manager import get_settings_manager
 
+# 月ごとの予定密度キャッシュ
+from .utils.month_cache import density_cache, schedule_cache, schedules_on
+
+# 予定一覧の保持（列ごとの配列）
+from .utils.schedule_store import (
+    ScheduleStore,
+    departure_time,
+    parse_minute,
+    travel_minutes,
+)
+
 # デバッグモード（False にするとログが出ない）
 DEBUG = False
 
+# カレンダーの最大週数（日付ボタンは 6×7 個を作って使い回す）
+GRID_WEEKS = 6
+
+# 予定一覧の表示行数（Treeview には見えている行だけを入れ、スクロールで中身を差し替える）
+TREE_ROWS = 8
+# マウスホイール1目盛りでスクロールする行数
+WHEEL_ROWS = 3
+
 
 class CalendarWindow(tk.Frame):
     def __init__(self, master: tk.Misc | None = None) -> None:
@@ -52,9 +80,13 @@ class CalendarWindow(tk.Frame):
         style.configure("Saturday.TButton", foreground="blue")
         style.configure("Sunday.TButton", foreground="red")
         style.configure("task.TButton", background="black")
+        style.configure("Busy.TButton", background="#d9f2d9")  # 予定がある日（薄い緑）
 
-        self.current_items: list[dict] = []
+        self.current_items = ScheduleStore()
         self.dates_with_schedules: set = set()  # 予定がある日付を記録
+        self._density_pending: set = set()  # 予定密度を問い合わせ中の (年, 月)
+        self._month_pending: set = set()  # 予定一覧を先読み中の (年, 月)
+        self._view_request_id: str | None = None  # 表示中の一覧を要求したリクエスト
 
         control = ttk.Frame(self)
         control.pack(fill=tk.X, padx=10, pady=8)
@@ -78,6 +110,14 @@ class CalendarWindow(tk.Frame):
         self.grid_frame = ttk.Frame(self)
         self.grid_frame.pack(expand=True, fill=tk.BOTH, padx=10, pady=6)
 
+        # 日付ボタンと、各ボタンに表示中の日付・表示内容（変化したセルだけ更新する。
+        # () は未描画、None は非表示）
+        self.day_buttons: list[ttk.Button] = []
+        self._cell_dates: list[dt.date | None] = [None] * (GRID_WEEKS * 7)
+        self._cell_specs: list[tuple | None] = [()] * (GRID_WEEKS * 7)
+        self._weeks_shown = GRID_WEEKS
+        self._build_grid()
+
         action_frame = ttk.Frame(self)
         action_frame.pack(fill=tk.X, padx=10, pady=6)
 
@@ -97,11 +137,14 @@ class CalendarWindow(tk.Frame):
         list_frame = ttk.LabelFrame(self, text="予定一覧（選択して操作）")
         list_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=6)
 
+        tree_frame = ttk.Frame(list_frame)
+        tree_frame.pack(fill=tk.BOTH, expand=True, padx=4, pady=(4, 6))
         self.tree = ttk.Treeview(
-            list_frame,
+            tree_frame,
             columns=("mode", "name", "start", "end", "commute_time"),
             show="headings",
-            height=8,
+            height=TREE_ROWS,
+            selectmode="browse",
         )
         self.tree.heading("mode", text="モード")
         self.tree.heading("name", text="タイトル")
@@ -113,7 +156,24 @@ class CalendarWindow(tk.Frame):
         self.tree.column("start", width=120, anchor="center")
         self.tree.column("end", width=120, anchor="center")
         self.tree.column("commute_time", width=80, anchor="center")
-        self.tree.pack(fill=tk.BOTH, expand=True, padx=4, pady=(4, 6))
+        self.tree_scroll = ttk.Scrollbar(
+            tree_frame, orient=tk.VERTICAL, command=self._on_tree_scroll
+        )
+        self.tree_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        # 表示している先頭の行、見えている行の Treeview アイテム、選択中の行
+        self._view_offset = 0
+        self._row_ids: list[str] = []
+        self._row_values: list[tuple] = []
+        self._selected_index: int | None = None
+        self.tree.bind("<<TreeviewSelect>>", self._on_tree_select)
+        self.tree.bind("<Configure>", lambda e: self._render_rows())
+        self.tree.bind("<MouseWheel>", self._on_tree_wheel)
+        self.tree.bind("<Button-4>", self._on_tree_wheel)
+        self.tree.bind("<Button-5>", self._on_tree_wheel)
+        self.tree.bind("<Up>", lambda e: self._move_selection(-1))
+        self.tree.bind("<Down>", lambda e: self._move_selection(1))
 
         op_frame = ttk.Frame(list_frame)
         op_frame.pack(fill=tk.X)
@@ -129,6 +189,19 @@ class CalendarWindow(tk.Frame):
         self.result.pack(fill=tk.BOTH, expand=False, padx=10, pady=6)
 
         self.draw_calendar()
+        self.after_idle(self._prefetch_adjacent)
+
+        # 予定が書き換えられたら予定のある日の色付けを取り直す
+        add_write_listener(self._on_schedules_written)
+        self.bind("<Destroy>", self._on_destroy, add="+")
+
+    def _on_destroy(self, event) -> None:
+        if event.widget is self:
+            remove_write_listener(self._on_schedules_written)
+
+    def _on_schedules_written(self, payload: dict) -> None:
+        # 書き込みリクエストより後に送れば、書き込み後の密度が返る
+        self.after_idle(self.draw_calendar)
 
     def calculate_departure_time(self, schedule: dict) -> str:
         """スケジュール情報から外出時間（開始時間から通勤/通学時間を引いた時刻）を計算して表示する
@@ -137,113 +210,181 @@ class CalendarWindow(tk.Frame):
         モードA（学校・授業）の場合は通学時間を開始時刻から引く
         その他の場合は通勤時間を開始時刻から引く
         """
-        mode = schedule.get("mode", "-")
-
-        try:
-            # スケジュールの開始時刻を取得
-            start_datetime = dt.datetime.strptime(
-                f"{schedule['start_date']} {schedule['start_time']}", "%Y-%m-%d %H:%M"
-            )
-
-            # モードに応じて通勤通学時間を取得
-            if mode == "B":  # バイトモード
-                commute_minutes = self.settings_manager.get_setting("commute_time")
-            elif mode == "A":  # 学校・授業モード
-                commute_minutes = self.settings_manager.get_setting("school_time")
-            else:  # その他（仕事など）
-                commute_minutes = self.settings_manager.get_setting("commute_time")
-
-            # 開始時刻から通勤/通学時間を引いた時刻を計算
-            departure_datetime = start_datetime - dt.timedelta(minutes=commute_minutes)
-
-            # HH:MM形式で返す
-            return departure_datetime.strftime("%H:%M")
-        except (ValueError, KeyError):
-            return "-"
+        commute_time, school_time = self._travel_settings()
+        return departure_time(
+            parse_minute(schedule.get("start_time")),
+            travel_minutes(schedule.get("mode", "-"), commute_time, school_time),
+        )
 
-    def draw_calendar(self) -> None:
-        # 既存ウィジェット削除
-        for w in self.grid_frame.winfo_children():
-            w.destroy()
+    def _travel_payload(self) -> dict:
+        """外出時刻をバックエンドで計算してもらうための移動時間の設定"""
+        commute_time, school_time = self._travel_settings()
+        return {"commute_time": commute_time, "school_time": school_time}
 
-        y, m = self.year.get(), self.month.get()
-        self.title_var.set(f"{y}年 {m}月")
+    def _travel_settings(self) -> tuple[int, int]:
+        """(通勤時間, 通学時間)。一覧の描画ごとに1回だけ読む"""
+        return (
+            self.settings_manager.get_setting("commute_time"),
+            self.settings_manager.get_setting("school_time"),
+        )
 
+    def _build_grid(self) -> None:
+        """曜日ヘッダと 6×7 の日付ボタンを1回だけ作る（月の切り替えでは作り直さない）"""
         # 曜日ヘッダ
         weekdays = ["月", "火", "水", "木", "金", "土", "日"]
         for i, wd in enumerate(weekdays):
-            # 土曜日と日曜日の色分け（修正）
+            # 土曜日と日曜日の色分け
             if i == 5:  # 土曜日
-                label = ttk.Label(
-                    self.grid_frame, text=wd, anchor="center", style="Saturday.TLabel"
-                )
+                style = "Saturday.TLabel"
             elif i == 6:  # 日曜日
-                label = ttk.Label(
-                    self.grid_frame, text=wd, anchor="center", style="Sunday.TLabel"
-                )
+                style = "Sunday.TLabel"
             else:
-                label = ttk.Label(self.grid_frame, text=wd, anchor="center")
+                style = "TLabel"
+            label = ttk.Label(self.grid_frame, text=wd, anchor="center", style=style)
             label.grid(row=0, column=i, sticky="nsew")
 
+        for index in range(GRID_WEEKS * 7):
+            btn = ttk.Button(
+                self.grid_frame,
+                width=4,
+                command=lambda i=index: self._on_cell_click(i),
+            )
+            btn.grid(
+                row=index // 7 + 1, column=index % 7, sticky="nsew", padx=1, pady=1
+            )
+            self.day_buttons.append(btn)
+
+        # 均等拡張
+        for r in range(GRID_WEEKS + 1):
+            self.grid_frame.rowconfigure(r, weight=1)
+        for c in range(7):
+            self.grid_frame.columnconfigure(c, weight=1)
+
+    def _on_cell_click(self, index: int) -> None:
+        day = self._cell_dates[index]
+        if day is not None:
+            self.select_date(day)
+
+    def _cell_style(self, day: dt.date, month: int, today: dt.date) -> str:
+        """日付ボタンのスタイル名（後の条件ほど優先）"""
+        # 1. 基本スタイル（当月の土日はその色）
+        style_name = "TButton"
+        if day.month == month:
+            if day.weekday() == 6:  # 日曜日
+                style_name = "Sunday.TButton"
+            elif day.weekday() == 5:  # 土曜日
+                style_name = "Saturday.TButton"
+
+            # 予定がある日
+            if day in self.dates_with_schedules:
+                style_name = "Busy.TButton"
+
+        # 2. 今日の場合は Today スタイル
+        if day == today:
+            style_name = "Today.TButton"
+
+        # 3. 選択状態の場合は Selected スタイル（最優先）
+        if self.selected_date == day:
+            style_name = "Selected.TButton"
+        return style_name
+
+    def draw_calendar(self) -> None:
+        """
+        表示中の月に合わせて日付ボタンを更新する
+
+        ボタンは _build_grid で作った 6×7 個を使い回し、前回の表示から
+        変わったセルだけ configure / state / grid_remove する。
+        """
+        y, m = self.year.get(), self.month.get()
+        self.title_var.set(f"{y}年 {m}月")
+
+        # 予定のある日（キャッシュに無ければ問い合わせ、届いたら描き直す）
+        density = density_cache.get((y, m))
+        if density is None:
+            self.dates_with_schedules = set()
+            self._request_density(y, m)
+        else:
+            self.dates_with_schedules = set(density)
+
         cal = pycal.Calendar(firstweekday=0)  # 0: Monday
-        row = 1
+        days = [day for week in cal.monthdatescalendar(y, m) for day in week]
         today = dt.date.today()
 
-        for week in cal.monthdatescalendar(y, m):
-            for col, day in enumerate(week):
-                is_current_month = day.month == m
-                is_today = day == today
-                is_selected = self.selected_date == day
-
-                # スタイル名を決定
-                style_name = ""
-                weekday = day.weekday()  # 0=月曜, 6=日曜
-
-                # スタイルの優先順位（後のものが優先）
-                # 1. 基本スタイル（土日の場合はその色）
-                if is_current_month:
-                    if weekday == 6:  # 日曜日
-                        style_name = "Sunday.TButton"
-                    elif weekday == 5:  # 土曜日
-                        style_name = "Saturday.TButton"
-                    else:
-                        style_name = "TButton"
-                else:
-                    style_name = "TButton"
-
-                # 2. 今日の場合は Today スタイル
-                if is_today:
-                    style_name = "Today.TButton"
-
-                # 3. 選択状態の場合は Selected スタイル（最優先）
-                if is_selected:
-                    style_name = "Selected.TButton"
-
-                # ボタンを作成
-                btn = ttk.Button(
-                    self.grid_frame,
-                    text=str(day.day),
-                    width=4,
-                    command=lambda d=day: self.select_date(d),
-                    style=style_name if style_name else "TButton",
+        # 表示する週の行だけを均等拡張する
+        weeks = len(days) // 7
+        if weeks != self._weeks_shown:
+            for r in range(1, GRID_WEEKS + 1):
+                self.grid_frame.rowconfigure(r, weight=1 if r <= weeks else 0)
+            self._weeks_shown = weeks
+
+        self.selected_button = None
+        for index, btn in enumerate(self.day_buttons):
+            day = days[index] if index < len(days) else None
+            self._cell_dates[index] = day
+            if day is None:
+                # 5週以下の月は余った行を隠す
+                spec = None
+            else:
+                spec = (
+                    str(day.day),
+                    self._cell_style(day, m, today),
+                    day.month != m,
                 )
 
-                if not is_current_month:
-                    btn.state(["disabled"])
+            prev = self._cell_specs[index]
+            if spec != prev:
+                if spec is None:
+                    btn.grid_remove()
+                else:
+                    if prev is None:
+                        btn.grid()
+                    text, style_name, disabled = spec
+                    if not prev or prev[:2] != (text, style_name):
+                        btn.configure(text=text, style=style_name)
+                    if not prev or prev[2] != disabled:
+                        btn.state(["disabled"] if disabled else ["!disabled"])
+                self._cell_specs[index] = spec
+
+            if day is not None and day == self.selected_date:
+                self.selected_button = btn
+
+    def _request_density(self, y: int, m: int) -> None:
+        """月の予定密度（日ごとの件数・モード）だけを問い合わせる"""
+        key = (y, m)
+        if key in self._density_pending:
+            return
+        self._density_pending.add(key)
+        generation = density_cache.generation
+        send_request(
+            {"action": "get_month_density", "year": y, "month": m},
+            self,
+            callback=lambda resp: self._on_density_response(resp, key, generation),
+        )
 
-                btn.grid(row=row, column=col, sticky="nsew", padx=1, pady=1)
-            row += 1
+    def _on_density_response(
+        self, resp: dict | None, key: tuple[int, int], generation: int
+    ) -> None:
+        self._density_pending.discard(key)
+        if not self.winfo_exists() or not resp or resp.get("ok") is not True:
+            return
 
-        # 均等拡張
-        for r in range(row + 1):
-            self.grid_frame.rowconfigure(r, weight=1)
-        for c in range(7):
-            self.grid_frame.columnconfigure(c, weight=1)
+        density = {
+            dt.date.fromisoformat(d["date"]): (d["count"], d["modes"])
+            for d in resp.get("data", {}).get("days", [])
+        }
+        stored = density_cache.put(key, density, generation)
+        if (self.year.get(), self.month.get()) != key:
+            return
+        if stored:
+            self.draw_calendar()
+        else:
+            # 問い合わせ中に予定が書き換えられたので取り直す
+            self._request_density(*key)
 
     def select_date(self, day: dt.date) -> None:
         self.selected_date = day
         self.sel_var.set(f"選択: {day.isoformat()}")
-        self.draw_calendar()  # 変更：再描画して選択状態を反映
+        self.draw_calendar()  # 選択状態の変わったボタンだけ更新される
 
     def prev_month(self) -> None:
         y, m = self.year.get(), self.month.get()
@@ -253,6 +394,7 @@ class CalendarWindow(tk.Frame):
         else:
             self.month.set(m - 1)
         self.draw_calendar()
+        self.after_idle(self._prefetch_adjacent)
 
     def next_month(self) -> None:
         y, m = self.year.get(), self.month.get()
@@ -262,6 +404,7 @@ class CalendarWindow(tk.Frame):
         else:
             self.month.set(m + 1)
         self.draw_calendar()
+        self.after_idle(self._prefetch_adjacent)
 
     # 追加：「今日に戻る」メソッド
     def go_to_today(self) -> None:
@@ -270,58 +413,118 @@ class CalendarWindow(tk.Frame):
         self.month.set(today.month)
         self.selected_date = today
         self.draw_calendar()
+        self.after_idle(self._prefetch_adjacent)
+
+    def _prefetch_adjacent(self) -> None:
+        """表示中の月と前後の月の予定一覧を、キャッシュに無ければ裏で取得しておく"""
+        if not self.winfo_exists():
+            return
+        y, m = self.year.get(), self.month.get()
+        prev_key = (y - 1, 12) if m == 1 else (y, m - 1)
+        next_key = (y + 1, 1) if m == 12 else (y, m + 1)
+        for key in ((y, m), prev_key, next_key):
+            if key in schedule_cache or key in self._month_pending:
+                continue
+            self._month_pending.add(key)
+            generation = schedule_cache.generation
+            send_request(
+                {
+                    "action": "get_monthly_schedule",
+                    "year": key[0],
+                    "month": key[1],
+                    "travel": self._travel_payload(),
+                },
+                self,
+                callback=lambda resp, k=key, g=generation: self._on_prefetch_response(
+                    resp, k, g
+                ),
+            )
+
+    def _on_prefetch_response(
+        self, resp: dict | None, key: tuple[int, int], generation: int
+    ) -> None:
+        self._month_pending.discard(key)
+        self._cache_month(resp, key, generation)
+
+    @staticmethod
+    def _cache_month(resp: dict | None, key: tuple[int, int], generation: int) -> None:
+        """月の予定一覧のレスポンスをキャッシュに入れる（失敗・古い結果は捨てる）"""
+        if not resp or resp.get("ok") is not True:
+            return
+        schedule_cache.put(
+            key,
+            resp.get("data", {}),
+            generation,
+            resp.get("data_version"),
+        )
+
+    def _show_cached(self, items: list[dict], travel: dict | None, label: str) -> None:
+        """キャッシュから取り出した予定を、問い合わせずにそのまま表示する"""
+        # 送信済みの表示リクエストのレスポンスは無視させる
+        self._view_request_id = None
+        self._fill_tree(items, travel)
+        self.result.delete("1.0", tk.END)
+        if not items:
+            self.result.insert(tk.END, f"{label}の予定はありません。\n")
+        else:
+            self.result.insert(tk.END, f"{label}の予定を{len(items)}件表示しています。\n")
 
     def request_day(self) -> None:
         if not self.selected_date:
             messagebox.showinfo("情報", "日付を選択してください。")
             return
 
+        expected_date = self.selected_date.isoformat()
+        cached = schedule_cache.get((self.selected_date.year, self.selected_date.month))
+        if cached is not None:
+            self._show_cached(
+                schedules_on(cached.get("schedules", []), expected_date),
+                cached.get("travel"),
+                expected_date,
+            )
+            return
+
         payload = {
             "action": "get_schedule",
-            "date": self.selected_date.isoformat(),
+            "date": expected_date,
+            "travel": self._travel_payload(),
         }
-        request_id = write_request(payload)
         self.result.delete("1.0", tk.END)
         self.result.insert(
             tk.END, "リクエストを送信しました。バックエンドの応答を待機します…\n"
         )
 
-        # 更新を強制的に画面に反映
-        self.update_idletasks()
-
-        # レスポンスが返ってくるまで待機（期待するリクエストIDと日付のレスポンスを待つ）
-        expected_date = self.selected_date.isoformat()
-        resp = wait_for_response(
+        # レスポンスはイベントループを止めずに待つ（期待する日付のレスポンスのみ受理）
+        request_id = write_request(payload)
+        self._view_request_id = request_id
+        wait_for_response_async(
             "get_schedule",
             request_id,
+            self,
+            callback=lambda resp: self._on_day_response(resp, expected_date, request_id),
             expected_data_validator=lambda r: r.get("data", {}).get("date")
             == expected_date,
-            timeout=10.0,
-            root=self.master,
-            debug=True,
         )
 
+    def _on_day_response(
+        self, resp: dict | None, expected_date: str, request_id: str
+    ) -> None:
+        # ウィンドウが閉じられた、またはより新しい表示リクエストがある場合は
+        # （タイムアウトでも）無視する
+        if not self.winfo_exists() or not self._is_latest_view(request_id):
+            return
+
         # ツリー更新
-        self.tree.delete(*self.tree.get_children())
-        self.current_items = []
+        self._fill_tree([])
 
         if resp and resp.get("ok") is True:
             data = resp.get("data", {})
-            if data.get("date") == self.selected_date.isoformat():
+            if data.get("date") == expected_date:
                 items = data.get("schedules", [])
                 if not items:
                     self.result.insert(tk.END, "この日の予定はありません。\n")
                 else:
-                    for sc in items:
-                        mode = sc.get("mode", "-")
-                        name = sc.get("name", "")
-                        start = f"{sc.get('start_date','')} {sc.get('start_time','')}"
-                        end = f"{sc.get('end_date','')} {sc.get('end_time','')}"
-                        departure_time = self.calculate_departure_time(sc)
-                        self.tree.insert(
-                            "", tk.END, values=(mode, name, start, end, departure_time)
-                        )
-                        self.current_items.append(sc)
+                    self._fill_tree(items, data.get("travel"))
                     self.result.insert(
                         tk.END, f"{len(items)}件の予定を取得しました。\n"
                     )
@@ -337,15 +540,184 @@ class CalendarWindow(tk.Frame):
                 tk.END, "タイムアウト: バックエンドからの応答がありませんでした。\n"
             )
 
-    def _get_selection_index(self) -> int | None:
+    def _is_latest_view(self, request_id: str) -> bool:
+        """表示更新用のリクエストが最新のものか（レスポンスの有無・タイムアウトによらない）"""
+        return request_id == self._view_request_id
+
+    def _fill_tree(self, items: list[dict], travel: dict | None = None) -> None:
+        """
+        予定を current_items に保持し、先頭から表示する
+
+        Args:
+            items: 予定の一覧
+            travel: バックエンドが外出時刻の計算に使った移動時間の設定
+        """
+        self.current_items = ScheduleStore(items, travel)
+        self._view_offset = 0
+        self._selected_index = None
+        self._render_rows()
+
+    def _visible_rows(self) -> int:
+        """Treeview に一度に見えている行数"""
+        height = self.tree.winfo_height()
+        if height <= 1:  # まだ配置されていない
+            return TREE_ROWS
+        rowheight = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+        # 見出しの1行分を除く
+        return max(1, height // rowheight - 1)
+
+    def _render_rows(self) -> None:
+        """
+        見えている範囲の行だけを Treeview に入れる
+
+        行のアイテムは使い回し、値が変わった行だけ書き換える。外出時刻もここで
+        見えている行の分だけ計算する。
+        """
+        total = len(self.current_items)
+        rows = self._visible_rows()
+        self._view_offset = max(0, min(self._view_offset, total - rows))
+        count = min(rows, total - self._view_offset)
+        commute_time, school_time = self._travel_settings()
+
+        for i in range(count):
+            values = self.current_items.row(
+                self._view_offset + i, commute_time, school_time
+            )
+            if i < len(self._row_ids):
+                if self._row_values[i] != values:
+                    self.tree.item(self._row_ids[i], values=values)
+                    self._row_values[i] = values
+            else:
+                self._row_ids.append(self.tree.insert("", tk.END, values=values))
+                self._row_values.append(values)
+        if len(self._row_ids) > count:
+            self.tree.delete(*self._row_ids[count:])
+            del self._row_ids[count:]
+            del self._row_values[count:]
+
+        # 選択は行の位置ではなく予定に付いていく
+        selected = self._selected_index
+        if selected is not None and 0 <= selected - self._view_offset < count:
+            self.tree.selection_set(self._row_ids[selected - self._view_offset])
+        elif self.tree.selection():
+            self.tree.selection_set(())
+
+        if total:
+            self.tree_scroll.set(
+                self._view_offset / total, (self._view_offset + count) / total
+            )
+        else:
+            self.tree_scroll.set(0.0, 1.0)
+
+    def _scroll_to(self, offset: int) -> None:
+        if offset != self._view_offset:
+            self._view_offset = offset
+            self._render_rows()
+
+    def _on_tree_scroll(self, *args) -> None:
+        """スクロールバーの操作（moveto 割合 / scroll 量 units|pages）"""
+        if not args:
+            return
+        if args[0] == "moveto":
+            offset = int(float(args[1]) * len(self.current_items))
+        elif args[0] == "scroll":
+            step = int(args[1])
+            if args[2] == "pages":
+                step *= self._visible_rows()
+            offset = self._view_offset + step
+        else:
+            return
+        self._scroll_to(offset)
+
+    def _on_tree_wheel(self, event) -> str:
+        if getattr(event, "num", None) == 4 or getattr(event, "delta", 0) > 0:
+            step = -WHEEL_ROWS
+        else:
+            step = WHEEL_ROWS
+        self._scroll_to(self._view_offset + step)
+        return "break"
+
+    def _on_tree_select(self, event=None) -> None:
         sel = self.tree.selection()
-        if not sel:
+        if sel:
+            self._selected_index = self._view_offset + self.tree.index(sel[0])
+        elif self._selected_index is not None and (
+            0 <= self._selected_index - self._view_offset < len(self._row_ids)
+        ):
+            # 見えている行の選択が外された（見えない行の選択は保つ）
+            self._selected_index = None
+
+    def _move_selection(self, step: int) -> str:
+        """上下キーで選択を動かし、見えている範囲の外に出たらスクロールする"""
+        total = len(self.current_items)
+        if not total:
+            return "break"
+        if self._selected_index is None:
+            index = self._view_offset
+        else:
+            index = max(0, min(self._selected_index + step, total - 1))
+        self._selected_index = index
+        rows = self._visible_rows()
+        if index < self._view_offset:
+            self._view_offset = index
+        elif index >= self._view_offset + rows:
+            self._view_offset = index - rows + 1
+        self._render_rows()
+        return "break"
+
+    def _view_payload(self) -> dict:
+        """表示モード（選択日 / 月）の予定を取り直すリクエスト"""
+        if self.selected_date:
+            return {
+                "action": "get_schedule",
+                "date": self.selected_date.isoformat(),
+                "travel": self._travel_payload(),
+            }
+        return {
+            "action": "get_monthly_schedule",
+            "year": self.year.get(),
+            "month": self.month.get(),
+            "travel": self._travel_payload(),
+        }
+
+    def _on_view_response(
+        self, resp: dict | None, view: dict, generation: int, request_id: str
+    ) -> None:
+        """_view_payload のレスポンスを日 / 月の表示に回す"""
+        if view["action"] == "get_schedule":
+            self._on_day_response(resp, view["date"], request_id)
+        else:
+            self._on_month_response(
+                resp, view["year"], view["month"], generation, request_id
+            )
+
+    def _wait_for_batch(self, request_id: str, view: dict, callback) -> None:
+        """
+        書き込みと表示の再取得をまとめた batch のレスポンスを待つ
+
+        Args:
+            request_id: 送信済みの batch のリクエストID
+            view: batch に含めた _view_payload
+            callback: (batch のレスポンス, view, generation, request_id) を受け取る関数
+        """
+        # 書き込みの送信でキャッシュは無効になっている。再取得の結果は書き込み後の
+        # 内容なので、送信後の generation でキャッシュに入れてよい
+        generation = schedule_cache.generation
+        self._view_request_id = request_id
+        wait_for_response_async(
+            BATCH_ACTION,
+            request_id,
+            self,
+            callback=lambda resp: callback(resp, view, generation, request_id),
+        )
+
+    def _get_selection_index(self) -> int | None:
+        index = self._selected_index
+        if index is None:
             messagebox.showinfo("情報", "予定を1件選択してください。")
             return None
-        item_id = sel[0]
-        # 表示順 == current_items の順
-        index = self.tree.index(item_id)
-        if index is None or index < 0 or index >= len(self.current_items):
+        # 見えている行の位置ではなく current_items の位置で持っている
+        if index < 0 or index >= len(self.current_items):
             messagebox.showwarning("エラー", "選択中のアイテムを特定できません。")
             return None
         return index
@@ -367,28 +739,26 @@ class CalendarWindow(tk.Frame):
             "action": "delete_schedule",
             "id": sid,
         }
-        request_id = write_request(payload)
         self.result.delete("1.0", tk.END)
         self.result.insert(
             tk.END, "削除リクエストを送信しました。バックエンドの応答を待機します…\n"
         )
 
-        # 更新を強制的に画面に反映
-        self.update_idletasks()
-
-        # レスポンスが返ってくるまで待機
-        resp = wait_for_response(
-            "delete_schedule", request_id, timeout=10.0, root=self.master, debug=True
-        )
+        # 削除と表示の再取得を1回の往復で送る
+        view = self._view_payload()
+        request_id = write_request(batch_payload([payload, view]))
+        self._wait_for_batch(request_id, view, self._on_delete_response)
 
+    def _on_delete_response(
+        self, batch_resp: dict | None, view: dict, generation: int, request_id: str
+    ) -> None:
+        if not self.winfo_exists():
+            return
+        resp, refreshed = batch_responses(batch_resp, 2)
         if resp and resp.get("ok") is True:
-            self.result.insert(tk.END, "削除しました。予定を再取得しています...\n")
-            self.update_idletasks()
-            # 削除成功後、表示モードに応じて予定を再取得
-            if self.selected_date:
-                self.request_day()
-            else:
-                self.request_month()
+            self.result.insert(tk.END, "削除しました。\n")
+            # 削除後の予定（同じ batch で取得済み）を表示
+            self._on_view_response(refreshed, view, generation, request_id)
         elif resp and resp.get("ok") is False:
             error = resp.get("error", {})
             self.result.insert(
@@ -413,40 +783,38 @@ class CalendarWindow(tk.Frame):
         self.result.delete("1.0", tk.END)
         self.result.insert(tk.END, "更新ダイアログを開きました。\n")
 
+        # 更新と表示の再取得を1回の往復で送る（送信時の表示を取り直す）
+        view: dict = {}
+
+        def follow_up() -> list:
+            view.update(self._view_payload())
+            return [view]
+
         # 更新完了時のコールバック
         def on_update_success(request_id):
             self.result.delete("1.0", tk.END)
             self.result.insert(
                 tk.END, "更新リクエストを送信しました。レスポンスを待機中...\n"
             )
-            self.update_idletasks()
-
-            # レスポンスが返ってくるまで待機
-            resp = wait_for_response(
-                "update_schedule",
-                request_id,
-                timeout=10.0,
-                root=self.master,
-                debug=True,
-            )
+            self._wait_for_batch(request_id, view, on_update_response)
 
+        def on_update_response(
+            batch_resp: dict | None, view: dict, generation: int, request_id: str
+        ) -> None:
+            if not self.winfo_exists():
+                return
+            self.result.delete("1.0", tk.END)
+            resp, refreshed = batch_responses(batch_resp, 2)
             if resp and resp.get("ok") is True:
-                self.result.delete("1.0", tk.END)
-                self.result.insert(tk.END, "更新しました。予定を再取得しています...\n")
-                self.update_idletasks()
-                # 更新成功後、表示モードに応じて予定を再取得
-                if self.selected_date:
-                    self.request_day()
-                else:
-                    self.request_month()
+                self.result.insert(tk.END, "更新しました。\n")
+                # 更新後の予定（同じ batch で取得済み）を表示
+                self._on_view_response(refreshed, view, generation, request_id)
             elif resp and resp.get("ok") is False:
-                self.result.delete("1.0", tk.END)
                 error = resp.get("error", {})
                 self.result.insert(
                     tk.END, f"更新エラー: {error.get('message', '不明なエラー')}\n"
                 )
             else:
-                self.result.delete("1.0", tk.END)
                 self.result.insert(
                     tk.END, "タイムアウト: バックエンドからの応答がありませんでした。\n"
                 )
@@ -455,35 +823,49 @@ class CalendarWindow(tk.Frame):
             self.winfo_toplevel(),
             existing_schedule=target,
             on_success=on_update_success,
+            follow_up=follow_up,
         )
 
     def request_month(self) -> None:
         """月全体の予定を取得する"""
         y, m = self.year.get(), self.month.get()
+        cached = schedule_cache.get((y, m))
+        if cached is not None:
+            self._show_cached(
+                cached.get("schedules", []), cached.get("travel"), f"{y}年{m}月"
+            )
+            return
 
+        generation = schedule_cache.generation
         payload = {
             "action": "get_monthly_schedule",
             "year": y,
             "month": m,
+            "travel": self._travel_payload(),
         }
-        request_id = write_request(payload)
         self.result.delete("1.0", tk.END)
         self.result.insert(tk.END, f"{y}年{m}月の予定を取得中...\n")
 
-        # 更新を強制的に画面に反映
-        self.update_idletasks()
-
-        # レスポンスが返ってくるまで待機
-        resp = wait_for_response(
+        request_id = write_request(payload)
+        self._view_request_id = request_id
+        wait_for_response_async(
             "get_monthly_schedule",
             request_id,
-            timeout=10.0,
-            root=self.master,
+            self,
+            callback=lambda resp: self._on_month_response(
+                resp, y, m, generation, request_id
+            ),
         )
 
+    def _on_month_response(
+        self, resp: dict | None, y: int, m: int, generation: int, request_id: str
+    ) -> None:
+        self._cache_month(resp, (y, m), generation)
+        if not self.winfo_exists() or not self._is_latest_view(request_id):
+            return
+
         # ツリー更新
-        self.tree.delete(*self.tree.get_children())
-        self.current_items = []
+        self._fill_tree([])
 
         if resp and resp.get("ok") is True:
             data = resp.get("data", {})
@@ -491,16 +873,7 @@ class CalendarWindow(tk.Frame):
             if not items:
                 self.result.insert(tk.END, f"{y}年{m}月の予定はありません。\n")
             else:
-                for sc in items:
-                    mode = sc.get("mode", "-")
-                    name = sc.get("name", "")
-                    start = f"{sc.get('start_date','')} {sc.get('start_time','')}"
-                    end = f"{sc.get('end_date','')} {sc.get('end_time','')}"
-                    departure_time = self.calculate_departure_time(sc)
-                    self.tree.insert(
-                        "", tk.END, values=(mode, name, start, end, departure_time)
-                    )
-                    self.current_items.append(sc)
+                self._fill_tree(items, data.get("travel"))
                 self.result.insert(
                     tk.END, f"{y}年{m}月の予定を{len(items)}件取得しました。\n"
                 )
@@ -524,19 +897,8 @@ class CalendarWindow(tk.Frame):
 
     def refresh_tree_display(self) -> None:
         """Treeview の表示を更新（設定変更時など）"""
-        # 現在のツリービューをクリア
-        self.tree.delete(*self.tree.get_children())
-
-        # 現在保持しているアイテムを再度表示
-        for sc in self.current_items:
-            mode = sc.get("mode", "-")
-            name = sc.get("name", "")
-            start = f"{sc.get('start_date','')} {sc.get('start_time','')}"
-            end = f"{sc.get('end_date','')} {sc.get('end_time','')}"
-            departure_time = self.calculate_departure_time(sc)
-            self.tree.insert(
-                "", tk.END, values=(mode, name, start, end, departure_time)
-            )
+        # 見えている行の外出時刻を新しい設定で計算し直す
+        self._render_rows()
 
 
 if __name__ == "__main__":
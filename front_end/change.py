@@ -5,7 +5,7 @@ from tkinter import ttk, messagebox
 from datetime import date, datetime
 
 # 共通のリクエスト送信モジュールをインポート
-from .request_handler import write_request
+from .request_handler import batch_payload, write_request
 
 # ユーティリティのインポート
 from .utils.constants import (
@@ -52,12 +52,21 @@ class ChangeWindow(tk.Toplevel):
         *,
         existing_schedule: dict | None = None,
         on_success=None,
+        follow_up=None,
     ) -> None:
+        """
+        Args:
+            existing_schedule: 変更する予定（None なら追加）
+            on_success: 送信後にリクエストIDを受け取る関数
+            follow_up: 追加/更新に続けて同じ往復で送るリクエストのリストを返す関数。
+                指定すると batch で送り、on_success には batch のリクエストIDを渡す
+        """
         super().__init__(master)
         self.title("予定の追加/変更")
         self.geometry(f"{CHANGE_WINDOW_WIDTH}x{CHANGE_WINDOW_HEIGHT}")
         self._existing = existing_schedule
         self._on_success = on_success
+        self._follow_up = follow_up
 
         container = ttk.Frame(self)
         container.pack(fill=tk.BOTH, expand=True, padx=12, pady=10)
@@ -201,6 +210,9 @@ class ChangeWindow(tk.Toplevel):
                 "end_time": end_time_str,
             }
 
+        if self._follow_up is not None:
+            payload = batch_payload([payload, *self._follow_up()])
+
         request_id = write_request(payload)
         if self._existing is not None:
             self.status_var.set(
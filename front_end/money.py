@@ -4,7 +4,7 @@ from tkinter import messagebox
 from datetime import date
 
 # 共通のリクエスト送信モジュールをインポート
-from .request_handler import write_request, try_read_response
+from .request_handler import write_request, try_read_response, wait_for_response_async
 
 # ユーティリティのインポート
 from .utils.constants import (
@@ -13,6 +13,10 @@ from .utils.constants import (
     MONEY_WINDOW_WIDTH,
     MONEY_WINDOW_HEIGHT,
 )
+from .utils.settings_manager import get_settings_manager
+
+# 給料の集計結果として表示するレスポンスの action（calc_wage は同じ集計の月単位版）
+RESULT_ACTIONS = ("get_payroll_summary", "calc_wage_result")
 
 
 class MoneyWindow(tk.Toplevel):
@@ -41,8 +45,8 @@ class MoneyWindow(tk.Toplevel):
         self.output.pack(fill=tk.BOTH, expand=True, padx=10, pady=8)
 
         hint = (
-            "モードB(バイト)のシフトから労働時間×時給を算出する想定。\n"
-            "バックエンドが response.json に結果を書き出した場合は『最新の結果を表示』で読込できます。"
+            "モードB(バイト)のシフトから労働時間×時給をバックエンドで集計します。\n"
+            "『最新の結果を表示』で直近の計算結果を再表示できます。"
         )
         ttk.Label(self, text=hint, foreground="#555").pack(fill=tk.X, padx=10)
 
@@ -55,25 +59,63 @@ class MoneyWindow(tk.Toplevel):
         if not (1 <= m <= 12):
             messagebox.showwarning("入力エラー", "月は1-12で入力してください。")
             return
+        settings_manager = get_settings_manager()
         payload = {
             "action": "calc_wage",
             "year": y,
             "month": m,
+            "wage": settings_manager.get_setting("hourly_wage") or DEFAULT_WAGE,
+            "night_rate": settings_manager.get_setting("night_rate")
+            or NIGHT_RATE_MULTIPLIER,
+            "night_start": settings_manager.get_setting("night_start"),
+            "night_end": settings_manager.get_setting("night_end"),
         }
-        write_request(payload)
+        request_id = write_request(payload)
         self.output.delete("1.0", tk.END)
         self.output.insert(
             tk.END, "計算リクエストを送信しました。バックエンドの結果を待機します…\n"
         )
+        # 月の集計結果は calc_wage_result として返る（給料集計テーブルを働いた日ごとに読む）
+        wait_for_response_async(
+            "calc_wage_result",
+            request_id,
+            self,
+            callback=self._on_calc_response,
+        )
+
+    def _on_calc_response(self, resp) -> None:
+        if not self.winfo_exists():
+            return
+        if resp is None:
+            self.output.insert(
+                tk.END, "タイムアウト: バックエンドからの応答がありませんでした。\n"
+            )
+            return
+        if resp.get("ok") is False:
+            error = resp.get("error", {})
+            self.output.insert(
+                tk.END, f"エラー: {error.get('message', '不明なエラー')}\n"
+            )
+            return
+        self._show_result(resp)
 
     def try_show_result(self) -> None:
         resp = try_read_response()
-        if not resp or resp.get("action") != "calc_wage_result":
+        if (
+            not resp
+            or resp.get("action") not in RESULT_ACTIONS
+            or resp.get("ok") is False
+        ):
             messagebox.showinfo("情報", "response.json の結果が見つかりません。")
             return
-        total_hours = resp.get("total_hours")
-        total_wage = resp.get("total_wage")
-        detail = resp.get("detail", [])
+        self._show_result(resp)
+
+    def _show_result(self, resp: dict) -> None:
+        # バックエンドの応答は data に、手書きの response.json はトップレベルに結果がある
+        result = resp.get("data", resp)
+        total_hours = result.get("total_hours")
+        total_wage = result.get("total_wage")
+        detail = result.get("detail", [])
 
         self.output.delete("1.0", tk.END)
         self.output.insert(tk.END, f"総労働時間: {total_hours} 時間\n")
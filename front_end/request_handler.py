@@ -3,11 +3,146 @@
 """
 
 import os
-import json
 import time
 import uuid
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
 from datetime import datetime
 
+from back_end.actions import (
+    BATCH_ACTION,
+    action_timeout,
+    is_write,
+    request_timeout,
+    write_actions,
+)
+from ipc.atomic import atomic_write_json
+from ipc.codec import decode_auto
+from ipc.journal import COMPACT_BYTES, LATEST_MARKER, JournalReader, append_record
+
+# インプロセス転送（None の場合は request.json / response.json を経由する）
+_transport = None
+
+# レスポンスジャーナルの読み手と、他の待機者宛てに先読みしたレスポンス
+_response_reader: JournalReader | None = None
+_received: "OrderedDict[str, dict]" = OrderedDict()
+_received_lock = threading.Lock()
+# レスポンスジャーナルから最後に読んだレスポンス（response.json の目印の本文）
+_latest_response: dict | None = None
+MAX_RECEIVED_RESPONSES = 256
+
+# 非同期待機でレスポンスを確認する間隔（ミリ秒）
+ASYNC_POLL_MS = 20
+# 同期待機でレスポンスを確認する間隔（秒）
+SYNC_POLL_INTERVAL = 0.01
+
+# リクエストジャーナルのエンコード方式（レスポンスはヘッダから自動判別する）
+REQUEST_CODEC = "json"
+
+# 予定を書き換えるアクション（送信時に書き込みリスナーへ通知する。
+# back_end/actions.py の ACTION_TABLE から引く。batch は BATCH_ACTION）
+WRITE_ACTIONS = write_actions()
+_write_listeners: list = []
+# 受け取ったレスポンスを（照合の前に）見る関数。data_version の追跡に使う
+_response_listeners: list = []
+
+
+def set_transport(transport) -> None:
+    """
+    リクエストの転送方式を設定する
+
+    Args:
+        transport: ipc.memory.InProcessTransport などのインプロセス転送。
+            None を渡すとファイル経由の転送に戻る
+    """
+    global _transport
+    _transport = transport
+
+
+def get_transport():
+    """現在のインプロセス転送を返す（ファイル経由の場合は None）"""
+    return _transport
+
+
+def add_write_listener(listener) -> None:
+    """
+    予定を書き換えるリクエストの送信時に呼ばれる関数を登録する
+
+    バックエンドはリクエストを到着順に処理するので、通知を受けてから送った
+    読み込みリクエストには書き込み後の内容が返る。
+
+    Args:
+        listener: 送信したペイロードを受け取る関数
+    """
+    if listener not in _write_listeners:
+        _write_listeners.append(listener)
+
+
+def remove_write_listener(listener) -> None:
+    """add_write_listener で登録した関数を解除する"""
+    if listener in _write_listeners:
+        _write_listeners.remove(listener)
+
+
+def _notify_write(payload: dict) -> None:
+    if not is_write(payload):
+        return
+    for listener in list(_write_listeners):
+        listener(payload)
+
+
+def add_response_listener(listener) -> None:
+    """
+    レスポンスを受け取るたびに呼ばれる関数を登録する
+
+    Args:
+        listener: 受け取ったレスポンス（dict）を受け取る関数
+    """
+    if listener not in _response_listeners:
+        _response_listeners.append(listener)
+
+
+def remove_response_listener(listener) -> None:
+    """add_response_listener で登録した関数を解除する"""
+    if listener in _response_listeners:
+        _response_listeners.remove(listener)
+
+
+def _notify_response(resp: dict) -> None:
+    for listener in list(_response_listeners):
+        listener(resp)
+
+
+def batch_payload(requests: list) -> dict:
+    """
+    複数のリクエストをまとめた batch のペイロードを作る
+
+    バックエンドは requests を順に実行し、続く書き込みは1つのトランザクションに
+    まとめる。書き込みの後ろの読み込みには書き込み後の内容が返る。
+
+    Args:
+        requests: リクエストペイロードのリスト
+    """
+    return {"action": BATCH_ACTION, "requests": list(requests)}
+
+
+def batch_responses(resp: dict | None, count: int) -> list:
+    """
+    batch のレスポンスを、リクエストと同じ順の count 件のレスポンスに分ける
+
+    各レスポンスには batch のリクエストIDを付ける（表示中のリクエストかの確認用）。
+    batch 自体が失敗・タイムアウトした場合は、その結果（None を含む）を count 件並べる。
+    """
+    if not resp or resp.get("ok") is not True:
+        return [resp] * count
+    responses = list(resp.get("data", {}).get("responses", []))[:count]
+    for sub in responses:
+        if isinstance(sub, dict) and "_request_id" in resp:
+            sub["_request_id"] = resp["_request_id"]
+    responses.extend([None] * (count - len(responses)))
+    return responses
+
 
 def _paths():
     """リクエスト・レスポンスファイルのパスを取得"""
@@ -17,6 +152,42 @@ def _paths():
     return req, res
 
 
+def _journal_paths():
+    """リクエスト・レスポンスジャーナルのパスを取得"""
+    base = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    req = os.path.join(base, "json", "request.jsonl")
+    res = os.path.join(base, "json", "response.jsonl")
+    return req, res
+
+
+def _take_response(request_id: str) -> dict | None:
+    """
+    レスポンスジャーナルから指定IDのレスポンスを取り出す
+
+    新しく追記されたレスポンスはすべて _received に振り分けるので、
+    複数ウィンドウのリクエストが同時に処理中でも取りこぼさない。
+    """
+    with _received_lock:
+        _read_response_journal()
+        return _received.pop(request_id, None)
+
+
+def _read_response_journal() -> None:
+    """レスポンスジャーナルに追記されたレスポンスを _received に振り分ける（_received_lock を持って呼ぶ）"""
+    global _response_reader, _latest_response
+    _, res_journal = _journal_paths()
+    if _response_reader is None or _response_reader.path != res_journal:
+        # レスポンスジャーナルを読むのはこのプロセスだけなので、読み終えたら切り詰めてよい
+        _response_reader = JournalReader(res_journal, compact_bytes=COMPACT_BYTES)
+    for record in _response_reader.read_new():
+        rid = record.get("_request_id")
+        if rid:
+            _received[rid] = record
+        _latest_response = record
+    while len(_received) > MAX_RECEIVED_RESPONSES:
+        _received.popitem(last=False)
+
+
 def write_request(payload: dict) -> str:
     """
     リクエストを送信し、リクエストIDを返す
@@ -27,24 +198,26 @@ def write_request(payload: dict) -> str:
     Returns:
         str: 生成されたリクエストID
     """
-    req, res = _paths()
-    os.makedirs(os.path.dirname(req), exist_ok=True)
-
-    # リクエスト送信前に古いレスポンスを削除
-    try:
-        if os.path.exists(res):
-            os.remove(res)
-        time.sleep(0.2)  # 削除完了を確実にする
-    except Exception:
-        pass
-
     # リクエストに一意のIDをつける
     request_id = str(uuid.uuid4())
     payload["_request_id"] = request_id
 
-    with open(req, "w", encoding="utf-8") as f:
-        json.dump(payload, f, ensure_ascii=False, indent=2)
+    if _transport is not None:
+        _transport.submit(payload)
+        _notify_write(payload)
+        return request_id
+
+    req, _ = _paths()
+
+    # ジャーナルに追記（ウォッチャーはこちらを順に処理する）。
+    # レコードは長さと CRC 付きなので、書き込み途中を読まれる心配はない
+    req_journal, _ = _journal_paths()
+    append_record(req_journal, payload, REQUEST_CODEC)
 
+    # 最新のリクエストは request.json にも残す（確認・デバッグ用）
+    atomic_write_json(req, payload)
+
+    _notify_write(payload)
     return request_id
 
 
@@ -55,21 +228,34 @@ def try_read_response() -> dict | None:
     Returns:
         dict | None: レスポンスデータまたはNone
     """
+    if _transport is not None:
+        return _transport.last_response
+
     _, res = _paths()
     if not os.path.exists(res):
         return None
     try:
-        with open(res, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(res, "rb") as f:
+            data = decode_auto(f.read())
     except Exception:
         return None
 
+    if isinstance(data, dict) and data.get(LATEST_MARKER):
+        # ウォッチャーは本文をジャーナルにだけ書き、response.json には目印を書く
+        with _received_lock:
+            _read_response_journal()
+            latest = _latest_response
+        if latest is not None and latest.get("_request_id") == data.get("_request_id"):
+            return latest
+        return None
+    return data
+
 
 def wait_for_response(
     expected_action: str,
     expected_request_id: str,
     expected_data_validator=None,
-    timeout: float = 10.0,
+    timeout: float | None = None,
     root=None,
     debug: bool = False,
 ) -> dict | None:
@@ -80,7 +266,7 @@ def wait_for_response(
         expected_action: 期待するアクション名
         expected_request_id: 期待するリクエストID
         expected_data_validator: データ検証用の関数（オプション）
-        timeout: タイムアウト時間（秒）
+        timeout: タイムアウト時間（秒。省略するとアクションの登録から引く）
         root: Tkinterのルートウィンドウ（イベントループ処理用）
         debug: デバッグログを出力するか
 
@@ -89,7 +275,20 @@ def wait_for_response(
     """
     import sys
 
-    _, res = _paths()
+    if timeout is None:
+        timeout = action_timeout(expected_action)
+
+    if _transport is not None:
+        resp = _transport.wait(expected_request_id, timeout)
+        if resp is None:
+            return None
+        _notify_response(resp)
+        if resp.get("action") != expected_action:
+            return None
+        if expected_data_validator is not None and not expected_data_validator(resp):
+            return None
+        return resp
+
     start_time = time.time()
 
     if debug:
@@ -106,91 +305,32 @@ def wait_for_response(
 
         elapsed = time.time() - start_time
 
-        # ファイルが存在するかチェック
-        if not os.path.exists(res):
-            if debug:
-                print(
-                    f"[{datetime.now()}] [{elapsed:.2f}s] Response file not found",
-                    file=sys.stderr,
-                    flush=True,
-                )
-            time.sleep(0.05)
+        resp = _take_response(expected_request_id)
+        if resp is None:
+            time.sleep(SYNC_POLL_INTERVAL)
             continue
 
-        try:
-            time.sleep(0.05)  # ファイル書き込み完了を待つ
-            with open(res, "r", encoding="utf-8") as f:
-                content = f.read().strip()
-
-                if debug:
-                    print(
-                        f"[{datetime.now()}] [{elapsed:.2f}s] Response content: {content[:100]}",
-                        file=sys.stderr,
-                        flush=True,
-                    )
-
-                if not content:  # 空ファイルの場合はスキップ
-                    if debug:
-                        print(
-                            f"[{datetime.now()}] [{elapsed:.2f}s] Response file is empty",
-                            file=sys.stderr,
-                            flush=True,
-                        )
-                    time.sleep(0.05)
-                    continue
-
-                resp = json.loads(content)
-                action = resp.get("action")
-                request_id = resp.get("_request_id")
-
-                if debug:
-                    print(
-                        f"[{datetime.now()}] [{elapsed:.2f}s] Parsed response: action={action}, request_id={request_id}",
-                        file=sys.stderr,
-                        flush=True,
-                    )
-
-                # 期待されるアクション＆リクエストIDのレスポンスか確認
-                if action == expected_action and request_id == expected_request_id:
-                    if debug:
-                        print(
-                            f"[{datetime.now()}] [{elapsed:.2f}s] Matching response found!",
-                            file=sys.stderr,
-                            flush=True,
-                        )
-
-                    # 追加の検証があればチェック
-                    if expected_data_validator is None or expected_data_validator(resp):
-                        return resp
-                    else:
-                        # 検証失敗：異なるデータの場合は待機を続ける
-                        if debug:
-                            print(
-                                f"[{datetime.now()}] [{elapsed:.2f}s] Validator failed",
-                                file=sys.stderr,
-                                flush=True,
-                            )
-                        time.sleep(0.05)
-                else:
-                    # 異なるリクエストIDまたはアクションの場合は無視して待機を続ける
-                    if debug:
-                        print(
-                            f"[{datetime.now()}] [{elapsed:.2f}s] Not matching (expected action={expected_action}, request_id={expected_request_id})",
-                            file=sys.stderr,
-                            flush=True,
-                        )
-                    time.sleep(0.05)
-
-        except (json.JSONDecodeError, IOError) as e:
-            # JSONパースエラーまたはファイル読み込みエラーは無視して再試行
+        _notify_response(resp)
+        action = resp.get("action")
+        if debug:
+            print(
+                f"[{datetime.now()}] [{elapsed:.2f}s] Matching response found: action={action}",
+                file=sys.stderr,
+                flush=True,
+            )
+
+        # レスポンスはリクエストIDごとに1件なので、不一致・検証失敗なら待たずに終了
+        if action != expected_action:
+            return None
+        if expected_data_validator is not None and not expected_data_validator(resp):
             if debug:
                 print(
-                    f"[{datetime.now()}] [{elapsed:.2f}s] Error reading response: {e}",
+                    f"[{datetime.now()}] [{elapsed:.2f}s] Validator failed",
                     file=sys.stderr,
                     flush=True,
                 )
-            time.sleep(0.05)
-            continue
+            return None
+        return resp
 
     if debug:
         print(
@@ -200,3 +340,108 @@ def wait_for_response(
         )
 
     return None
+
+
+def wait_for_response_async(
+    expected_action: str,
+    expected_request_id: str,
+    root,
+    callback=None,
+    expected_data_validator=None,
+    timeout: float | None = None,
+    poll_ms: int = ASYNC_POLL_MS,
+) -> Future:
+    """
+    イベントループを止めずにレスポンスを待つ
+
+    root.after() で定期的にレスポンスを確認するだけなので、待機中も
+    入力処理が止まらず、CPU も消費しない。
+
+    Args:
+        expected_action: 期待するアクション名
+        expected_request_id: 期待するリクエストID
+        root: Tkinterのウィジェット（after() のスケジュールに使う）
+        callback: レスポンス（タイムアウト・不一致時は None）を受け取る関数
+        expected_data_validator: データ検証用の関数（オプション）
+        timeout: タイムアウト時間（秒。省略するとアクションの登録から引く）
+        poll_ms: 確認間隔（ミリ秒）
+
+    Returns:
+        Future: レスポンスデータまたは None で完了する Future
+    """
+    future: Future = Future()
+    if timeout is None:
+        timeout = action_timeout(expected_action)
+    deadline = time.time() + timeout
+
+    # 待機中にウィジェットが破棄されても after() が失効しないよう Tk 本体で予約する
+    if hasattr(root, "_root"):
+        root = root._root()
+
+    def _finish(resp: dict | None) -> None:
+        if resp is not None:
+            _notify_response(resp)
+            if resp.get("action") != expected_action:
+                resp = None
+            elif expected_data_validator is not None and not expected_data_validator(
+                resp
+            ):
+                resp = None
+        future.set_result(resp)
+        if callback is not None:
+            callback(resp)
+
+    def _poll() -> None:
+        if _transport is not None:
+            resp = _transport.poll(expected_request_id)
+            if resp is None:
+                _transport.drain()
+                resp = _transport.poll(expected_request_id)
+        else:
+            resp = _take_response(expected_request_id)
+
+        if resp is not None:
+            _finish(resp)
+        elif time.time() >= deadline:
+            _finish(None)
+        else:
+            root.after(poll_ms, _poll)
+
+    root.after(0, _poll)
+    return future
+
+
+def send_request(
+    payload: dict,
+    root,
+    callback=None,
+    expected_data_validator=None,
+    timeout: float | None = None,
+) -> Future:
+    """
+    リクエストを送信し、レスポンスを非同期に受け取る
+
+    Args:
+        payload: リクエストペイロード（action等を含む辞書）
+        root: Tkinterのウィジェット（after() のスケジュールに使う）
+        callback: レスポンス（タイムアウト時は None）を受け取る関数
+        expected_data_validator: データ検証用の関数（オプション）
+        timeout: タイムアウト時間（秒。省略するとアクションの登録から引く）
+
+    Returns:
+        Future: レスポンスデータまたは None で完了する Future
+            （リクエストIDは future.request_id で参照できる）
+    """
+    if timeout is None:
+        timeout = request_timeout(payload)
+    request_id = write_request(payload)
+    future = wait_for_response_async(
+        payload["action"],
+        request_id,
+        root,
+        callback=callback,
+        expected_data_validator=expected_data_validator,
+        timeout=timeout,
+    )
+    future.request_id = request_id  # type: ignore[attr-defined]
+    return future
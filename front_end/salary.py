@@ -1,6 +1,6 @@
 import tkinter as tk
 from tkinter import simpledialog, messagebox, ttk
-from datetime import datetime, timedelta
+from datetime import datetime
 
 # 共通のリクエスト送信モジュールをインポート
 from . import request_handler
@@ -9,12 +9,11 @@ from . import request_handler
 from .utils.constants import (
     DEFAULT_WAGE,
     NIGHT_RATE_MULTIPLIER,
-    NIGHT_HOURS_START,
-    NIGHT_HOURS_END,
     SALARY_WINDOW_WIDTH,
     SALARY_WINDOW_HEIGHT,
 )
 from .utils.settings_manager import get_settings_manager
+from .utils.worktime import night_window, split_minutes
 
 
 class SalaryWindow(tk.Toplevel):
@@ -122,11 +121,20 @@ class SalaryWindow(tk.Toplevel):
             "mode": "B",
         }
 
-        request_id = request_handler.write_request(payload)
-        response = request_handler.wait_for_response(
-            "get_monthly_schedule_by_mode", request_id, root=self.master_root
+        # イベントループを止めずにレスポンスを待つ
+        request_handler.send_request(
+            payload,
+            self,
+            callback=lambda response: self._on_schedules_response(
+                response, year, month
+            ),
         )
 
+    def _on_schedules_response(self, response, year, month):
+        """モードBのスケジュール取得結果を反映する"""
+        if not self.winfo_exists():
+            return
+
         if not response:
             messagebox.showerror("エラー", "バックエンドからの応答がありませんでした。")
             return
@@ -173,8 +181,20 @@ class SalaryWindow(tk.Toplevel):
                 f"{salary['name']}：{salary['hours']}h × {salary['wage']}円 = {total:.0f}円\n",
             )
 
+    def _month_bounds(self):
+        """選択中の月の始まりと翌月の始まり（シフトをこの範囲に切り詰める）"""
+        year, month = self.year_var.get(), self.month_var.get()
+        first = datetime(year, month, 1)
+        if month == 12:
+            return first, datetime(year + 1, 1, 1)
+        return first, datetime(year, month + 1, 1)
+
     def calculate_working_hours(self, schedule):
-        """スケジュールから勤務時間と深夜勤務時間を計算"""
+        """
+        スケジュールから選択中の月に働いた勤務時間と深夜勤務時間を計算
+
+        月をまたぐシフトは、その月に働いた分だけを数える（給料集計と同じく働いた日で分ける）。
+        """
         try:
             # 日時の解析
             start_datetime = datetime.strptime(
@@ -184,46 +204,83 @@ class SalaryWindow(tk.Toplevel):
                 f"{schedule['end_date']} {schedule['end_time']}", "%Y-%m-%d %H:%M"
             )
 
-            total_hours = 0.0
-            night_hours = 0.0
-
-            current = start_datetime
-
-            # 1分単位で処理
-            while current < end_datetime:
-                hour = current.hour
-
-                # 深夜時間帯（22時～5時）の判定
-                is_night = hour >= NIGHT_HOURS_START or hour < NIGHT_HOURS_END
-
-                if is_night:
-                    night_hours += 1 / 60  # 1分 = 1/60時間
-
-                total_hours += 1 / 60
-                current += timedelta(minutes=1)
+            month_start, month_end = self._month_bounds()
+            start_datetime = max(start_datetime, month_start)
+            end_datetime = min(end_datetime, month_end)
+            if end_datetime <= start_datetime:
+                return 0.0, 0.0
+
+            # 深夜時間帯（設定の night_start/night_end、未設定なら 22時～5時）との
+            # 重なりを整数の分で求める
+            settings_manager = get_settings_manager()
+            window = night_window(
+                settings_manager.get_setting("night_start"),
+                settings_manager.get_setting("night_end"),
+            )
+            total_minutes, night_minutes = split_minutes(
+                start_datetime, end_datetime, window
+            )
 
-            return total_hours, night_hours
+            return total_minutes / 60, night_minutes / 60
 
         except Exception as e:
             print(f"時間計算エラー: {e}")
             return 0.0, 0.0
 
     def calculate_salary_from_schedules(self):
-        """取得したスケジュールから給料を計算"""
+        """
+        取得したスケジュールから給料を計算
+
+        月間合計はバックエンドの給料集計（get_payroll_summary）から受け取り、
+        シフトごとの内訳は取得済みのスケジュールから求める。
+        """
         if not self.fetched_schedules:
             messagebox.showwarning(
                 "警告", "先に「シフト取得」ボタンでスケジュールを取得してください。"
             )
             return
 
-        base_wage = self.wage_var.get()
+        settings_manager = get_settings_manager()
+        payload = {
+            "action": "get_payroll_summary",
+            "year": self.year_var.get(),
+            "month": self.month_var.get(),
+            "wage": self.wage_var.get() or DEFAULT_WAGE,
+            "night_rate": self.night_rate_var.get() or NIGHT_RATE_MULTIPLIER,
+            "night_start": settings_manager.get_setting("night_start"),
+            "night_end": settings_manager.get_setting("night_end"),
+        }
+
+        # イベントループを止めずにレスポンスを待つ
+        request_handler.send_request(
+            payload, self, callback=self._on_summary_response
+        )
+
+    def _on_summary_response(self, response):
+        """給料集計の結果とシフトごとの内訳を表示する"""
+        if not self.winfo_exists():
+            return
+
+        if not response:
+            messagebox.showerror("エラー", "バックエンドからの応答がありませんでした。")
+            return
+
+        if not response.get("ok"):
+            error_msg = response.get("error", {}).get("message", "不明なエラー")
+            messagebox.showerror("エラー", f"給料計算失敗: {error_msg}")
+            return
+
+        summary = response.get("data", {})
+        base_wage = summary.get("wage", self.wage_var.get())
+        night_wage = summary.get("night_wage", int(base_wage * self.night_rate_var.get()))
         night_rate = self.night_rate_var.get()
-        night_wage = int(base_wage * night_rate)
 
         self.text_widget.delete(1.0, tk.END)
         self.text_widget.insert(tk.END, "=" * 60 + "\n")
         self.text_widget.insert(
-            tk.END, f"給料計算結果 ({self.year_var.get()}年{self.month_var.get()}月)\n"
+            tk.END,
+            f"給料計算結果 ({summary.get('year', self.year_var.get())}年"
+            f"{summary.get('month', self.month_var.get())}月)\n",
         )
         self.text_widget.insert(
             tk.END,
@@ -231,10 +288,6 @@ class SalaryWindow(tk.Toplevel):
         )
         self.text_widget.insert(tk.END, "=" * 60 + "\n\n")
 
-        total_all_hours = 0.0
-        total_all_night_hours = 0.0
-        total_all_salary = 0
-
         for schedule in self.fetched_schedules:
             total_hours, night_hours = self.calculate_working_hours(schedule)
             normal_hours = total_hours - night_hours
@@ -244,11 +297,6 @@ class SalaryWindow(tk.Toplevel):
             night_salary = night_hours * night_wage
             total_salary = normal_salary + night_salary
 
-            # 累計
-            total_all_hours += total_hours
-            total_all_night_hours += night_hours
-            total_all_salary += total_salary
-
             # 表示
             self.text_widget.insert(tk.END, f"【{schedule['name']}】\n")
             self.text_widget.insert(
@@ -268,7 +316,11 @@ class SalaryWindow(tk.Toplevel):
             )
             self.text_widget.insert(tk.END, "-" * 60 + "\n")
 
-        # 合計表示
+        # 合計表示（働いた日ごとに集計した値なので、月をまたぐシフトも二重に数えない）
+        total_all_hours = summary.get("total_hours", 0.0)
+        total_all_night_hours = summary.get("night_hours", 0.0)
+        total_all_salary = summary.get("total_wage", 0)
+
         self.text_widget.insert(tk.END, "\n")
         self.text_widget.insert(tk.END, "=" * 60 + "\n")
         self.text_widget.insert(tk.END, "【月間合計】\n")
@@ -36,10 +36,6 @@ CHANGE_WINDOW_HEIGHT = 520
 MONEY_WINDOW_WIDTH = 480
 MONEY_WINDOW_HEIGHT = 420
 
-# ================== タイムアウト設定 ==================
-DEFAULT_TIMEOUT = 10.0  # デフォルトタイムアウト（秒）
-IMPORT_TIMEOUT = 30.0  # インポート用タイムアウト（秒）
-
 # ================== 日付・時刻フォーマット ==================
 DATE_FORMAT = "%Y-%m-%d"
 TIME_FORMAT = "%H:%M"
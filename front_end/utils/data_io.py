@@ -6,10 +6,11 @@
 import os
 import json
 import datetime as dt
+from concurrent.futures import Future
 from tkinter import filedialog, messagebox
 
-from ..request_handler import write_request, wait_for_response
-from .constants import EXPORT_FOLDER_NAME, DEFAULT_TIMEOUT, IMPORT_TIMEOUT
+from ..request_handler import send_request
+from .constants import EXPORT_FOLDER_NAME
 
 
 def get_export_directory() -> str:
@@ -30,77 +31,82 @@ def get_export_directory() -> str:
 def export_schedules(
     result_widget,
     master_root,
-) -> bool:
+) -> Future:
     """
     全てのスケジュールをJSONファイルにエクスポート
 
+    先に保存先を選び、バックエンドがそのファイルへ直接書き出す（export_schedules）。
+    予定一覧をレスポンスとして受け取らないので、件数が多くてもメモリを使わない。
+    拡張子を .jsonl にすると JSON Lines 形式で書き出す。
+
     Args:
         result_widget: 結果表示用のテキストウィジェット（tk.Text）
         master_root: Tkinterのマスターウィンドウ
 
     Returns:
-        bool: 成功したか否か
+        Future: 成功したか否か（bool）で完了する Future
     """
-    payload = {
-        "action": "get_all_schedules",
-    }
-    request_id = write_request(payload)
-    result_widget.delete("1.0", "end")
-    result_widget.insert("end", "データをエクスポート中...\n")
-    result_widget.update()
+    done: Future = Future()
+
+    # エクスポートフォルダを取得
+    export_dir = get_export_directory()
 
-    resp = wait_for_response(
-        "get_all_schedules",
-        request_id,
-        timeout=DEFAULT_TIMEOUT,
-        root=master_root,
+    # デフォルトのファイル名を生成
+    default_filename = (
+        f"schedules_export_{dt.datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
     )
 
-    if resp and resp.get("ok") is True:
-        data = resp.get("data", {})
-        schedules = data.get("schedules", [])
+    # ファイル保存ダイアログ
+    file_path = filedialog.asksaveasfilename(
+        title="エクスポート先を選択",
+        defaultextension=".json",
+        filetypes=[
+            ("JSON files", "*.json"),
+            ("JSON Lines files", "*.jsonl"),
+            ("All files", "*.*"),
+        ],
+        initialdir=export_dir,
+        initialfile=default_filename,
+    )
 
-        # エクスポートフォルダを取得
-        export_dir = get_export_directory()
+    result_widget.delete("1.0", "end")
+    if not file_path:
+        result_widget.insert("end", "エクスポートがキャンセルされました。\n")
+        done.set_result(False)
+        return done
 
-        # デフォルトのファイル名を生成
-        default_filename = (
-            f"schedules_export_{dt.datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        )
+    result_widget.insert("end", "データをエクスポート中...\n")
+    payload = {
+        "action": "export_schedules",
+        "path": os.path.abspath(file_path),
+    }
 
-        # ファイル保存ダイアログ
-        file_path = filedialog.asksaveasfilename(
-            title="エクスポート先を選択",
-            defaultextension=".json",
-            filetypes=[("JSON files", "*.json"), ("All files", "*.*")],
-            initialdir=export_dir,
-            initialfile=default_filename,
-        )
+    def _on_response(resp):
+        done.set_result(_show_export_result(resp, result_widget))
 
-        if file_path:
-            try:
-                with open(file_path, "w", encoding="utf-8") as f:
-                    json.dump(schedules, f, ensure_ascii=False, indent=2)
-                result_widget.insert(
-                    "end", f"{len(schedules)}件の予定をエクスポートしました。\n"
-                )
-                result_widget.insert("end", f"保存先: {file_path}\n")
-                messagebox.showinfo(
-                    "成功", f"{len(schedules)}件の予定をエクスポートしました。"
-                )
-                return True
-            except Exception as e:
-                result_widget.insert("end", f"ファイル保存エラー: {e}\n")
-                messagebox.showerror("エラー", f"ファイル保存に失敗しました: {e}")
-                return False
-        else:
-            result_widget.insert("end", "エクスポートがキャンセルされました。\n")
-            return False
+    send_request(payload, master_root, callback=_on_response)
+    return done
+
+
+def _show_export_result(resp, result_widget) -> bool:
+    """export_schedules のレスポンスを表示する"""
+    if resp and resp.get("ok") is True:
+        data = resp.get("data", {})
+        exported = data.get("exported", 0)
+        result_widget.insert("end", f"{exported}件の予定をエクスポートしました。\n")
+        result_widget.insert("end", f"保存先: {data.get('path')}\n")
+        messagebox.showinfo("成功", f"{exported}件の予定をエクスポートしました。")
+        return True
 
     elif resp and resp.get("ok") is False:
         error = resp.get("error", {})
-        result_widget.insert("end", f"エラー: {error.get('message', '不明なエラー')}\n")
-        messagebox.showerror("エラー", error.get("message", "不明なエラー"))
+        message = error.get("message", "不明なエラー")
+        if error.get("code") == "IO_ERROR":
+            result_widget.insert("end", f"ファイル保存エラー: {message}\n")
+            messagebox.showerror("エラー", f"ファイル保存に失敗しました: {message}")
+        else:
+            result_widget.insert("end", f"エラー: {message}\n")
+            messagebox.showerror("エラー", message)
         return False
     else:
         result_widget.insert(
@@ -110,99 +116,113 @@ def export_schedules(
         return False
 
 
+def _load_schedules_file(file_path: str):
+    """エクスポートしたファイル（JSON 配列または JSON Lines）を読み込む"""
+    with open(file_path, "r", encoding="utf-8") as f:
+        if file_path.lower().endswith(".jsonl"):
+            return [json.loads(line) for line in f if line.strip()]
+        return json.load(f)
+
+
 def import_schedules(
     result_widget,
     master_root,
     on_success_callback=None,
-) -> bool:
+) -> Future:
     """
     JSONファイルからスケジュールをインポート
 
+    応答はイベントループを止めずに待つ（件数が多くても画面が固まらない）。
+
     Args:
         result_widget: 結果表示用のテキストウィジェット（tk.Text）
         master_root: Tkinterのマスターウィンドウ
         on_success_callback: インポート成功時のコールバック関数（引数なし）
 
     Returns:
-        bool: 成功したか否か
+        Future: 成功したか否か（bool）で完了する Future
     """
+    done: Future = Future()
+
     file_path = filedialog.askopenfilename(
         title="インポートするファイルを選択",
-        filetypes=[("JSON files", "*.json"), ("All files", "*.*")],
+        filetypes=[
+            ("JSON files", "*.json"),
+            ("JSON Lines files", "*.jsonl"),
+            ("All files", "*.*"),
+        ],
     )
 
     if not file_path:
-        return False
+        done.set_result(False)
+        return done
 
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            schedules = json.load(f)
-
-        if not isinstance(schedules, list):
-            messagebox.showerror(
-                "エラー", "無効なファイル形式です。スケジュールのリストが必要です。"
-            )
-            return False
-
-        # IDフィールドを削除（新規作成するため）
-        for sc in schedules:
-            if "id" in sc:
-                del sc["id"]
-
-        payload = {
-            "action": "import_schedules",
-            "schedules": schedules,
-        }
-        request_id = write_request(payload)
-        result_widget.delete("1.0", "end")
-        result_widget.insert("end", f"{len(schedules)}件の予定をインポート中...\n")
-        result_widget.update()
-
-        resp = wait_for_response(
-            "import_schedules",
-            request_id,
-            timeout=IMPORT_TIMEOUT,
-            root=master_root,
-        )
-
-        if resp and resp.get("ok") is True:
-            data = resp.get("data", {})
-            imported = data.get("imported", 0)
-            errors = data.get("errors", [])
-
-            result_widget.insert("end", f"{imported}件の予定をインポートしました。\n")
-            if errors:
-                result_widget.insert("end", f"{len(errors)}件のエラーがありました:\n")
-                for err in errors[:10]:  # 最初の10件のみ表示
-                    result_widget.insert("end", f"  - {err}\n")
-                if len(errors) > 10:
-                    result_widget.insert("end", f"  ... 他{len(errors) - 10}件\n")
-
-            messagebox.showinfo("完了", f"{imported}件の予定をインポートしました。")
-
-            # コールバック実行
-            if on_success_callback:
-                on_success_callback()
-
-            return True
-
-        elif resp and resp.get("ok") is False:
-            error = resp.get("error", {})
-            result_widget.insert(
-                "end", f"エラー: {error.get('message', '不明なエラー')}\n"
-            )
-            messagebox.showerror("エラー", error.get("message", "不明なエラー"))
-            return False
-        else:
-            result_widget.insert(
-                "end", "タイムアウト: バックエンドからの応答がありませんでした。\n"
-            )
-            messagebox.showerror("エラー", "バックエンドからの応答がありませんでした。")
-            return False
-
+        schedules = _load_schedules_file(file_path)
     except json.JSONDecodeError as e:
         messagebox.showerror("エラー", f"JSONファイルの解析に失敗しました: {e}")
-        return False
+        done.set_result(False)
+        return done
     except Exception as e:
         messagebox.showerror("エラー", f"インポート中にエラーが発生しました: {e}")
+        done.set_result(False)
+        return done
+
+    if not isinstance(schedules, list):
+        messagebox.showerror(
+            "エラー", "無効なファイル形式です。スケジュールのリストが必要です。"
+        )
+        done.set_result(False)
+        return done
+
+    # IDフィールドを削除（新規作成するため）
+    for sc in schedules:
+        if isinstance(sc, dict) and "id" in sc:
+            del sc["id"]
+
+    payload = {
+        "action": "import_schedules",
+        "schedules": schedules,
+    }
+    result_widget.delete("1.0", "end")
+    result_widget.insert("end", f"{len(schedules)}件の予定をインポート中...\n")
+
+    def _on_response(resp):
+        ok = _show_import_result(resp, result_widget)
+        if ok and on_success_callback:
+            on_success_callback()
+        done.set_result(ok)
+
+    send_request(payload, master_root, callback=_on_response)
+    return done
+
+
+def _show_import_result(resp, result_widget) -> bool:
+    """import_schedules のレスポンスを表示する"""
+    if resp and resp.get("ok") is True:
+        data = resp.get("data", {})
+        imported = data.get("imported", 0)
+        errors = data.get("errors", [])
+
+        result_widget.insert("end", f"{imported}件の予定をインポートしました。\n")
+        if errors:
+            result_widget.insert("end", f"{len(errors)}件のエラーがありました:\n")
+            for err in errors[:10]:  # 最初の10件のみ表示
+                result_widget.insert("end", f"  - {err}\n")
+            if len(errors) > 10:
+                result_widget.insert("end", f"  ... 他{len(errors) - 10}件\n")
+
+        messagebox.showinfo("完了", f"{imported}件の予定をインポートしました。")
+        return True
+
+    elif resp and resp.get("ok") is False:
+        error = resp.get("error", {})
+        result_widget.insert("end", f"エラー: {error.get('message', '不明なエラー')}\n")
+        messagebox.showerror("エラー", error.get("message", "不明なエラー"))
+        return False
+    else:
+        result_widget.insert(
+            "end", "タイムアウト: バックエンドからの応答がありませんでした。\n"
+        )
+        messagebox.showerror("エラー", "バックエンドからの応答がありませんでした。")
         return False
@@ -0,0 +1,131 @@
+"""
+月単位のキャッシュモジュール
+(year, month) をキーにした LRU キャッシュと、予定の書き込み・データバージョンによる無効化を管理
+"""
+
+import threading
+from collections import OrderedDict
+
+from ..request_handler import add_write_listener, add_response_listener
+
+# 予定密度（get_month_density の結果）を保持する月数
+DENSITY_CACHE_SIZE = 24
+# 月の予定一覧（get_monthly_schedule の結果）を保持する月数
+SCHEDULE_CACHE_SIZE = 12
+
+
+class MonthCache:
+    """
+    (year, month) をキーにした LRU キャッシュ
+
+    invalidate() のたびに generation が進む。リクエスト送信時の generation を
+    put() に渡すと、その間に無効化されていた場合は古い結果を保存しない。
+    また、バックエンドの data_version がこれまでより進んだら中身を捨て、
+    それより古いバージョンの結果は保存しない。
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.generation = 0
+        self.version: int | None = None
+        self._items: "OrderedDict[tuple[int, int], object]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple[int, int]):
+        """キャッシュされた値（無ければ None）を返し、最近使ったものとして扱う"""
+        with self._lock:
+            if key not in self._items:
+                return None
+            self._items.move_to_end(key)
+            return self._items[key]
+
+    def put(
+        self,
+        key: tuple[int, int],
+        value,
+        generation: int | None = None,
+        version: int | None = None,
+    ) -> bool:
+        """
+        値を保存する
+
+        Args:
+            key: (year, month)
+            value: 保存する値
+            generation: リクエスト送信時の generation（省略時は常に保存）
+            version: 値を返したレスポンスの data_version（省略時は確認しない）
+
+        Returns:
+            bool: 保存したか（送信後に無効化されていた場合や、
+                より新しいバージョンを既に見ている場合は False）
+        """
+        with self._lock:
+            if version is not None:
+                self._observe(version)
+                if version != self.version:
+                    return False
+            if generation is not None and generation != self.generation:
+                return False
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+            return True
+
+    def observe_version(self, version: int | None) -> None:
+        """レスポンスの data_version を記録し、進んでいたら中身を捨てる"""
+        if version is None:
+            return
+        with self._lock:
+            self._observe(version)
+
+    def _observe(self, version: int) -> None:
+        if self.version is not None and version <= self.version:
+            return
+        if self.version is not None:
+            self._items.clear()
+        self.version = version
+
+    def invalidate(self, *_args) -> None:
+        """すべて破棄する（書き込みリスナーとしても使える）"""
+        with self._lock:
+            self._items.clear()
+            self.generation += 1
+
+    def __contains__(self, key) -> bool:
+        with self._lock:
+            return key in self._items
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._items)
+
+
+def schedules_on(items: list[dict], day: str) -> list[dict]:
+    """
+    月の予定一覧から指定日に重なる予定を get_schedule と同じ順（開始時刻順）で返す
+
+    Args:
+        items: get_monthly_schedule の schedules（その日を含む月のもの）
+        day: 日付（YYYY-MM-DD）
+    """
+    hits = [sc for sc in items if sc["start_date"] <= day <= sc["end_date"]]
+    hits.sort(key=lambda sc: sc["start_time"])
+    return hits
+
+
+# 月ごとの予定密度（日付 → (件数, モードのビットマスク)）
+density_cache = MonthCache(DENSITY_CACHE_SIZE)
+# 月ごとの予定一覧（get_monthly_schedule の data。schedules と travel を含む）
+schedule_cache = MonthCache(SCHEDULE_CACHE_SIZE)
+
+
+def _observe_response(resp: dict) -> None:
+    version = resp.get("data_version")
+    density_cache.observe_version(version)
+    schedule_cache.observe_version(version)
+
+
+for _cache in (density_cache, schedule_cache):
+    add_write_listener(_cache.invalidate)
+add_response_listener(_observe_response)
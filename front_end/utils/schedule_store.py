@@ -0,0 +1,128 @@
+"""
+予定一覧の保持モジュール
+一覧の予定を列ごとの配列で持ち、表示する行の値と外出時刻を必要になったときだけ作る
+"""
+
+from array import array
+
+MINUTES_PER_DAY = 24 * 60
+
+# 開始時刻が読めない行の印（start_minutes の値）
+NO_TIME = -1
+
+
+def parse_minute(value) -> int:
+    """'HH:MM' をその日の 0:00 からの分に変換する（読めなければ NO_TIME）"""
+    try:
+        hour, minute = str(value).split(":")
+        hour, minute = int(hour), int(minute)
+    except (TypeError, ValueError):
+        return NO_TIME
+    if not (0 <= hour < 24 and 0 <= minute < 60):
+        return NO_TIME
+    return hour * 60 + minute
+
+
+def departure_time(start_minute: int, travel_minutes: int) -> str:
+    """開始時刻（分）から移動時間を引いた時刻を HH:MM で返す（前日にまたがってもよい）"""
+    if start_minute == NO_TIME:
+        return "-"
+    minute = (start_minute - int(travel_minutes)) % MINUTES_PER_DAY
+    return f"{minute // 60:02d}:{minute % 60:02d}"
+
+
+def travel_minutes(mode, commute_time: int, school_time: int) -> int:
+    """モードに応じた移動時間（A: 通学時間、それ以外: 通勤時間）"""
+    return school_time if mode == "A" else commute_time
+
+
+class ScheduleStore:
+    """
+    予定一覧を列ごとに持つ入れ物
+
+    同じ日付・時刻・モードの文字列は1つにまとめ、開始時刻は分の配列で持つ。
+    store[i] で get_monthly_schedule と同じ形の dict を組み立てて返す。
+
+    バックエンドが返した通算分（start_minutes）があれば時刻の文字列は読まず、
+    外出時刻（departure_time）は、計算に使われた移動時間の設定 travel が
+    表示時の設定と同じ間はそのまま使う。
+    """
+
+    def __init__(self, items=(), travel: dict | None = None):
+        self.ids = array("q")
+        self.start_minutes = array("h")
+        self.modes: list = []
+        self.names: list = []
+        self.start_dates: list = []
+        self.start_times: list = []
+        self.end_dates: list = []
+        self.end_times: list = []
+        self.departures: list = []
+        self.travel = (
+            (travel.get("commute_time"), travel.get("school_time")) if travel else None
+        )
+        self._has_id = array("b")
+        self._strings: dict = {}
+        self.extend(items)
+
+    def _intern(self, value):
+        if value is None:
+            return None
+        return self._strings.setdefault(value, value)
+
+    def extend(self, items) -> None:
+        """予定（dict）をまとめて追加する"""
+        intern = self._intern
+        for sc in items:
+            sid = sc.get("id")
+            self.ids.append(sid if sid is not None else 0)
+            self._has_id.append(sid is not None)
+            self.modes.append(intern(sc.get("mode", "-")))
+            self.names.append(sc.get("name", ""))
+            self.start_dates.append(intern(sc.get("start_date", "")))
+            self.start_times.append(intern(sc.get("start_time", "")))
+            self.end_dates.append(intern(sc.get("end_date", "")))
+            self.end_times.append(intern(sc.get("end_time", "")))
+            minutes = sc.get("start_minutes")
+            if minutes is None:
+                self.start_minutes.append(parse_minute(sc.get("start_time")))
+            else:
+                self.start_minutes.append(minutes % MINUTES_PER_DAY)
+            self.departures.append(intern(sc.get("departure_time")))
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __getitem__(self, index: int) -> dict:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("schedule index out of range")
+        return {
+            "id": self.ids[index] if self._has_id[index] else None,
+            "mode": self.modes[index],
+            "name": self.names[index],
+            "start_date": self.start_dates[index],
+            "start_time": self.start_times[index],
+            "end_date": self.end_dates[index],
+            "end_time": self.end_times[index],
+        }
+
+    def row(self, index: int, commute_time: int, school_time: int) -> tuple:
+        """Treeview の1行分の値（モード, タイトル, 開始, 終了, 外出時刻）"""
+        mode = self.modes[index]
+        departure = None
+        if self.travel == (commute_time, school_time):
+            departure = self.departures[index]
+        if departure is None:
+            departure = departure_time(
+                self.start_minutes[index],
+                travel_minutes(mode, commute_time, school_time),
+            )
+        return (
+            mode,
+            self.names[index],
+            f"{self.start_dates[index]} {self.start_times[index]}",
+            f"{self.end_dates[index]} {self.end_times[index]}",
+            departure,
+        )
@@ -0,0 +1,50 @@
+"""
+勤務時間計算モジュール
+シフトと深夜時間帯の重なりを、整数の分単位の区間演算で求める
+（区間演算は common/worktime.py をバックエンドと共有する）
+"""
+
+from datetime import datetime
+
+from common import worktime as _worktime
+
+from .constants import NIGHT_HOURS_START, NIGHT_HOURS_END
+
+
+def night_window(
+    night_start: int | None = None, night_end: int | None = None
+) -> tuple[int, int]:
+    """
+    深夜時間帯を「日の始まりからの分」の組 (開始, 終了) で返す
+
+    Args:
+        night_start: 深夜開始時刻（時。省略時は NIGHT_HOURS_START）
+        night_end: 深夜終了時刻（時。省略時は NIGHT_HOURS_END）
+
+    Returns:
+        tuple[int, int]: (開始分, 終了分)。開始 > 終了 なら日をまたぐ時間帯、
+            開始 == 終了 なら終日
+    """
+    if night_start is None:
+        night_start = NIGHT_HOURS_START
+    if night_end is None:
+        night_end = NIGHT_HOURS_END
+    return int(night_start) * 60, int(night_end) * 60
+
+
+def split_minutes(
+    start: datetime, end: datetime, window: tuple[int, int] | None = None
+) -> tuple[int, int]:
+    """
+    勤務の総分数と、そのうち深夜時間帯の分数を返す
+
+    Args:
+        start: 勤務開始日時
+        end: 勤務終了日時
+        window: night_window() の戻り値（省略時は定数の深夜時間帯）
+
+    Returns:
+        tuple[int, int]: (総分数, 深夜分数)。終了が開始以前なら (0, 0)
+    """
+    night_start, night_end = window or night_window()
+    return _worktime.split_minutes(start, end, night_start, night_end)
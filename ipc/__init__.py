@@ -0,0 +1 @@
+# IPC module: フロントエンドとバックエンド間のリクエスト受け渡し
@@ -0,0 +1,96 @@
+"""
+アトミックなファイル書き込み
+一時ファイルに書いてから os.replace() で置き換えるので、読み手が書き込み途中の内容を見ることはない
+"""
+
+import json
+import os
+import stat
+import tempfile
+import threading
+from contextlib import contextmanager
+
+# 新しく作るファイルのパーミッション（umask を引く前。open() と同じ）
+NEW_FILE_MODE = 0o666
+
+_umask_lock = threading.Lock()
+
+
+def _umask() -> int:
+    """現在の umask（Linux では /proc から読み、変更せずに済ませる）"""
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("Umask:"):
+                    return int(line.split()[1], 8)
+    except (OSError, ValueError):
+        pass
+    # 読めない環境では一度設定して戻す（その間に他のスレッドが作らないようロックする）
+    with _umask_lock:
+        mask = os.umask(0)
+        os.umask(mask)
+    return mask
+
+
+def _target_mode(path: str) -> int:
+    """置き換え後のパーミッション（既存ファイルはそのまま、新規は open() と同じ）"""
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        return NEW_FILE_MODE & ~_umask()
+
+
+@contextmanager
+def atomic_open(path: str, mode: str = "wb", encoding: str | None = None):
+    """
+    同じディレクトリの一時ファイルを開き、with ブロックを抜けたら os.replace() で置き換える
+
+    少しずつ書き込む場合（ストリーミング出力）に使う。例外時は一時ファイルを消し、
+    元のファイルは変更しない。パーミッションは既存のファイルに合わせ（新規なら
+    open() と同じく umask を引いた 0666）、シンボリックリンクはリンク先を置き換える。
+
+    Args:
+        path: 書き込み先のパス
+        mode: open() のモード（"wb" または "w"）
+        encoding: テキストモードのエンコーディング
+    """
+    # リンク自体ではなくリンク先を置き換える（一時ファイルもリンク先のディレクトリに作る）
+    path = os.path.realpath(path)
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(
+        dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, mode, encoding=encoding) as f:
+            yield f
+        # mkstemp は 0600 で作るので、置き換える前に合わせる
+        os.chmod(tmp_path, _target_mode(path))
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def atomic_write_bytes(path: str, data: bytes) -> None:
+    """
+    同じディレクトリの一時ファイルに書き込み、os.replace() で置き換える
+
+    Args:
+        path: 書き込み先のパス
+        data: 書き込む内容
+    """
+    with atomic_open(path, "wb") as f:
+        f.write(data)
+
+
+def atomic_write_json(path: str, data, indent: int | None = None) -> None:
+    """辞書などを JSON としてアトミックに書き込む（既定はインデントなし）"""
+    if indent is None:
+        text = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    else:
+        text = json.dumps(data, ensure_ascii=False, indent=indent)
+    atomic_write_bytes(path, text.encode("utf-8"))
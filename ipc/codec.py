@@ -0,0 +1,157 @@
+"""
+IPC ペイロードのエンコード方式（コーデック）
+ジャーナルのレコードヘッダにコーデック名を書くので、読み手は自動で判別できる
+
+- json:     インデントなしのコンパクトな JSON
+- columnar: 辞書のリストを列形式（フィールド名は1回だけ）にしたコンパクトな JSON
+- msgpack:  msgpack（パッケージがインストールされている場合のみ）
+"""
+
+import json
+from typing import Any, Callable, Dict, Tuple
+
+try:
+    import msgpack  # type: ignore
+except ImportError:  # 任意の依存パッケージ
+    msgpack = None
+
+DEFAULT_CODEC = "json"
+
+# 列形式のエンベロープ。最上位を {"__columnar__": 版, "body": ...} で包み、
+# その中だけで列形式の目印を解釈する
+COLUMNAR_KEY = "__columnar__"
+COLUMNAR_VERSION = 1
+BODY_KEY = "body"
+# 列形式に変換したリストの目印
+COLUMNS_KEY = "__columns__"
+ROWS_KEY = "__rows__"
+# 目印と同じキーを持つ利用者の辞書は {"__dict__": {...}} でエスケープする
+ESCAPE_KEY = "__dict__"
+
+
+def to_columns(obj: Any) -> Any:
+    """
+    同じキー構成の辞書が並ぶリストを {"__columns__": [...], "__rows__": [[...], ...]} に変換する
+
+    get_all_schedules などの予定一覧ではフィールド名が行数ぶん繰り返されるので、
+    列名を1回だけ書くことでサイズとパース時間を減らす。
+    目印のキー（__columns__ / __dict__）を持つ辞書はエスケープして、列形式と区別する。
+    """
+    if isinstance(obj, dict):
+        converted = {k: to_columns(v) for k, v in obj.items()}
+        if COLUMNS_KEY in obj or ESCAPE_KEY in obj:
+            return {ESCAPE_KEY: converted}
+        return converted
+    if isinstance(obj, list):
+        if len(obj) >= 2 and all(isinstance(x, dict) for x in obj):
+            keys = list(obj[0].keys())
+            if all(list(x.keys()) == keys for x in obj):
+                return {
+                    COLUMNS_KEY: keys,
+                    ROWS_KEY: [[to_columns(x[k]) for k in keys] for x in obj],
+                }
+        return [to_columns(x) for x in obj]
+    return obj
+
+
+def from_columns(obj: Any) -> Any:
+    """to_columns() の逆変換"""
+    if isinstance(obj, dict):
+        if len(obj) == 1 and ESCAPE_KEY in obj:
+            return {k: from_columns(v) for k, v in obj[ESCAPE_KEY].items()}
+        if COLUMNS_KEY in obj:
+            keys = obj[COLUMNS_KEY]
+            return [
+                {k: from_columns(v) for k, v in zip(keys, row)} for row in obj[ROWS_KEY]
+            ]
+        return {k: from_columns(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [from_columns(x) for x in obj]
+    return obj
+
+
+def _is_columnar(obj: Any) -> bool:
+    return isinstance(obj, dict) and set(obj) == {COLUMNAR_KEY, BODY_KEY}
+
+
+def _columnar_dumps(obj: Any) -> bytes:
+    return _json_dumps({COLUMNAR_KEY: COLUMNAR_VERSION, BODY_KEY: to_columns(obj)})
+
+
+def _columnar_loads(body: bytes) -> Any:
+    return _unwrap_columnar(_json_loads(body))
+
+
+def _unwrap_columnar(obj: Any) -> Any:
+    if not _is_columnar(obj):
+        raise ValueError("missing columnar envelope")
+    if obj[COLUMNAR_KEY] != COLUMNAR_VERSION:
+        raise ValueError(f"unsupported columnar version: {obj[COLUMNAR_KEY]}")
+    return from_columns(obj[BODY_KEY])
+
+
+def _json_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _json_loads(body: bytes) -> Any:
+    return json.loads(body.decode("utf-8"))
+
+
+_CODECS: Dict[str, Tuple[Callable[[Any], bytes], Callable[[bytes], Any]]] = {
+    "json": (_json_dumps, _json_loads),
+    "columnar": (_columnar_dumps, _columnar_loads),
+}
+if msgpack is not None:
+    _CODECS["msgpack"] = (
+        lambda obj: msgpack.packb(obj, use_bin_type=True),
+        lambda body: msgpack.unpackb(body, raw=False),
+    )
+
+
+def available_codecs() -> list[str]:
+    """この環境で使えるコーデック名の一覧"""
+    return list(_CODECS)
+
+
+def resolve_codec(name: str | None) -> str:
+    """未知・未インストールのコーデック名は既定のコーデックに置き換える"""
+    return name if name in _CODECS else DEFAULT_CODEC
+
+
+def encode(obj: Any, codec: str = DEFAULT_CODEC) -> bytes:
+    """オブジェクトを指定コーデックでバイト列にする"""
+    return _CODECS[resolve_codec(codec)][0](obj)
+
+
+def decode(body: bytes, codec: str = DEFAULT_CODEC) -> Any:
+    """
+    バイト列を指定コーデックで復元する
+
+    Raises:
+        ValueError: 未知のコーデック、または復元に失敗した場合
+    """
+    if codec not in _CODECS:
+        raise ValueError(f"unknown codec: {codec}")
+    try:
+        return _CODECS[codec][1](body)
+    except ValueError:
+        raise
+    except Exception as e:
+        raise ValueError(str(e)) from e
+
+
+def decode_auto(body: bytes) -> Any:
+    """
+    コーデック名の分からないバイト列（response.json など）を判別して復元する
+
+    JSON として読めなければ msgpack を試す。列形式の逆変換は
+    エンベロープ付きのものだけに行い、素の JSON はそのまま返す。
+    """
+    stripped = body.lstrip()
+    if stripped[:1] in (b"{", b"["):
+        obj = _json_loads(stripped)
+        return _unwrap_columnar(obj) if _is_columnar(obj) else obj
+    if "msgpack" in _CODECS:
+        return decode(body, "msgpack")
+    raise ValueError("unrecognized payload encoding")
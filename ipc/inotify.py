@@ -0,0 +1,99 @@
+"""
+Linux inotify によるファイル変更通知
+ジャーナルへの書き込み完了（IN_CLOSE_WRITE）や置き換え（IN_MOVED_TO）でだけ起床する
+"""
+
+import ctypes
+import ctypes.util
+import os
+import struct
+import sys
+from typing import Iterable, Set
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+
+# struct inotify_event { int wd; uint32_t mask; uint32_t cookie; uint32_t len; char name[]; }
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+def _load_libc():
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    except OSError:
+        return None
+    if not hasattr(libc, "inotify_init1"):
+        return None
+    return libc
+
+
+def is_available() -> bool:
+    """inotify が使える環境か"""
+    return _load_libc() is not None
+
+
+class InotifyWatcher:
+    """
+    ディレクトリを監視し、指定ファイル名への書き込み完了を通知する
+
+    ファイルそのものではなくディレクトリを監視するので、
+    os.replace() による置き換え後も監視が外れない。
+    """
+
+    def __init__(self, directory: str, filenames: Iterable[str]):
+        libc = _load_libc()
+        if libc is None:
+            raise OSError("inotify is not available on this platform")
+
+        self.filenames = set(filenames)
+        self._fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+
+        wd = libc.inotify_add_watch(
+            self._fd, os.fsencode(os.path.abspath(directory)), IN_CLOSE_WRITE | IN_MOVED_TO
+        )
+        if wd < 0:
+            err = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(err, os.strerror(err))
+
+    def fileno(self) -> int:
+        return self._fd
+
+    def read_events(self) -> Set[str]:
+        """
+        溜まっているイベントを読み、監視対象のうち変更されたファイル名を返す
+
+        Returns:
+            Set[str]: 変更されたファイル名（イベントが無ければ空集合）
+        """
+        changed: Set[str] = set()
+        while True:
+            try:
+                buf = os.read(self._fd, 4096)
+            except BlockingIOError:
+                break
+            if not buf:
+                break
+            pos = 0
+            while pos + _EVENT_HEADER.size <= len(buf):
+                _, _, _, name_len = _EVENT_HEADER.unpack_from(buf, pos)
+                pos += _EVENT_HEADER.size
+                name = buf[pos : pos + name_len].split(b"\0", 1)[0].decode(
+                    "utf-8", "replace"
+                )
+                pos += name_len
+                if name in self.filenames:
+                    changed.add(name)
+        return changed
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
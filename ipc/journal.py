@@ -0,0 +1,221 @@
+"""
+追記型のリクエスト/レスポンスジャーナル
+レコードごとに長さと CRC32 のヘッダを付けて追記し、読み手は自分の読み込み位置から
+新しいレコードだけを読む。ヘッダの長さに満たないレコードは書き込み途中として次回に回す
+
+レコード形式:
+    FRJ1 <コーデック名> <本文のバイト数> <本文の CRC32（16進8桁）>\n<本文>\n
+
+本文のエンコード方式は ipc.codec を参照。ヘッダにコーデック名があるので、
+読み手は書き手の設定を知らなくても復元できる。
+
+読み手（各ジャーナルに1つ）は、すべて読み終えたジャーナルが compact_bytes を超えたら
+空に切り詰める。追記と切り詰めはファイルロック（flock）で排他する。
+"""
+
+import os
+import threading
+import zlib
+from typing import List, Tuple
+
+from ipc import codec as _codec
+
+try:
+    import fcntl
+except ImportError:  # Windows には無い。ロックせず、切り詰めも行わない
+    fcntl = None
+
+RECORD_MAGIC = b"FRJ1"
+
+# 読み終えたジャーナルを切り詰める大きさ（バイト）
+COMPACT_BYTES = 1 << 20
+
+# response.json に本文の代わりに書く、最新のレスポンスの目印のキー
+LATEST_MARKER = "__latest__"
+
+# 同一プロセス内の複数スレッドからの追記を直列化する
+_append_lock = threading.Lock()
+
+
+def append_record(path: str, record: dict, codec: str = _codec.DEFAULT_CODEC) -> None:
+    """
+    ジャーナルにレコードを1件追記する
+
+    Args:
+        path: ジャーナルファイルのパス
+        record: 追記するレコード（_request_id を含む辞書）
+        codec: 本文のエンコード方式（ipc.codec のコーデック名）
+    """
+    codec = _codec.resolve_codec(codec)
+    data = encode_record(_codec.encode(record, codec), codec)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with _append_lock:
+        # O_APPEND + 1回の write で他プロセスの追記と混ざらないようにする
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            if fcntl is not None:
+                # 読み手の切り詰めと重ならないようにする（close で解放される）
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+
+
+def encode_record(body: bytes, codec: str = _codec.DEFAULT_CODEC) -> bytes:
+    """本文にコーデック名・長さ・CRC32 のヘッダを付けたレコードを作る"""
+    header = b"%s %s %d %08x\n" % (
+        RECORD_MAGIC,
+        codec.encode("ascii"),
+        len(body),
+        zlib.crc32(body),
+    )
+    return header + body + b"\n"
+
+
+def decode_records(chunk: bytes) -> Tuple[List[Tuple[str, bytes] | None], int]:
+    """
+    バイト列から完全なレコードの (コーデック名, 本文) を取り出す
+
+    Returns:
+        Tuple[List[Tuple[str, bytes] | None], int]: レコードのリスト（壊れたレコードは None）と
+            消費したバイト数（書き込み途中の末尾レコードは含まない）
+    """
+    bodies: List[Tuple[str, bytes] | None] = []
+    pos = 0
+    while pos < len(chunk):
+        header_end = chunk.find(b"\n", pos)
+        if header_end < 0:
+            break
+        parts = chunk[pos:header_end].split(b" ")
+        try:
+            if len(parts) != 4 or parts[0] != RECORD_MAGIC:
+                raise ValueError("bad header")
+            codec = parts[1].decode("ascii")
+            length = int(parts[2])
+            crc = int(parts[3], 16)
+        except ValueError:
+            # ヘッダが壊れている：次の行から読み直す
+            bodies.append(None)
+            pos = header_end + 1
+            continue
+
+        body_start = header_end + 1
+        body_end = body_start + length
+        if body_end + 1 > len(chunk):
+            break  # 書き込み途中
+        body = chunk[body_start:body_end]
+        bodies.append((codec, body) if zlib.crc32(body) == crc else None)
+        pos = body_end + 1
+    return bodies, pos
+
+
+def latest_marker(record: dict) -> dict:
+    """
+    最新のレスポンスの目印（本文を除いたもの）を作る
+
+    本文はジャーナルにだけ書き、response.json にはこれを書く（大きなレスポンスを
+    二重に書かない）。読み手は _request_id でジャーナルから本文を引く。
+    """
+    return {
+        "_request_id": record.get("_request_id"),
+        "action": record.get("action"),
+        "ok": record.get("ok"),
+        LATEST_MARKER: True,
+    }
+
+
+def reset_journal(path: str) -> None:
+    """ジャーナルを空にする（起動時に古いリクエストを再実行しないため）"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "wb"):
+        pass
+
+
+class JournalReader:
+    """
+    ジャーナルの読み込み位置を保持し、追記された完全なレコードだけを返す
+
+    compact_bytes を指定すると、すべて読み終えた時点で読み込み位置がそれを超えていれば
+    ジャーナルを空にする（同じジャーナルを読むのがこの読み手だけの場合に使う）。
+    """
+
+    def __init__(
+        self, path: str, start_at_end: bool = False, compact_bytes: int | None = None
+    ):
+        self.path = path
+        self.compact_bytes = compact_bytes
+        self.offset = 0
+        self._lock = threading.Lock()
+        if start_at_end:
+            self.offset = self._size()
+
+    def _size(self) -> int:
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+    def has_new_data(self) -> bool:
+        """未読のデータがあるか（切り詰められた場合も True）"""
+        size = self._size()
+        return size != self.offset
+
+    def read_new(self) -> List[dict]:
+        """
+        前回の読み込み位置以降に追記されたレコードを読む
+
+        書き込み途中の末尾レコードは次回に回す。長さ・CRC が合わない、
+        または JSON として壊れたレコードは {"__parse_error__": True} として返す。
+
+        Returns:
+            List[dict]: 追記順のレコード
+        """
+        with self._lock:
+            size = self._size()
+            if size < self.offset:
+                # ジャーナルが切り詰められた
+                self.offset = 0
+            if size == self.offset:
+                return []
+
+            try:
+                with open(self.path, "rb") as f:
+                    f.seek(self.offset)
+                    chunk = f.read(size - self.offset)
+            except OSError:
+                return []
+
+            bodies, consumed = decode_records(chunk)
+            self.offset += consumed
+            if self.compact_bytes is not None and self.offset >= self.compact_bytes:
+                self._compact()
+
+        records = []
+        for entry in bodies:
+            try:
+                if entry is None:
+                    raise ValueError("corrupted record")
+                record = _codec.decode(entry[1], entry[0])
+                if not isinstance(record, dict):
+                    raise ValueError("record must be an object")
+                records.append(record)
+            except ValueError:
+                records.append({"__parse_error__": True})
+        return records
+
+    def _compact(self) -> None:
+        """未読が無ければジャーナルを空にする（self._lock を持って呼ぶ）"""
+        if fcntl is None:
+            return
+        try:
+            fd = os.open(self.path, os.O_RDWR)
+        except OSError:
+            return
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            # 書き手はロックを持って追記するので、大きさが読み込み位置と同じなら未読は無い
+            if os.fstat(fd).st_size == self.offset:
+                os.ftruncate(fd, 0)
+                self.offset = 0
+        finally:
+            os.close(fd)
@@ -0,0 +1,123 @@
+"""
+インプロセス・リクエストキュー
+GUI と同じプロセスで動くバックエンドへ、ファイルを介さずにリクエストを渡す
+"""
+
+import queue
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict
+
+# 誰も待機しないリクエスト（ChangeWindow の単発送信など）の Future を保持する上限
+MAX_PENDING_FUTURES = 256
+
+
+class InProcessTransport:
+    """
+    スレッドセーフなキューと _request_id ごとの Future でリクエストを仲介する
+
+    write_request() 側が submit() でキューに積み、wait() または
+    ウォッチャーの定期処理が drain() で handle_request を実行する。
+    handler は dict の代わりに Future を返してもよい（別スレッドで実行する場合）。
+    その Future が完了した時点でレスポンスを受け取れる。
+    """
+
+    def __init__(self, handler: Callable[[dict], "dict | Future"]):
+        self._handler = handler
+        self._queue: "queue.Queue[dict]" = queue.Queue()
+        self._futures: "OrderedDict[str, Future]" = OrderedDict()
+        self._lock = threading.Lock()
+        # 複数スレッドから drain() されても到着順に処理する
+        self._drain_lock = threading.Lock()
+        self.last_response: Dict[str, Any] | None = None
+        # submit() のたびに呼ばれる通知（ウォッチャーが処理の予約に使う）
+        self.on_submit: Callable[[], None] | None = None
+
+    def submit(self, payload: dict) -> Future:
+        """リクエストをキューに積み、レスポンス用の Future を返す"""
+        request_id = payload["_request_id"]
+        future: Future = Future()
+        with self._lock:
+            self._futures[request_id] = future
+            while len(self._futures) > MAX_PENDING_FUTURES:
+                self._futures.popitem(last=False)
+        self._queue.put(payload)
+        if self.on_submit is not None:
+            self.on_submit()
+        return future
+
+    def drain(self) -> int:
+        """キューに溜まったリクエストをすべて処理し、処理件数を返す"""
+        processed = 0
+        with self._drain_lock:
+            while True:
+                try:
+                    payload = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                self._dispatch(payload)
+                processed += 1
+        return processed
+
+    def wait(self, request_id: str, timeout: float) -> dict | None:
+        """指定されたリクエストIDのレスポンスを返す（未処理ならその場で処理する）"""
+        with self._lock:
+            future = self._futures.get(request_id)
+        if future is None:
+            return None
+        if not future.done():
+            self.drain()
+        try:
+            return future.result(timeout=timeout)
+        except Exception:
+            return None
+        finally:
+            with self._lock:
+                self._futures.pop(request_id, None)
+
+    def poll(self, request_id: str) -> dict | None:
+        """処理済みならレスポンスを返す（未処理なら待たずに None を返す）"""
+        with self._lock:
+            future = self._futures.get(request_id)
+            if future is None or not future.done():
+                return None
+            self._futures.pop(request_id, None)
+        return future.result()
+
+    def _dispatch(self, payload: dict) -> None:
+        try:
+            result = self._handler(payload)
+        except Exception as e:
+            result = _exception_response(payload, e)
+
+        if isinstance(result, Future):
+            result.add_done_callback(lambda f: self._complete(payload, f))
+            return
+        self._deliver(payload, result)
+
+    def _complete(self, payload: dict, future: Future) -> None:
+        try:
+            result = future.result()
+        except Exception as e:
+            result = _exception_response(payload, e)
+        self._deliver(payload, result)
+
+    def _deliver(self, payload: dict, result: dict) -> None:
+        request_id = payload.get("_request_id")
+        if request_id:
+            result["_request_id"] = request_id
+        self.last_response = result
+
+        with self._lock:
+            future = self._futures.get(request_id) if request_id else None
+        if future is not None and not future.done():
+            future.set_result(result)
+
+
+def _exception_response(payload: dict, e: Exception) -> Dict[str, Any]:
+    return {
+        "ok": False,
+        "action": payload.get("action") or "unknown",
+        "error": {"code": "EXCEPTION", "message": str(e)},
+    }
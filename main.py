@@ -1,3 +1,4 @@
+import os
 import tkinter as tk
 
 from back_end.db.init import initialize_database
@@ -20,6 +21,12 @@ def run_app() -> None:
     root.geometry("1100x700")
     watcher = JsonRequestWatcherTk(root)
 
+    # 既定はインプロセス転送。FREEDOM_IPC=file でファイル経由に戻せる
+    if os.environ.get("FREEDOM_IPC", "memory") != "file":
+        from front_end import request_handler
+
+        request_handler.set_transport(watcher.transport)
+
     # メインコンテナ
     main_container = tk.Frame(root)
     main_container.pack(fill=tk.BOTH, expand=True)
@@ -38,6 +45,7 @@ def run_app() -> None:
     menu_widget = MainMenu(right_frame, calendar_widget=calendar_widget)
 
     root.mainloop()
+    watcher.close()
 
 
 if __name__ == "__main__":
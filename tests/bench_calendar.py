@@ -0,0 +1,89 @@
+"""
+カレンダー描画のベンチマーク
+120か月ぶん next_month で月を送ったときの時間を、
+従来の「ボタンを全部破棄して作り直す」描画と、6×7 のボタンを使い回す描画で比較します
+
+実行方法（ディスプレイが必要）:
+    python tests/bench_calendar.py
+"""
+
+import calendar as pycal
+import datetime as dt
+import os
+import sys
+import time
+import tkinter as tk
+from tkinter import ttk
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from front_end.calender import CalendarWindow
+
+MONTHS = 120
+
+
+def legacy_draw(frame: ttk.Frame, y: int, m: int) -> None:
+    """変更前の draw_calendar と同じく、ヘッダと日付ボタンを毎回作り直す"""
+    for w in frame.winfo_children():
+        w.destroy()
+    for i, wd in enumerate(["月", "火", "水", "木", "金", "土", "日"]):
+        ttk.Label(frame, text=wd, anchor="center").grid(row=0, column=i, sticky="nsew")
+    row = 1
+    for week in pycal.Calendar(firstweekday=0).monthdatescalendar(y, m):
+        for col, day in enumerate(week):
+            btn = ttk.Button(
+                frame, text=str(day.day), width=4, command=lambda d=day: None
+            )
+            if day.month != m:
+                btn.state(["disabled"])
+            btn.grid(row=row, column=col, sticky="nsew", padx=1, pady=1)
+        row += 1
+
+
+def bench_legacy(root: tk.Tk) -> float:
+    frame = ttk.Frame(root)
+    frame.pack()
+    y, m = 2020, 1
+    start = time.perf_counter()
+    for _ in range(MONTHS):
+        m += 1
+        if m == 13:
+            y, m = y + 1, 1
+        legacy_draw(frame, y, m)
+        root.update_idletasks()
+    elapsed = time.perf_counter() - start
+    frame.destroy()
+    return elapsed
+
+
+def bench_incremental(root: tk.Tk) -> float:
+    cw = CalendarWindow(root)
+    cw.year.set(2020)
+    cw.month.set(1)
+    cw.draw_calendar()
+    cw.select_date(dt.date(2020, 1, 15))
+    start = time.perf_counter()
+    for _ in range(MONTHS):
+        cw.next_month()
+        root.update_idletasks()
+    elapsed = time.perf_counter() - start
+    cw.destroy()
+    return elapsed
+
+
+def main() -> None:
+    root = tk.Tk()
+    root.withdraw()
+    legacy = bench_legacy(root)
+    incremental = bench_incremental(root)
+    root.destroy()
+
+    print(f"{MONTHS} months")
+    print(f"  destroy and rebuild  total {legacy * 1000:8.1f}ms  per month {legacy / MONTHS * 1000:6.2f}ms")
+    print(f"  reuse 6x7 grid       total {incremental * 1000:8.1f}ms  per month {incremental / MONTHS * 1000:6.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+インポートのベンチマーク
+1行ずつ Schedule.create する従来の方法（行ごとに自動コミット）と、
+import_schedules の一括 INSERT（1トランザクション + insert_many）を比較します
+
+実行方法:
+    python tests/bench_import.py              # 10万件
+    python tests/bench_import.py 20000        # 件数を指定
+
+従来の方法は遅いので LEGACY_ROWS 件だけ実行し、指定件数の時間を推定します
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import back_end.functions as functions
+from back_end.db.db import db, Schedule
+from back_end.db.connection import open_connection, reset_schema_state
+
+LEGACY_ROWS = 2000
+
+
+def make_payload(rows: int) -> list[dict]:
+    """約10年分のランダムな予定（1〜3日のシフトを含む）をインポート形式で作る"""
+    rng = random.Random(0)
+    base = date(2016, 1, 1)
+    schedules = []
+    for n in range(rows):
+        sd = base + timedelta(days=rng.randrange(365 * 10))
+        ed = sd + timedelta(days=rng.choice((0, 0, 0, 1, 2)))
+        schedules.append(
+            {
+                "mode": rng.choice(("A", "B", None)),
+                "name": f"予定{n}",
+                "start_date": sd.isoformat(),
+                "start_time": f"{rng.randrange(24):02d}:{rng.choice((0, 30)):02d}",
+                "end_date": ed.isoformat(),
+                "end_time": "23:59",
+            }
+        )
+    return schedules
+
+
+def legacy_import(schedules: list[dict]) -> None:
+    """変更前の import_schedules と同じく1行ずつ作成する（トランザクションなし）"""
+    for sc in schedules:
+        Schedule.create(
+            mode=sc.get("mode"),
+            name=sc.get("name"),
+            start_date=datetime.strptime(sc["start_date"], "%Y-%m-%d").date(),
+            start_time=datetime.strptime(sc["start_time"], "%H:%M").time(),
+            end_date=datetime.strptime(sc["end_date"], "%Y-%m-%d").date(),
+            end_time=datetime.strptime(sc["end_time"], "%H:%M").time(),
+        )
+
+
+def bench(rows: int) -> None:
+    schedules = make_payload(rows)
+    with tempfile.TemporaryDirectory() as tmp:
+        # 本番の my_database.db を触らないよう、一時ファイルに付け替える
+        db.init(os.path.join(tmp, "bench.db"), timeout=10.0)
+        reset_schema_state()
+        open_connection()
+
+        legacy_rows = min(rows, LEGACY_ROWS)
+        start = time.perf_counter()
+        legacy_import(schedules[:legacy_rows])
+        legacy = (time.perf_counter() - start) * rows / legacy_rows
+
+        start = time.perf_counter()
+        result = functions.import_schedules({"schedules": schedules})
+        bulk = time.perf_counter() - start
+        db.close()
+
+    imported = result["data"]["imported"]
+    assert imported == rows, result["data"]["errors"][:5]
+    print(f"rows={rows:,}")
+    print(f"  per-row create (estimated from {legacy_rows:,} rows) {legacy:8.2f}s")
+    print(f"  import_schedules (bulk)                        {bulk:8.2f}s")
+
+
+def main() -> None:
+    sizes = [int(a) for a in sys.argv[1:]] or [100_000]
+    for rows in sizes:
+        bench(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Schedule テーブルのインデックス・ベンチマーク
+get_schedule（日付範囲 + start_time 順）と get_monthly_schedule_by_mode（モード + 日付範囲）の
+クエリ時間を、インデックスなし／複合インデックス／日付バケット（schedule_day）で比較します
+複合インデックスは日付バケット導入前の構成で、現在の Schedule モデルには無いので、ここで直接作成します
+
+実行方法:
+    python tests/bench_indexes.py              # 10万件・100万件
+    python tests/bench_indexes.py 50000        # 件数を指定
+"""
+
+import calendar
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, time as dtime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from peewee import SqliteDatabase
+
+from back_end.db.db import Schedule, ScheduleDay
+from back_end.db.day_index import install_day_index
+from back_end.db.init import OBSOLETE_INDEXES
+
+REPEAT = 20
+LEGACY_INDEXES = (
+    "CREATE INDEX schedule_start_date_end_date_start_time "
+    "ON schedule (start_date, end_date, start_time)",
+    "CREATE INDEX schedule_mode_start_date_end_date "
+    "ON schedule (mode, start_date, end_date)",
+)
+BATCH = 5000
+
+
+def populate(rows: int) -> None:
+    """約20年分のランダムな予定（1〜3日のシフトを含む）を登録する"""
+    rng = random.Random(0)
+    base = date(2010, 1, 1)
+    batch = []
+    for n in range(rows):
+        sd = base + timedelta(days=rng.randrange(365 * 20))
+        ed = sd + timedelta(days=rng.choice((0, 0, 0, 1, 2)))
+        batch.append(
+            {
+                "mode": rng.choice(("A", "B", None)),
+                "name": f"予定{n}",
+                "start_date": sd,
+                "start_time": dtime(rng.randrange(24), rng.choice((0, 30))),
+                "end_date": ed,
+                "end_time": dtime(23, 59),
+            }
+        )
+        if len(batch) >= BATCH:
+            Schedule.insert_many(batch).execute()
+            batch = []
+    if batch:
+        Schedule.insert_many(batch).execute()
+
+
+def _range_queries(d: date, first: date, last: date):
+    """日付範囲の比較で重なりを求める（複合インデックスの経路）"""
+    day_query = (
+        Schedule.select()
+        .where((Schedule.start_date <= d) & (Schedule.end_date >= d))
+        .order_by(Schedule.start_time)
+    )
+    month_query = (
+        Schedule.select()
+        .where(
+            (Schedule.mode == "B")
+            & (Schedule.start_date <= last)
+            & (Schedule.end_date >= first)
+        )
+        .order_by(Schedule.start_date, Schedule.start_time)
+    )
+    return day_query, month_query
+
+
+def _bucket_queries(d: date, first: date, last: date):
+    """日付バケットで重なりを求める（back_end/functions.py と同じ経路）"""
+    day_query = (
+        Schedule.select()
+        .join(ScheduleDay, on=(ScheduleDay.schedule_id == Schedule.id))
+        .where(ScheduleDay.day == d)
+        .order_by(Schedule.start_time)
+    )
+    ids = (
+        ScheduleDay.select(ScheduleDay.schedule_id)
+        .where(ScheduleDay.day.between(first, last))
+        .distinct()
+    )
+    month_query = (
+        Schedule.select()
+        .where((Schedule.mode == "B") & Schedule.id.in_(ids))
+        .order_by(Schedule.start_date, Schedule.start_time)
+    )
+    return day_query, month_query
+
+
+def run_queries(build=_range_queries) -> tuple[float, float]:
+    rng = random.Random(1)
+    day_total = month_total = 0.0
+    for _ in range(REPEAT):
+        d = date(2010, 1, 1) + timedelta(days=rng.randrange(365 * 20))
+        first = d.replace(day=1)
+        last = d.replace(day=calendar.monthrange(d.year, d.month)[1])
+        day_query, month_query = build(d, first, last)
+
+        start = time.perf_counter()
+        list(day_query.tuples())
+        day_total += time.perf_counter() - start
+
+        start = time.perf_counter()
+        list(month_query.tuples())
+        month_total += time.perf_counter() - start
+    return day_total / REPEAT, month_total / REPEAT
+
+
+def bench(rows: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        database = SqliteDatabase(os.path.join(tmp, "bench.db"))
+        with database.bind_ctx([Schedule, ScheduleDay]):
+            database.connect()
+            # インデックスなしのテーブル（従来の my_database.db 相当）を作ってデータを入れる
+            Schedule.create_table(safe=True)
+            with database.atomic():
+                populate(rows)
+
+            day_plain, month_plain = run_queries()
+
+            # 日付バケット導入前の複合インデックスを作成
+            for sql in LEGACY_INDEXES:
+                database.execute_sql(sql)
+            database.execute_sql("ANALYZE")
+            day_idx, month_idx = run_queries()
+
+            # 複合インデックスを外して日付バケットを作成（既存データは install_day_index が作り直す）
+            for name in OBSOLETE_INDEXES:
+                database.execute_sql(f"DROP INDEX IF EXISTS {name}")
+            database.create_tables([ScheduleDay], safe=True)
+            install_day_index(database)
+            database.execute_sql("ANALYZE")
+            day_bucket, month_bucket = run_queries(_bucket_queries)
+            database.close()
+
+    print(f"rows={rows:,}")
+    print(f"  get_schedule                  no index {day_plain * 1000:8.2f}ms  indexed {day_idx * 1000:8.2f}ms  day index {day_bucket * 1000:8.2f}ms")
+    print(f"  get_monthly_schedule_by_mode  no index {month_plain * 1000:8.2f}ms  indexed {month_idx * 1000:8.2f}ms  day index {month_bucket * 1000:8.2f}ms")
+
+
+def main() -> None:
+    sizes = [int(a) for a in sys.argv[1:]] or [100_000, 1_000_000]
+    for rows in sizes:
+        bench(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+インプロセス転送の往復時間のベンチマーク
+write_request → wait_for_response の1往復にかかる時間を、
+インプロセス転送（ipc.memory）で測ります（ハンドラーは何もせずに返す）
+
+実行方法:
+    python tests/bench_ipc.py              # 1万往復
+    python tests/bench_ipc.py 100000       # 回数を指定
+"""
+
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from ipc.memory import InProcessTransport
+from front_end import request_handler
+
+
+def _echo_handler(payload: dict) -> dict:
+    return {"ok": True, "action": payload.get("action"), "data": {}}
+
+
+def bench(rounds: int) -> None:
+    request_handler.set_transport(InProcessTransport(_echo_handler))
+    try:
+        start = time.perf_counter()
+        for _ in range(rounds):
+            request_id = request_handler.write_request({"action": "get_schedule"})
+            request_handler.wait_for_response("get_schedule", request_id)
+        elapsed = time.perf_counter() - start
+    finally:
+        request_handler.set_transport(None)
+
+    print(f"rounds={rounds:,}")
+    print(f"  in-process {elapsed * 1_000_000 / rounds:8.1f} us/round trip")
+
+
+def main() -> None:
+    counts = [int(a) for a in sys.argv[1:]] or [10_000]
+    for rounds in counts:
+        bench(rounds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+読み込み結果のキャッシュのベンチマーク
+handle_request の get_monthly_schedule を、キャッシュなし（毎回 SQL と行の変換）と
+キャッシュあり（書き込みがない間は result_cache から返す）で比較します
+
+実行方法:
+    python tests/bench_result_cache.py              # 1万件
+    python tests/bench_result_cache.py 50000        # 件数を指定
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import back_end.functions as functions
+from back_end.db.db import db
+from back_end.db.connection import open_connection, reset_schema_state
+from back_end.result_cache import result_cache
+
+from bench_import import make_payload
+
+REPEAT = 200
+MONTHS = [(2020, m) for m in range(1, 13)]
+TRAVEL = {"commute_time": 30, "school_time": 20}
+
+
+def _read_months() -> float:
+    start = time.perf_counter()
+    for _ in range(REPEAT // len(MONTHS)):
+        for year, month in MONTHS:
+            functions.handle_request(
+                {
+                    "action": "get_monthly_schedule",
+                    "year": year,
+                    "month": month,
+                    "travel": TRAVEL,
+                }
+            )
+    return time.perf_counter() - start
+
+
+def bench(rows: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        # 本番の my_database.db を触らないよう、一時ファイルに付け替える
+        db.init(os.path.join(tmp, "bench.db"), timeout=10.0)
+        reset_schema_state()
+        open_connection()
+        functions.import_schedules({"schedules": make_payload(rows)})
+
+        result_cache.maxsize = 0  # 保存してもすぐ追い出す
+        uncached = _read_months()
+        result_cache.maxsize = len(MONTHS)
+        result_cache.clear()
+        before = result_cache.stats()
+        cached = _read_months()
+        after = result_cache.stats()
+        db.close()
+
+    calls = REPEAT // len(MONTHS) * len(MONTHS)
+    print(f"rows={rows:,} calls={calls}")
+    print(f"  without cache {uncached * 1000 / calls:8.3f} ms/call")
+    print(f"  with cache    {cached * 1000 / calls:8.3f} ms/call")
+    hits = after["hits"] - before["hits"]
+    misses = after["misses"] - before["misses"]
+    print(f"  hits={hits} misses={misses}")
+
+
+def main() -> None:
+    sizes = [int(a) for a in sys.argv[1:]] or [10_000]
+    for rows in sizes:
+        bench(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+予定一覧（Treeview）表示のベンチマーク
+1か月に数千件の予定があるときの表示時間を、
+従来の「全件を Treeview に insert し、行ごとに外出時刻を計算する」表示と、
+見えている行だけを入れる CalendarWindow._fill_tree で比較します
+
+実行方法（ディスプレイが必要）:
+    python tests/bench_tree.py              # 5000件
+    python tests/bench_tree.py 20000        # 件数を指定
+"""
+
+import os
+import sys
+import time
+import tkinter as tk
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from front_end.calender import CalendarWindow
+
+
+def make_items(rows: int) -> list[dict]:
+    return [
+        {
+            "id": i + 1,
+            "mode": ("A", "B", None)[i % 3],
+            "name": f"予定{i}",
+            "start_date": f"2026-01-{i % 28 + 1:02d}",
+            "start_time": f"{i % 24:02d}:{i % 60:02d}",
+            "end_date": f"2026-01-{i % 28 + 1:02d}",
+            "end_time": "23:59",
+        }
+        for i in range(rows)
+    ]
+
+
+def legacy_fill(cw: CalendarWindow, items: list[dict]) -> None:
+    """変更前の _fill_tree と同じく全件を insert する"""
+    cw.tree.delete(*cw.tree.get_children())
+    for sc in items:
+        cw.tree.insert(
+            "",
+            tk.END,
+            values=(
+                sc.get("mode", "-"),
+                sc.get("name", ""),
+                f"{sc.get('start_date','')} {sc.get('start_time','')}",
+                f"{sc.get('end_date','')} {sc.get('end_time','')}",
+                cw.calculate_departure_time(sc),
+            ),
+        )
+
+
+def bench(rows: int) -> None:
+    items = make_items(rows)
+    root = tk.Tk()
+    root.withdraw()
+    cw = CalendarWindow(root)
+    root.update_idletasks()
+
+    start = time.perf_counter()
+    legacy_fill(cw, items)
+    root.update_idletasks()
+    legacy = time.perf_counter() - start
+    cw.tree.delete(*cw.tree.get_children())
+
+    start = time.perf_counter()
+    cw._fill_tree(items)
+    root.update_idletasks()
+    windowed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for offset in range(0, rows, max(1, rows // 100)):
+        cw._scroll_to(offset)
+    root.update_idletasks()
+    scrolling = (time.perf_counter() - start) / 100
+
+    root.destroy()
+    print(f"rows={rows:,}")
+    print(f"  insert every row     {legacy * 1000:8.1f}ms")
+    print(f"  visible rows only    {windowed * 1000:8.1f}ms")
+    print(f"  scroll (per jump)    {scrolling * 1000:8.2f}ms")
+
+
+def main() -> None:
+    sizes = [int(a) for a in sys.argv[1:]] or [5000]
+    for rows in sizes:
+        bench(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+レスポンス待機中の CPU 使用量ベンチマーク
+応答の返らないリクエストを待つ間のプロセス CPU 時間を、
+従来の wait_for_response（root.update + sleep のループ）と
+wait_for_response_async（after() による確認）で比較します
+
+実行方法（ディスプレイが必要）:
+    python tests/bench_wait.py
+"""
+
+import os
+import sys
+import time
+import tkinter as tk
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from front_end import request_handler
+
+WAIT_SECONDS = 3.0
+
+
+def bench_blocking(root: tk.Tk) -> tuple[float, float]:
+    wall, cpu = time.perf_counter(), time.process_time()
+    request_handler.wait_for_response(
+        "get_schedule", "never-answered", timeout=WAIT_SECONDS, root=root
+    )
+    return time.perf_counter() - wall, time.process_time() - cpu
+
+
+def bench_async(root: tk.Tk) -> tuple[float, float]:
+    wall, cpu = time.perf_counter(), time.process_time()
+    request_handler.wait_for_response_async(
+        "get_schedule",
+        "never-answered",
+        root,
+        callback=lambda resp: root.quit(),
+        timeout=WAIT_SECONDS,
+    )
+    root.mainloop()
+    return time.perf_counter() - wall, time.process_time() - cpu
+
+
+def main() -> None:
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"Tk を初期化できません（ディスプレイが必要です）: {e}")
+        return
+    root.withdraw()
+
+    for label, bench in (("blocking", bench_blocking), ("async", bench_async)):
+        wall, cpu = bench(root)
+        print(f"{label:<9} wall={wall:5.2f}s  cpu={cpu * 1000:8.1f}ms  ({cpu / wall:6.1%} of a core)")
+
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
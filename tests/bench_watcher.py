@@ -0,0 +1,137 @@
+"""
+ウォッチャーのレイテンシ・ベンチマーク
+request_handler.write_request でリクエストジャーナルに書き込んでから、JsonRequestWatcherTk が
+そのリクエストの処理を始めるまでの時間を、従来の mtime ポーリング（use_inotify=False の _tick）と
+inotify（Tk の createfilehandler）で比較します
+
+ウィンドウは作らず、tkinter.Tcl() のイベントループで実際のウォッチャーを動かします。
+データベースと json/ は一時ディレクトリに作ります（フロントエンドのパスも差し替える）。
+
+実行方法:
+    python tests/bench_watcher.py          # 40件
+    python tests/bench_watcher.py 100      # 件数を指定
+"""
+
+import contextlib
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tkinter
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import watcher_tk
+from front_end import request_handler
+
+REQUESTS = 40
+MAX_GAP = 0.15  # リクエストの間隔（0〜MAX_GAP 秒のランダム）
+HEARTBEAT_MS = 50  # 送信スレッドの終了をイベントループで確認する間隔
+
+
+class _TimedWatcher(watcher_tk.JsonRequestWatcherTk):
+    """処理開始までの時間と、監視のために起床した回数を記録する"""
+
+    def __init__(self, *args, **kwargs):
+        self.latencies: list[float] = []
+        self.wakeups = 0
+        super().__init__(*args, **kwargs)
+
+    def _tick(self) -> None:
+        self.wakeups += 1
+        super()._tick()
+
+    def _on_inotify(self, fd, mask) -> None:
+        self.wakeups += 1
+        super()._on_inotify(fd, mask)
+
+    def _process_request(self, payload: dict) -> None:
+        if isinstance(payload, dict) and "sent_at" in payload:
+            self.latencies.append(time.perf_counter() - payload["sent_at"])
+        super()._process_request(payload)
+
+
+def run(use_inotify: bool, requests: int) -> tuple[list[float], int] | None:
+    """ウォッチャーを Tcl のイベントループで動かし、別スレッドからリクエストを書き込む"""
+    root = tkinter.Tcl()
+    watcher = _TimedWatcher(root, use_inotify=use_inotify)
+    if use_inotify and watcher._inotify is None:
+        watcher.close()
+        return None
+
+    def send() -> None:
+        rng = random.Random(0)
+        for _ in range(requests):
+            time.sleep(rng.uniform(0.0, MAX_GAP))
+            request_handler.write_request(
+                {"action": "list_actions", "sent_at": time.perf_counter()}
+            )
+        # ポーリングが最後のリクエストを拾うまで待つ
+        time.sleep(watcher.interval_ms / 1000 * 2)
+
+    def heartbeat() -> None:
+        if sender.is_alive():
+            root.after(HEARTBEAT_MS, heartbeat)
+
+    sender = threading.Thread(target=send)
+    sender.start()
+    heartbeat()
+    while sender.is_alive():
+        root.tk.dooneevent(0)
+    sender.join()
+    watcher.close()
+    return watcher.latencies, watcher.wakeups
+
+
+def report(label: str, latencies: list[float], wakeups: int) -> None:
+    ms = sorted(x * 1000 for x in latencies)
+    print(
+        f"{label:<10} n={len(ms):3d}  mean={statistics.mean(ms):7.2f}ms  "
+        f"p50={ms[len(ms) // 2]:7.2f}ms  p95={ms[int(len(ms) * 0.95)]:7.2f}ms  "
+        f"max={ms[-1]:7.2f}ms  wakeups={wakeups}"
+    )
+
+
+def main() -> None:
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else REQUESTS
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        json_dir = os.path.join(tmp, "json")
+        paths = (
+            os.path.join(json_dir, "request.json"),
+            os.path.join(json_dir, "response.json"),
+        )
+        journal_paths = (
+            os.path.join(json_dir, "request.jsonl"),
+            os.path.join(json_dir, "response.jsonl"),
+        )
+        os.chdir(tmp)
+        try:
+            # ウォッチャーの処理ログ（stderr）は計測の邪魔なので捨てる
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stderr(
+                devnull
+            ), mock.patch.object(
+                request_handler, "_paths", return_value=paths
+            ), mock.patch.object(
+                request_handler, "_journal_paths", return_value=journal_paths
+            ):
+                polling = run(False, requests)
+                event = run(True, requests)
+        finally:
+            os.chdir(cwd)
+
+    report("polling", *polling)
+    if event is not None:
+        report("inotify", *event)
+    else:
+        print("inotify はこの環境では使えません（Linux のみ）")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+勤務時間計算のベンチマーク
+1年分のシフトの勤務分・深夜分を、変更前の1分ごとのループと
+front_end/utils/worktime.py の区間演算（split_minutes）で比較します
+
+実行方法:
+    python tests/bench_worktime.py             # 1000件
+    python tests/bench_worktime.py 10000       # 件数を指定
+"""
+
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from front_end.utils.worktime import night_window, split_minutes
+
+from test_worktime import _loop_minutes, _random_shifts
+
+
+def bench(count: int) -> None:
+    shifts = list(_random_shifts(count, seed=1))
+    window = night_window()
+
+    start = time.perf_counter()
+    for s, e in shifts:
+        _loop_minutes(s, e, 22, 5)
+    loop = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for s, e in shifts:
+        split_minutes(s, e, window)
+    interval = time.perf_counter() - start
+
+    print(f"shifts={count:,}")
+    print(f"  minute loop     {loop * 1000:10.2f} ms")
+    print(f"  split_minutes   {interval * 1000:10.2f} ms")
+
+
+def main() -> None:
+    counts = [int(a) for a in sys.argv[1:]] or [1000]
+    for count in counts:
+        bench(count)
+
+
+if __name__ == "__main__":
+    main()
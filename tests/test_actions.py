@@ -0,0 +1,163 @@
+"""
+アクションの登録のテスト
+back_end/actions.py の定義と、handle_request がそれを使って振り分けることをテストします
+"""
+
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from back_end import actions, functions
+from back_end.actions import COST_CPU, COST_HEAVY, COST_LIGHT
+
+
+class ActionRegistryTestCase(unittest.TestCase):
+    """アクションの登録のテストケース"""
+
+    def test_all_actions_registered(self):
+        """functions.py のアクションがすべて登録されている"""
+        expected = {
+            "add_schedule",
+            "get_schedule",
+            "delete_schedule",
+            "update_schedule",
+            "get_monthly_schedule_by_mode",
+            "get_monthly_schedule",
+            "get_month_density",
+            "get_all_schedules",
+            "calc_wage",
+            "get_payroll_summary",
+            "calc_payroll",
+            "export_schedules",
+            "import_schedules",
+            "list_actions",
+        }
+        self.assertTrue(expected <= set(actions.ACTIONS))
+
+    def test_write_actions(self):
+        """予定を書き換えるアクションだけが write"""
+        writes = {name for name, spec in actions.ACTIONS.items() if spec.write}
+        self.assertEqual(
+            writes,
+            {"add_schedule", "update_schedule", "delete_schedule", "import_schedules"},
+        )
+        self.assertTrue(actions.is_write({"action": "add_schedule"}))
+        self.assertFalse(actions.is_write({"action": "get_schedule"}))
+        self.assertFalse(actions.is_write({"action": "no_such_action"}))
+        self.assertFalse(actions.is_write({}))
+
+    def test_metadata(self):
+        """重さ・タイムアウト・キャッシュ・バッチの可否"""
+        self.assertEqual(actions.get_action("calc_payroll").cost, COST_CPU)
+        self.assertEqual(actions.get_action("get_all_schedules").cost, COST_HEAVY)
+        self.assertEqual(actions.get_action("get_schedule").cost, COST_LIGHT)
+        self.assertEqual(
+            actions.get_action("import_schedules").timeout, actions.IMPORT_TIMEOUT
+        )
+        self.assertFalse(actions.get_action("import_schedules").batchable)
+        self.assertTrue(actions.get_action("get_monthly_schedule").cacheable)
+        for name, spec in actions.ACTIONS.items():
+            with self.subTest(action=name):
+                # 書き込みの結果は使い回さない
+                self.assertFalse(spec.write and spec.cacheable)
+
+    def test_frontend_lookups(self):
+        """フロントエンドが引く書き込みの集合とタイムアウトは登録と一致する"""
+        from front_end import request_handler
+
+        self.assertEqual(
+            actions.write_actions(),
+            {name for name, spec in actions.ACTIONS.items() if spec.write},
+        )
+        self.assertEqual(request_handler.WRITE_ACTIONS, actions.write_actions())
+        self.assertEqual(request_handler.BATCH_ACTION, actions.BATCH_ACTION)
+
+        self.assertEqual(
+            actions.action_timeout("export_schedules"), actions.IMPORT_TIMEOUT
+        )
+        self.assertEqual(actions.action_timeout("get_schedule"), actions.DEFAULT_TIMEOUT)
+        self.assertEqual(
+            actions.action_timeout("calc_wage_result"), actions.DEFAULT_TIMEOUT
+        )
+        # batch は中のリクエストのうち最も長い時間を待つ
+        self.assertEqual(
+            actions.request_timeout(
+                {
+                    "action": actions.BATCH_ACTION,
+                    "requests": [
+                        {"action": "get_schedule"},
+                        {"action": "get_all_schedules"},
+                    ],
+                }
+            ),
+            actions.DEFAULT_TIMEOUT,
+        )
+        self.assertEqual(
+            actions.request_timeout(
+                {
+                    "action": actions.BATCH_ACTION,
+                    "requests": [{"action": "export_schedules"}],
+                }
+            ),
+            actions.IMPORT_TIMEOUT,
+        )
+
+    def test_duplicate_registration_rejected(self):
+        """同じ名前は二重に登録できない"""
+        with self.assertRaises(ValueError):
+            actions.register_action("get_schedule")(lambda payload: {})
+        # ACTION_TABLE に無い名前は登録できない（性質は表にだけ書く）
+        with self.assertRaises(ValueError):
+            actions.register_action("no_such_action")(lambda payload: {})
+
+    def test_every_declared_action_has_handler(self):
+        """ACTION_TABLE のアクションはすべて functions.py の関数と結び付いている"""
+        for name, spec in actions.ACTIONS.items():
+            with self.subTest(action=name):
+                self.assertIsNotNone(spec.handler)
+        self.assertEqual(set(actions.ACTIONS), set(actions.ACTION_TABLE))
+
+    def test_frontend_does_not_import_functions(self):
+        """フロントエンドは back_end.functions（peewee やデータベース）を読み込まずに性質を引ける"""
+        code = (
+            "import sys\n"
+            "from front_end import request_handler\n"
+            "assert 'add_schedule' in request_handler.WRITE_ACTIONS\n"
+            "print(sorted(m for m in ('back_end.functions', 'peewee') if m in sys.modules))\n"
+        )
+        out = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        self.assertEqual(out.strip(), "[]")
+
+    def test_unknown_action(self):
+        """登録されていないアクションは BAD_REQUEST"""
+        resp = functions.handle_request({"action": "no_such_action"})
+        self.assertFalse(resp["ok"])
+        self.assertEqual(resp["error"]["code"], "BAD_REQUEST")
+        resp = functions.handle_request({})
+        self.assertEqual(resp["action"], "unknown")
+
+    def test_list_actions(self):
+        """list_actions は登録内容を名前順に返す"""
+        resp = functions.handle_request({"action": "list_actions"})
+        self.assertTrue(resp["ok"])
+        listed = resp["data"]["actions"]
+        names = [a["name"] for a in listed]
+        self.assertEqual(names, sorted(actions.ACTIONS))
+        calc = next(a for a in listed if a["name"] == "calc_payroll")
+        self.assertEqual(calc["cost"], COST_CPU)
+        self.assertNotIn("handler", calc)
+
+
+if __name__ == "__main__":
+    unittest.main()
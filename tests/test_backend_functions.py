@@ -6,7 +6,8 @@ back_end/functions.py の各関数をテストします
 import os
 import sys
 import unittest
-from datetime import date, time, datetime
+from unittest import mock
+from datetime import date, time, datetime, timedelta
 
 ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if ROOT not in sys.path:
@@ -18,9 +19,18 @@ from back_end.functions import (
     delete_schedule,
     update_schedule,
     get_monthly_schedule,
+    import_schedules,
+    export_schedules,
+    calc_payroll,
+    calc_wage,
+    get_payroll_summary,
+    get_month_density,
     schedule_to_dict,
+    handle_request,
+    MAX_BATCH_REQUESTS,
 )
 from back_end.db.db import db, Schedule
+from back_end.result_cache import result_cache
 
 
 class BackendFunctionsTestCase(unittest.TestCase):
@@ -37,6 +47,8 @@ class BackendFunctionsTestCase(unittest.TestCase):
         db.connect(reuse_if_open=True)
         # テーブル内のすべてのレコードを削除
         Schedule.delete().execute()
+        # 直接消したのでデータバージョンは進まない。前のテストの読み込み結果を捨てる
+        result_cache.clear()
 
     def tearDown(self):
         """各テストの後にクリーンアップ"""
@@ -284,6 +296,725 @@ class BackendFunctionsTestCase(unittest.TestCase):
         self.assertEqual(dict_result.get("start_time"), "09:00")
         self.assertIn("id", dict_result)
 
+    def test_obsolete_schedule_indexes_dropped(self):
+        """使わなくなった複合インデックスは既存のデータベースからも削除される"""
+        from back_end.db.init import OBSOLETE_INDEXES, initialize_database
+
+        db.connect(reuse_if_open=True)
+        db.execute_sql(
+            "CREATE INDEX IF NOT EXISTS schedule_start_date_end_date_start_time "
+            "ON schedule (start_date, end_date, start_time)"
+        )
+        db.execute_sql(
+            "CREATE INDEX IF NOT EXISTS schedule_mode_start_date_end_date "
+            "ON schedule (mode, start_date, end_date)"
+        )
+
+        initialize_database()
+        db.connect(reuse_if_open=True)
+        names = {row[1] for row in db.execute_sql("PRAGMA index_list('schedule')")}
+
+        for name in OBSOLETE_INDEXES:
+            self.assertNotIn(name, names)
+
+    def test_day_query_uses_schedule_day(self):
+        """日付での絞り込みは schedule_day の主キーを使う"""
+        from back_end.db.db import ScheduleDay
+        from back_end.db.init import initialize_database
+
+        initialize_database()
+        db.connect(reuse_if_open=True)
+        query = (
+            Schedule.select()
+            .join(ScheduleDay, on=(ScheduleDay.schedule_id == Schedule.id))
+            .where(ScheduleDay.day == "2026-01-08")
+            .order_by(Schedule.start_time)
+        )
+        sql, params = query.sql()
+        plan = " ".join(
+            str(row[-1]) for row in db.execute_sql("EXPLAIN QUERY PLAN " + sql, params)
+        )
+
+        self.assertIn("USING PRIMARY KEY (day=?)", plan)
+        self.assertNotIn("start_date", plan)
+
+    def test_day_index_follows_multiday_update_and_delete(self):
+        """複数日にまたがる予定の追加・変更・削除に日付バケットが追従する"""
+        from back_end.db.db import ScheduleDay
+        from back_end.db.day_index import rebuild_day_index
+
+        created = add_schedule(
+            {
+                "mode": "B",
+                "name": "夜勤",
+                "start_date": "2026-01-31",
+                "start_time": "22:00",
+                "end_date": "2026-02-02",
+                "end_time": "06:00",
+            }
+        )
+        sid = created["data"]["schedule"]["id"]
+
+        def days():
+            return sorted(
+                str(d.day)
+                for d in ScheduleDay.select().where(ScheduleDay.schedule_id == sid)
+            )
+
+        self.assertEqual(days(), ["2026-01-31", "2026-02-01", "2026-02-02"])
+        schedules = get_schedule({"date": "2026-02-01"})["data"]["schedules"]
+        self.assertEqual([s["id"] for s in schedules], [sid])
+        feb = get_monthly_schedule({"year": 2026, "month": 2})["data"]["schedules"]
+        self.assertEqual([s["id"] for s in feb], [sid])
+
+        update_schedule(
+            {
+                "id": sid,
+                "mode": "B",
+                "name": "夜勤",
+                "start_date": "2026-02-05",
+                "start_time": "22:00",
+                "end_date": "2026-02-06",
+                "end_time": "06:00",
+            }
+        )
+        self.assertEqual(days(), ["2026-02-05", "2026-02-06"])
+        jan = get_monthly_schedule({"year": 2026, "month": 1})["data"]["schedules"]
+        self.assertEqual(jan, [])
+
+        # 作り直しても内容は変わらない
+        rebuild_day_index()
+        self.assertEqual(days(), ["2026-02-05", "2026-02-06"])
+
+        delete_schedule({"id": sid})
+        self.assertEqual(days(), [])
+
+    def test_import_schedules_bulk_with_row_errors(self):
+        """インポートは正しい行だけを登録し、誤った行は行番号付きで報告する"""
+        add_schedule(
+            {
+                "mode": "A",
+                "name": "既存",
+                "start_date": "2026-01-01",
+                "start_time": "09:00",
+                "end_date": "2026-01-01",
+                "end_time": "10:00",
+            }
+        )
+        rows = [
+            {
+                "mode": "B",
+                "name": f"バイト{n}",
+                "start_date": "2026-01-10",
+                "start_time": "22:00",
+                "end_date": "2026-01-11",
+                "end_time": "05:00",
+            }
+            for n in range(300)
+        ]
+        rows.insert(1, {"name": "日付なし"})
+        rows.insert(
+            2,
+            {
+                "name": "逆転",
+                "start_date": "2026-01-10",
+                "start_time": "10:00",
+                "end_date": "2026-01-10",
+                "end_time": "09:00",
+            },
+        )
+
+        result = import_schedules({"schedules": rows})
+
+        self.assertTrue(result.get("ok"))
+        data = result["data"]
+        self.assertEqual(data["imported"], 300)
+        self.assertEqual(len(data["errors"]), 2)
+        self.assertTrue(data["errors"][0].startswith("Index 1:"))
+        self.assertEqual(data["errors"][1], "Index 2: end must be after start")
+        # 既存データは置き換えられ、日付バケットにも反映される
+        self.assertEqual(Schedule.select().count(), 300)
+        day = get_schedule({"date": "2026-01-11"})["data"]["schedules"]
+        self.assertEqual(len(day), 300)
+        self.assertEqual(day[0]["start_time"], "22:00")
+
+    def test_span_longer_than_day_offset_is_rejected(self):
+        """day_offset で展開できない長さの予定は追加・更新・インポートで弾かれる"""
+        from back_end.db.day_index import MAX_SPAN_HOURS
+
+        start = datetime(2026, 1, 1, 0, 0)
+        longest = start + timedelta(hours=MAX_SPAN_HOURS + 1)
+
+        def row(end):
+            return {
+                "mode": "B",
+                "name": "長期",
+                "start_date": start.strftime("%Y-%m-%d"),
+                "start_time": start.strftime("%H:%M"),
+                "end_date": end.strftime("%Y-%m-%d"),
+                "end_time": end.strftime("%H:%M"),
+            }
+
+        too_long = row(longest + timedelta(minutes=1))
+        added = add_schedule(too_long)
+        self.assertFalse(added["ok"])
+        self.assertEqual(added["error"]["code"], "BAD_REQUEST")
+
+        created = add_schedule(row(start + timedelta(hours=1)))
+        sid = created["data"]["schedule"]["id"]
+        updated = update_schedule({"id": sid, **too_long})
+        self.assertFalse(updated["ok"])
+        self.assertEqual(updated["error"]["code"], "BAD_REQUEST")
+
+        imported = import_schedules({"schedules": [row(longest), too_long]})["data"]
+        self.assertEqual(imported["imported"], 1)
+        self.assertEqual(len(imported["errors"]), 1)
+        self.assertTrue(imported["errors"][0].startswith("Index 1:"))
+
+    def test_longest_span_is_fully_indexed(self):
+        """上限ちょうどの予定は日付バケット・給料集計から欠けない"""
+        from peewee import fn
+
+        from back_end.db.db import PayrollSummary, ScheduleDay
+        from back_end.db.day_index import MAX_SPAN_HOURS
+        from back_end.db.init import initialize_database
+
+        initialize_database()
+        db.connect(reuse_if_open=True)
+
+        def total_minutes():
+            return PayrollSummary.select(fn.SUM(PayrollSummary.minutes)).scalar() or 0
+
+        before = total_minutes()
+        start = datetime(2026, 1, 1, 0, 30)
+        end = start + timedelta(hours=MAX_SPAN_HOURS)
+        created = add_schedule(
+            {
+                "mode": "B",
+                "name": "長期",
+                "start_date": start.strftime("%Y-%m-%d"),
+                "start_time": start.strftime("%H:%M"),
+                "end_date": end.strftime("%Y-%m-%d"),
+                "end_time": end.strftime("%H:%M"),
+            }
+        )
+        self.assertTrue(created["ok"])
+        sid = created["data"]["schedule"]["id"]
+
+        days = ScheduleDay.select().where(ScheduleDay.schedule_id == sid).count()
+        self.assertEqual(days, (end.date() - start.date()).days + 1)
+        self.assertEqual(total_minutes() - before, MAX_SPAN_HOURS * 60)
+
+    def test_import_schedules_reports_null_name_per_row(self):
+        """名前のない行だけを NOT NULL 違反として報告し、他の行は登録する"""
+        good = {
+            "mode": "A",
+            "name": "講義",
+            "start_date": "2026-01-10",
+            "start_time": "09:00",
+            "end_date": "2026-01-10",
+            "end_time": "10:00",
+        }
+        rows = [good, dict(good, name=None), dict(good, name="演習")]
+        expected = "Index 1: NOT NULL constraint failed: schedule.name"
+
+        result = import_schedules({"schedules": rows})
+        self.assertEqual(result["data"]["imported"], 2)
+        self.assertEqual(result["data"]["errors"], [expected])
+        self.assertEqual(sorted(s.name for s in Schedule.select()), ["演習", "講義"])
+
+        # 事前の検証をすり抜けた制約違反は、1行ずつ入れ直して同じように報告する
+        with mock.patch("back_end.functions._missing_not_null", return_value=None):
+            result = import_schedules({"schedules": rows})
+        self.assertEqual(result["data"]["imported"], 2)
+        self.assertEqual(result["data"]["errors"], [expected])
+        self.assertEqual(Schedule.select().count(), 2)
+
+    def test_export_schedules_streams_json_and_jsonl(self):
+        """エクスポートは JSON 配列・JSON Lines を直接ファイルに書き、再インポートできる"""
+        import json
+        import tempfile
+
+        for n in range(3):
+            add_schedule(
+                {
+                    "mode": "B",
+                    "name": f"バイト{n}",
+                    "start_date": f"2026-01-0{n + 1}",
+                    "start_time": "09:00",
+                    "end_date": f"2026-01-0{n + 1}",
+                    "end_time": "17:00",
+                }
+            )
+
+        with tempfile.TemporaryDirectory() as tmp:
+            json_path = os.path.join(tmp, "out.json")
+            result = export_schedules({"path": json_path})
+            self.assertTrue(result.get("ok"))
+            self.assertEqual(result["data"]["exported"], 3)
+            with open(json_path, encoding="utf-8") as f:
+                exported = json.load(f)
+            self.assertEqual([s["name"] for s in exported], ["バイト0", "バイト1", "バイト2"])
+            self.assertEqual(exported[0]["start_time"], "09:00")
+
+            jsonl_path = os.path.join(tmp, "out.jsonl")
+            result = export_schedules({"path": jsonl_path})
+            self.assertEqual(result["data"]["format"], "jsonl")
+            with open(jsonl_path, encoding="utf-8") as f:
+                lines = [json.loads(line) for line in f]
+            self.assertEqual(lines, exported)
+
+            # 0件でも読み込める JSON になる
+            Schedule.delete().execute()
+            empty_path = os.path.join(tmp, "empty.json")
+            export_schedules({"path": empty_path})
+            with open(empty_path, encoding="utf-8") as f:
+                self.assertEqual(json.load(f), [])
+
+            self.assertEqual(import_schedules({"schedules": exported})["data"]["imported"], 3)
+
+    def test_export_schedules_requires_path(self):
+        result = export_schedules({})
+        self.assertFalse(result.get("ok"))
+        self.assertEqual(result["error"]["code"], "BAD_REQUEST")
+
+    def test_calc_payroll_for_month_and_year(self):
+        """calc_payroll は年・月のバイト予定をまとめて計算する"""
+        for day, mode in (("2026-01-10", "B"), ("2026-02-10", "B"), ("2026-01-11", "A")):
+            add_schedule(
+                {
+                    "mode": mode,
+                    "name": "予定",
+                    "start_date": day,
+                    "start_time": "18:00",
+                    "end_date": day,
+                    "end_time": "23:00",
+                }
+            )
+
+        month = calc_payroll({"year": 2026, "month": 1, "wage": 1000, "night_rate": 1.5})
+        self.assertTrue(month.get("ok"))
+        totals = month["data"]["totals"]
+        self.assertEqual(totals["count"], 1)
+        self.assertEqual(totals["night_minutes"], 60)
+        self.assertEqual(totals["salary"], 4 * 1000 + 1 * 1500)
+
+        year = calc_payroll({"year": 2026})
+        self.assertEqual(year["data"]["totals"]["count"], 2)
+
+        bad = calc_payroll({"shifts": [{"start_date": "x"}]})
+        self.assertEqual(bad["error"]["code"], "BAD_REQUEST")
+
+    def test_calc_payroll_splits_shifts_across_periods(self):
+        """月・年をまたぐシフトは期間ごとに分けて数え、二重に数えない"""
+        add_schedule(
+            {
+                "mode": "B",
+                "name": "年越し",
+                "start_date": "2025-12-31",
+                "start_time": "22:00",
+                "end_date": "2026-01-01",
+                "end_time": "05:00",
+            }
+        )
+        minutes = {}
+        for key in [(2025, None), (2026, None), (2025, 12), (2026, 1), (2026, 2)]:
+            payload = {"year": key[0]}
+            if key[1] is not None:
+                payload["month"] = key[1]
+            minutes[key] = calc_payroll(payload)["data"]["totals"]["total_minutes"]
+        self.assertEqual(
+            minutes,
+            {
+                (2025, None): 120,
+                (2026, None): 300,
+                (2025, 12): 120,
+                (2026, 1): 300,
+                (2026, 2): 0,
+            },
+        )
+
+    def test_calc_wage_aggregates_per_day(self):
+        """calc_wage は働いた日ごとに勤務・深夜時間を集計し MoneyWindow の形で返す"""
+        shifts = [
+            ("2026-01-02", "09:00", "2026-01-02", "12:00", "B"),
+            ("2026-01-02", "21:00", "2026-01-03", "06:00", "B"),
+            ("2026-01-05", "10:00", "2026-01-05", "14:30", "B"),
+            ("2026-01-05", "10:00", "2026-01-05", "18:00", "A"),
+        ]
+        for sd, st, ed, et, mode in shifts:
+            add_schedule(
+                {
+                    "mode": mode,
+                    "name": "予定",
+                    "start_date": sd,
+                    "start_time": st,
+                    "end_date": ed,
+                    "end_time": et,
+                }
+            )
+
+        result = calc_wage({"year": 2026, "month": 1, "wage": 1200, "night_rate": 1.25})
+
+        self.assertTrue(result.get("ok"))
+        self.assertEqual(result.get("action"), "calc_wage_result")
+        data = result["data"]
+        self.assertEqual(data["total_hours"], 16.5)
+        self.assertEqual(data["night_hours"], 7.0)
+        self.assertEqual(data["total_wage"], 9.5 * 1200 + 7 * 1500)
+        # 日をまたぐシフトは 01-02 の 3 時間と 01-03 の 6 時間に分かれる
+        self.assertEqual(
+            [d["date"] for d in data["detail"]], ["2026-01-02", "2026-01-03", "2026-01-05"]
+        )
+        self.assertEqual(
+            [(d["hours"], d["night_hours"]) for d in data["detail"]],
+            [(6.0, 2.0), (6.0, 5.0), (4.5, 0.0)],
+        )
+        self.assertEqual(data["detail"][2]["amount"], 4.5 * 1200)
+
+        # calc_payroll（シフトごとの計算）と一致する
+        payroll = calc_payroll({"year": 2026, "month": 1, "wage": 1200, "night_rate": 1.25})
+        self.assertEqual(round(payroll["data"]["totals"]["salary"]), data["total_wage"])
+
+    def test_calc_wage_splits_shift_across_months(self):
+        """月をまたぐシフトは働いた日の月にだけ数え、両月で二重に数えない"""
+        add_schedule(
+            {
+                "mode": "B",
+                "name": "夜勤",
+                "start_date": "2026-01-31",
+                "start_time": "22:00",
+                "end_date": "2026-02-01",
+                "end_time": "05:00",
+            }
+        )
+
+        jan = calc_wage({"year": 2026, "month": 1, "wage": 1000, "night_rate": 1.25})["data"]
+        feb = calc_wage({"year": 2026, "month": 2, "wage": 1000, "night_rate": 1.25})["data"]
+
+        self.assertEqual((jan["total_hours"], jan["night_hours"]), (2.0, 2.0))
+        self.assertEqual((feb["total_hours"], feb["night_hours"]), (5.0, 5.0))
+        self.assertEqual([d["date"] for d in jan["detail"]], ["2026-01-31"])
+        self.assertEqual([d["date"] for d in feb["detail"]], ["2026-02-01"])
+        self.assertEqual(jan["total_wage"] + feb["total_wage"], 7 * 1250)
+
+        # calc_payroll と月ごとに一致する
+        for month, data in ((1, jan), (2, feb)):
+            payroll = calc_payroll(
+                {"year": 2026, "month": month, "wage": 1000, "night_rate": 1.25}
+            )
+            self.assertEqual(round(payroll["data"]["totals"]["salary"]), data["total_wage"])
+
+    def test_calc_wage_is_monthly_payroll_summary(self):
+        """calc_wage は month 必須の get_payroll_summary（action だけが異なる）"""
+        add_schedule(
+            {
+                "mode": "B",
+                "name": "夜勤",
+                "start_date": "2026-01-31",
+                "start_time": "22:00",
+                "end_date": "2026-02-01",
+                "end_time": "05:00",
+            }
+        )
+        params = {"year": 2026, "month": 2, "wage": 1000, "night_rate": 1.25}
+        wage = calc_wage(params)
+        summary = get_payroll_summary(params)
+        self.assertEqual(wage["action"], "calc_wage_result")
+        self.assertEqual(wage["data"], summary["data"])
+
+        for payload in ({"year": 2026}, {"year": 2026, "month": None}, {"month": 1}):
+            with self.subTest(payload=payload):
+                resp = calc_wage(payload)
+                self.assertFalse(resp["ok"])
+                self.assertEqual(resp["action"], "calc_wage_result")
+                self.assertEqual(resp["error"]["code"], "BAD_REQUEST")
+        resp = calc_wage({"year": 2026, "month": 13})
+        self.assertEqual(resp["error"]["message"], "month must be between 1 and 12")
+
+    def test_payroll_summary_follows_writes(self):
+        """給料集計テーブルは追加・更新・削除・インポートに追従し、作り直しと一致する"""
+        from back_end.db.payroll_summary import (
+            check_payroll_summary,
+            rebuild_payroll_summary,
+        )
+
+        night = add_schedule(
+            {
+                "mode": "B",
+                "name": "夜勤",
+                "start_date": "2026-01-31",
+                "start_time": "21:30",
+                "end_date": "2026-02-01",
+                "end_time": "06:15",
+            }
+        )["data"]["schedule"]
+        add_schedule(
+            {
+                "mode": "A",
+                "name": "講義",
+                "start_date": "2026-01-31",
+                "start_time": "09:00",
+                "end_date": "2026-01-31",
+                "end_time": "12:00",
+            }
+        )
+
+        jan = get_payroll_summary({"year": 2026, "month": 1, "wage": 1000, "night_rate": 1.5})
+        self.assertTrue(jan.get("ok"))
+        self.assertEqual(jan["data"]["total_hours"], 2.5)
+        self.assertEqual(jan["data"]["night_hours"], 2.0)
+        self.assertEqual(jan["data"]["total_wage"], 500 + 2 * 1500)
+        feb = get_payroll_summary({"year": 2026, "month": 2})["data"]
+        self.assertEqual(feb["total_hours"], 6.25)
+        self.assertEqual(feb["night_hours"], 5.0)
+        year = get_payroll_summary({"year": 2026})["data"]
+        self.assertEqual(year["total_hours"], 8.75)
+        self.assertEqual([d["date"] for d in year["detail"]], ["2026-01-31", "2026-02-01"])
+        self.assertEqual(check_payroll_summary(), [])
+
+        # モード変更・時刻変更・削除
+        update_schedule(dict(night, mode="A"))
+        self.assertEqual(get_payroll_summary({"year": 2026})["data"]["total_hours"], 0)
+        update_schedule(dict(night, start_time="23:00"))
+        self.assertEqual(get_payroll_summary({"year": 2026})["data"]["total_hours"], 7.25)
+        self.assertEqual(check_payroll_summary(), [])
+        delete_schedule({"id": night["id"]})
+        self.assertEqual(get_payroll_summary({"year": 2026})["data"]["detail"], [])
+
+        import_schedules({"schedules": [dict(night, mode="B")] * 3})
+        self.assertEqual(get_payroll_summary({"year": 2026})["data"]["total_hours"], 3 * 8.75)
+        self.assertEqual(check_payroll_summary(), [])
+        rebuild_payroll_summary()
+        self.assertEqual(get_payroll_summary({"year": 2026})["data"]["total_hours"], 3 * 8.75)
+
+    def test_get_month_density(self):
+        """月の各日の予定件数とモードのビットマスク（複数日の予定は各日に数える）"""
+        for mode, sd, ed in [
+            ("A", "2026-01-08", "2026-01-08"),
+            ("B", "2026-01-08", "2026-01-08"),
+            (None, "2026-01-31", "2026-02-02"),
+        ]:
+            add_schedule(
+                {
+                    "mode": mode,
+                    "name": "予定",
+                    "start_date": sd,
+                    "start_time": "09:00",
+                    "end_date": ed,
+                    "end_time": "10:00",
+                }
+            )
+
+        jan = get_month_density({"year": 2026, "month": 1})
+        self.assertTrue(jan.get("ok"))
+        self.assertEqual(
+            jan["data"]["days"],
+            [
+                {"date": "2026-01-08", "count": 2, "modes": 3},
+                {"date": "2026-01-31", "count": 1, "modes": 4},
+            ],
+        )
+        feb = get_month_density({"year": 2026, "month": 2})["data"]["days"]
+        self.assertEqual([d["date"] for d in feb], ["2026-02-01", "2026-02-02"])
+
+        bad = get_month_density({"year": 2026, "month": 13})
+        self.assertFalse(bad.get("ok"))
+        self.assertEqual(bad["error"]["code"], "BAD_REQUEST")
+
+    def test_data_version_advances_on_writes(self):
+        """書き込みが成功したときだけ data_version が進み、全レスポンスに付く"""
+        before = handle_request({"action": "get_schedule", "date": "2026-01-08"})
+        version = before["data_version"]
+
+        added = handle_request(
+            {
+                "action": "add_schedule",
+                "mode": "A",
+                "name": "講義",
+                "start_date": "2026-01-08",
+                "start_time": "09:00",
+                "end_date": "2026-01-08",
+                "end_time": "10:00",
+            }
+        )
+        self.assertEqual(added["data_version"], version + 1)
+
+        failed = handle_request({"action": "delete_schedule", "id": 999999})
+        self.assertFalse(failed["ok"])
+        self.assertEqual(failed["data_version"], version + 1)
+
+        read = handle_request({"action": "get_monthly_schedule", "year": 2026, "month": 1})
+        self.assertEqual(read["data_version"], version + 1)
+
+    def test_schedules_with_minutes_and_departure(self):
+        """通算分は常に、外出時刻は移動時間の設定を付けたときだけ返す"""
+        for mode, st in [("A", "00:10"), ("B", "09:00"), (None, "09:00")]:
+            add_schedule(
+                {
+                    "mode": mode,
+                    "name": "予定",
+                    "start_date": "2026-01-08",
+                    "start_time": st,
+                    "end_date": "2026-01-09",
+                    "end_time": "10:00",
+                }
+            )
+        epoch = datetime(1970, 1, 1)
+
+        plain = get_schedule({"date": "2026-01-08"})["data"]
+        self.assertIsNone(plain["travel"])
+        first = plain["schedules"][0]
+        self.assertNotIn("departure_time", first)
+        self.assertEqual(
+            first["start_minutes"],
+            (datetime(2026, 1, 8, 0, 10) - epoch) // timedelta(minutes=1),
+        )
+        self.assertEqual(
+            first["end_minutes"],
+            (datetime(2026, 1, 9, 10, 0) - epoch) // timedelta(minutes=1),
+        )
+
+        travel = {"commute_time": 45, "school_time": 20}
+        day = get_schedule({"date": "2026-01-08", "travel": travel})["data"]
+        self.assertEqual(day["travel"], travel)
+        self.assertEqual(
+            [(sc["mode"], sc["departure_time"]) for sc in day["schedules"]],
+            [("A", "23:50"), ("B", "08:15"), (None, "08:15")],
+        )
+        month = get_monthly_schedule({"year": 2026, "month": 1, "travel": travel})
+        self.assertEqual(
+            [sc["departure_time"] for sc in month["data"]["schedules"]],
+            ["23:50", "08:15", "08:15"],
+        )
+
+        bad = get_schedule({"date": "2026-01-08", "travel": {"commute_time": "x"}})
+        self.assertEqual(bad["error"]["code"], "BAD_REQUEST")
+
+    def test_reads_from_another_thread_during_write(self):
+        """WAL なので、書き込みトランザクション中でも別スレッドの接続から読める"""
+        import threading
+        from back_end.db.connection import close_connection
+
+        self.assertEqual(db.execute_sql("PRAGMA journal_mode").fetchone()[0], "wal")
+        self.assertEqual(db.execute_sql("PRAGMA synchronous").fetchone()[0], 1)
+
+        payload = {
+            "mode": "A",
+            "name": "講義",
+            "start_date": "2026-01-08",
+            "start_time": "09:00",
+            "end_date": "2026-01-08",
+            "end_time": "10:00",
+        }
+        add_schedule(payload)
+        seen = []
+
+        def reader():
+            try:
+                seen.append(len(get_schedule({"date": "2026-01-08"})["data"]["schedules"]))
+            finally:
+                close_connection()
+
+        with db.atomic():
+            add_schedule(dict(payload, name="未コミット"))
+            thread = threading.Thread(target=reader)
+            thread.start()
+            thread.join(timeout=5)
+            self.assertFalse(thread.is_alive())
+        # 読み手はコミット前のスナップショットを読む
+        self.assertEqual(seen, [1])
+        self.assertEqual(len(get_schedule({"date": "2026-01-08"})["data"]["schedules"]), 2)
+
+    def test_batch_write_then_read(self):
+        """batch は順に実行し、書き込みの後ろの読み込みには書き込み後の内容が返る"""
+        sid = add_schedule(
+            {
+                "mode": "A",
+                "name": "消す予定",
+                "start_date": "2026-01-08",
+                "start_time": "09:00",
+                "end_date": "2026-01-08",
+                "end_time": "10:00",
+            }
+        )["data"]["schedule"]["id"]
+        version = handle_request({"action": "list_actions"})["data_version"]
+
+        resp = handle_request(
+            {
+                "action": "batch",
+                "requests": [
+                    {"action": "delete_schedule", "id": sid},
+                    {"action": "get_monthly_schedule", "year": 2026, "month": 1},
+                ],
+            }
+        )
+        self.assertTrue(resp["ok"])
+        deleted, month = resp["data"]["responses"]
+        self.assertEqual(deleted["action"], "delete_schedule")
+        self.assertTrue(deleted["ok"])
+        self.assertEqual(month["data"]["schedules"], [])
+        # 読み込みはコミット後の（進んだ）バージョンを返す
+        self.assertEqual(month["data_version"], version + 1)
+        self.assertEqual(resp["data_version"], version + 1)
+
+    def test_batch_of_writes_shares_a_transaction(self):
+        """書き込みだけの batch は1つのトランザクションで実行し、失敗したものだけ取り消す"""
+        base = {
+            "action": "add_schedule",
+            "mode": "B",
+            "start_date": "2026-01-08",
+            "start_time": "09:00",
+            "end_date": "2026-01-08",
+            "end_time": "10:00",
+        }
+        resp = handle_request(
+            {
+                "action": "batch",
+                "requests": [
+                    dict(base, name="1件目"),
+                    dict(base, name="2件目", start_time="9時"),
+                    dict(base, name="3件目"),
+                ],
+            }
+        )
+        results = resp["data"]["responses"]
+        self.assertEqual([r["ok"] for r in results], [True, False, True])
+        self.assertEqual(
+            sorted(s.name for s in Schedule.select()), ["1件目", "3件目"]
+        )
+        # 同じトランザクションなので、全レスポンスに同じ最終のバージョンが付く
+        self.assertEqual(len({r["data_version"] for r in results}), 1)
+
+    def test_batch_rejects_bad_requests(self):
+        """batch の形が不正なら全体を、使えないリクエストはその1件だけを BAD_REQUEST にする"""
+        for requests in (None, [], "x", [{}] * (MAX_BATCH_REQUESTS + 1)):
+            with self.subTest(requests=type(requests).__name__):
+                resp = handle_request({"action": "batch", "requests": requests})
+                self.assertEqual(resp["error"]["code"], "BAD_REQUEST")
+
+        resp = handle_request(
+            {
+                "action": "batch",
+                "requests": [
+                    "get_schedule",
+                    {"action": "batch", "requests": []},
+                    {"action": "import_schedules", "schedules": []},
+                    {"action": "no_such_action"},
+                    {"action": "get_schedule", "date": "2026-01-08"},
+                ],
+            }
+        )
+        self.assertTrue(resp["ok"])
+        results = resp["data"]["responses"]
+        self.assertEqual(
+            [r["ok"] for r in results], [False, False, False, False, True]
+        )
+        self.assertEqual(
+            [r["action"] for r in results[:4]],
+            ["unknown", "batch", "import_schedules", "no_such_action"],
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,120 @@
+"""
+リクエストの振り分けのテスト
+back_end/dispatcher.py の並列読み込み・直列書き込み・別プロセス実行をテストします
+"""
+
+import os
+import sys
+import threading
+import unittest
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from back_end import functions
+from back_end.db.db import db, Schedule
+from back_end.result_cache import result_cache
+from back_end.dispatcher import Dispatcher
+
+
+class DispatcherTestCase(unittest.TestCase):
+    """リクエストの振り分けのテストケース"""
+
+    def setUp(self):
+        db.connect(reuse_if_open=True)
+        Schedule.delete().execute()
+        result_cache.clear()
+        self.dispatcher = Dispatcher(read_workers=2, cpu_workers=1).start()
+
+    def tearDown(self):
+        self.dispatcher.shutdown(timeout=10)
+        Schedule.delete().execute()
+
+    def test_reads_run_in_parallel(self):
+        """2件の読み込みが同時に実行される（片方だけでは Barrier を越えられない）"""
+        barrier = threading.Barrier(2, timeout=5)
+        threads = set()
+
+        def handler(payload):
+            threads.add(threading.current_thread().name)
+            barrier.wait()
+            return {"ok": True, "action": payload["action"]}
+
+        with mock.patch.object(functions, "handle_request", side_effect=handler):
+            futures = [
+                self.dispatcher.submit({"action": "get_schedule"}) for _ in range(2)
+            ]
+            results = [f.result(timeout=10) for f in futures]
+
+        self.assertTrue(all(r["ok"] for r in results))
+        self.assertEqual(len(threads), 2)
+        self.assertNotIn(threading.current_thread().name, threads)
+
+    def test_heavy_read_does_not_block_light_reads(self):
+        """COST_HEAVY の読み込みは専用のスレッドで実行し、軽い読み込みを待たせない"""
+        release = threading.Event()
+        threads = {}
+
+        def handler(payload):
+            threads[payload["action"]] = threading.current_thread().name
+            if payload["action"] == "get_all_schedules":
+                release.wait(5)
+            return {"ok": True, "action": payload["action"]}
+
+        with mock.patch.object(functions, "handle_request", side_effect=handler):
+            heavy = [
+                self.dispatcher.submit({"action": "get_all_schedules"})
+                for _ in range(2)
+            ]
+            light = self.dispatcher.submit({"action": "get_schedule"})
+            self.assertTrue(light.result(timeout=5)["ok"])
+            self.assertFalse(any(f.done() for f in heavy))
+            release.set()
+            self.assertTrue(all(f.result(timeout=10)["ok"] for f in heavy))
+
+        self.assertTrue(threads["get_all_schedules"].startswith("backend-heavy"))
+        self.assertTrue(threads["get_schedule"].startswith("backend-read"))
+
+    def test_read_after_write_is_ordered(self):
+        """書き込みの直後に送った読み込みは書き込み後の内容を返す"""
+        write = self.dispatcher.submit(
+            {
+                "action": "add_schedule",
+                "mode": "A",
+                "name": "講義",
+                "start_date": "2026-01-08",
+                "start_time": "09:00",
+                "end_date": "2026-01-08",
+                "end_time": "10:00",
+            }
+        )
+        read = self.dispatcher.submit({"action": "get_schedule", "date": "2026-01-08"})
+
+        self.assertTrue(write.result(timeout=10)["ok"])
+        schedules = read.result(timeout=10)["data"]["schedules"]
+        self.assertEqual([s["name"] for s in schedules], ["講義"])
+        self.assertEqual(self.dispatcher.pending(), 0)
+
+    def test_cpu_action_runs_in_another_process(self):
+        """calc_payroll は別プロセスで実行し、このプロセスのデータバージョンを付ける"""
+        shift = {
+            "id": 1,
+            "name": "夜勤",
+            "start_date": "2026-01-08",
+            "start_time": "21:00",
+            "end_date": "2026-01-09",
+            "end_time": "06:00",
+        }
+        resp = self.dispatcher.submit(
+            {"action": "calc_payroll", "shifts": [shift], "wage": 1000}
+        ).result(timeout=60)
+
+        self.assertTrue(resp["ok"])
+        self.assertEqual(resp["data"]["totals"]["night_minutes"], 7 * 60)
+        self.assertEqual(resp["data_version"], functions.data_version())
+
+
+if __name__ == "__main__":
+    unittest.main()
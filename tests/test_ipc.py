@@ -0,0 +1,437 @@
+"""
+IPC（リクエスト転送）のテスト
+ipc/ パッケージと front_end/request_handler.py の転送処理をテストします
+"""
+
+import json
+import os
+import stat
+import sys
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from ipc import codec, inotify
+from ipc.atomic import atomic_write_json
+from ipc.journal import (
+    JournalReader,
+    append_record,
+    encode_record,
+    latest_marker,
+)
+from ipc.memory import InProcessTransport
+from front_end import request_handler
+
+
+def _echo_handler(payload: dict) -> dict:
+    return {"ok": True, "action": payload.get("action"), "data": {"echo": payload}}
+
+
+class InProcessTransportTestCase(unittest.TestCase):
+    """インプロセス転送のテストケース"""
+
+    def setUp(self):
+        self.transport = InProcessTransport(_echo_handler)
+        request_handler.set_transport(self.transport)
+
+    def tearDown(self):
+        request_handler.set_transport(None)
+
+    def test_round_trip(self):
+        """write_request → wait_for_response がファイルを介さずに完結する"""
+        request_id = request_handler.write_request(
+            {"action": "get_schedule", "date": "2026-01-08"}
+        )
+        resp = request_handler.wait_for_response("get_schedule", request_id)
+
+        self.assertIsNotNone(resp)
+        self.assertEqual(resp.get("_request_id"), request_id)
+        self.assertEqual(resp["data"]["echo"]["date"], "2026-01-08")
+
+    def test_validator_and_action_mismatch(self):
+        """アクション不一致・検証失敗は None を返す"""
+        request_id = request_handler.write_request({"action": "get_schedule"})
+        self.assertIsNone(request_handler.wait_for_response("add_schedule", request_id))
+
+        request_id = request_handler.write_request({"action": "get_schedule"})
+        resp = request_handler.wait_for_response(
+            "get_schedule", request_id, expected_data_validator=lambda r: False
+        )
+        self.assertIsNone(resp)
+
+    def test_handler_exception(self):
+        """ハンドラーの例外はエラーレスポンスになる"""
+
+        def _boom(payload):
+            raise RuntimeError("boom")
+
+        request_handler.set_transport(InProcessTransport(_boom))
+        request_id = request_handler.write_request({"action": "get_schedule"})
+        resp = request_handler.wait_for_response("get_schedule", request_id)
+
+        self.assertFalse(resp.get("ok"))
+        self.assertEqual(resp["error"]["code"], "EXCEPTION")
+
+    def test_drain_from_other_thread(self):
+        """別スレッドからの drain でも到着順に処理される"""
+        seen = []
+
+        def _record(payload):
+            seen.append(payload["n"])
+            return {"ok": True, "action": "noop", "data": {}}
+
+        transport = InProcessTransport(_record)
+        for n in range(50):
+            transport.submit({"action": "noop", "n": n, "_request_id": str(n)})
+
+        worker = threading.Thread(target=transport.drain)
+        worker.start()
+        transport.drain()
+        worker.join()
+
+        self.assertEqual(seen, list(range(50)))
+        self.assertEqual(transport.last_response.get("_request_id"), "49")
+
+
+class _FakeRoot:
+    """after() だけを持つ Tk ルートの代用（イベントループを手動で回す）"""
+
+    def __init__(self):
+        self.pending = []
+        self.calls = 0
+
+    def after(self, ms, fn):
+        self.pending.append(fn)
+
+    def run(self, limit=1000):
+        while self.pending and self.calls < limit:
+            self.calls += 1
+            self.pending.pop(0)()
+
+
+class AsyncWaitTestCase(unittest.TestCase):
+    """非同期待機（wait_for_response_async / send_request）のテストケース"""
+
+    def setUp(self):
+        request_handler.set_transport(InProcessTransport(_echo_handler))
+
+    def tearDown(self):
+        request_handler.set_transport(None)
+
+    def test_send_request_does_not_block(self):
+        """send_request はすぐに戻り、イベントループでコールバックが呼ばれる"""
+        root = _FakeRoot()
+        received = []
+        future = request_handler.send_request(
+            {"action": "get_schedule", "date": "2026-01-08"},
+            root,
+            callback=received.append,
+        )
+        self.assertFalse(future.done())
+        self.assertEqual(received, [])
+
+        root.run()
+        self.assertTrue(future.done())
+        self.assertEqual(received[0]["_request_id"], future.request_id)
+        self.assertEqual(future.result()["data"]["echo"]["date"], "2026-01-08")
+
+    def test_timeout_calls_back_with_none(self):
+        """応答がなければタイムアウト後に None で完了する"""
+        root = _FakeRoot()
+        received = []
+        future = request_handler.wait_for_response_async(
+            "get_schedule", "missing", root, callback=received.append, timeout=0.0
+        )
+        root.run()
+        self.assertIsNone(future.result())
+        self.assertEqual(received, [None])
+
+
+class JournalTestCase(unittest.TestCase):
+    """リクエスト/レスポンスジャーナルのテストケース"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "request.jsonl")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_records_are_not_lost(self):
+        """連続して追記したレコードがすべて順に読める"""
+        reader = JournalReader(self.path)
+        for n in range(20):
+            append_record(self.path, {"_request_id": str(n), "action": "noop"})
+
+        records = reader.read_new()
+        self.assertEqual([r["_request_id"] for r in records], [str(n) for n in range(20)])
+        self.assertEqual(reader.read_new(), [])
+
+    def test_partial_line_is_deferred(self):
+        """書き込み途中の行は次回の読み込みに回される"""
+        reader = JournalReader(self.path)
+        second = encode_record(b'{"_request_id":"2"}')
+        with open(self.path, "wb") as f:
+            f.write(encode_record(b'{"_request_id":"1"}') + second[:-5])
+        self.assertEqual([r["_request_id"] for r in reader.read_new()], ["1"])
+
+        with open(self.path, "ab") as f:
+            f.write(second[-5:])
+        self.assertEqual([r["_request_id"] for r in reader.read_new()], ["2"])
+
+    def test_corrupted_record_is_reported(self):
+        """CRC が一致しないレコードは壊れたレコードとして返し、後続は読める"""
+        reader = JournalReader(self.path)
+        bad = encode_record(b'{"_request_id":"1"}').replace(b'"1"', b'"X"')
+        with open(self.path, "wb") as f:
+            f.write(bad + encode_record(b'{"_request_id":"2"}'))
+
+        records = reader.read_new()
+        self.assertTrue(records[0].get("__parse_error__"))
+        self.assertEqual(records[1]["_request_id"], "2")
+
+    def test_truncated_journal_is_reread(self):
+        """ジャーナルが切り詰められたら先頭から読み直す"""
+        reader = JournalReader(self.path)
+        append_record(self.path, {"_request_id": "old"})
+        reader.read_new()
+
+        with open(self.path, "wb"):
+            pass
+        append_record(self.path, {"_request_id": "n"})
+        self.assertEqual([r["_request_id"] for r in reader.read_new()], ["n"])
+
+
+    def test_compacts_after_reading_everything(self):
+        """読み終えたジャーナルは compact_bytes を超えたら空になり、続きも読める"""
+        reader = JournalReader(self.path, compact_bytes=256)
+        for n in range(10):
+            append_record(self.path, {"_request_id": str(n), "pad": "x" * 40})
+        self.assertEqual(len(reader.read_new()), 10)
+        self.assertEqual(os.path.getsize(self.path), 0)
+
+        append_record(self.path, {"_request_id": "next"})
+        self.assertEqual([r["_request_id"] for r in reader.read_new()], ["next"])
+
+    def test_does_not_compact_unread_records(self):
+        """読み終える前に追記されたレコードがあれば切り詰めない"""
+        reader = JournalReader(self.path, compact_bytes=64)
+        append_record(self.path, {"_request_id": "1", "pad": "x" * 80})
+        size = os.path.getsize(self.path)
+        # 大きさを確かめた後、切り詰める前にもう1件追記された状態を作る
+        with mock.patch.object(reader, "_size", return_value=size):
+            append_record(self.path, {"_request_id": "2"})
+            self.assertEqual([r["_request_id"] for r in reader.read_new()], ["1"])
+        self.assertGreater(os.path.getsize(self.path), 0)
+        self.assertEqual([r["_request_id"] for r in reader.read_new()], ["2"])
+
+
+class CodecTestCase(unittest.TestCase):
+    """ペイロードのエンコード方式のテストケース"""
+
+    RESPONSE = {
+        "ok": True,
+        "action": "get_all_schedules",
+        "data": {
+            "schedules": [
+                {
+                    "id": n,
+                    "mode": "B",
+                    "name": "バイト",
+                    "start_date": "2026-01-10",
+                    "start_time": "18:00",
+                    "end_date": "2026-01-10",
+                    "end_time": "22:00",
+                }
+                for n in range(100)
+            ]
+        },
+    }
+
+    def test_round_trip(self):
+        """すべてのコーデックで元のデータに戻る"""
+        for name in codec.available_codecs():
+            with self.subTest(codec=name):
+                body = codec.encode(self.RESPONSE, name)
+                self.assertEqual(codec.decode(body, name), self.RESPONSE)
+
+    def test_columnar_is_smaller(self):
+        """列形式はインデント付き JSON より大幅に小さい"""
+        indented = json.dumps(self.RESPONSE, ensure_ascii=False, indent=2).encode()
+        columnar = codec.encode(self.RESPONSE, "columnar")
+        self.assertLess(len(columnar) * 3, len(indented))
+
+    def test_decode_auto(self):
+        """コーデック名が無くても JSON・列形式を判別して復元できる"""
+        for name in ("json", "columnar"):
+            body = codec.encode(self.RESPONSE, name)
+            self.assertEqual(codec.decode_auto(body), self.RESPONSE)
+
+    def test_colliding_dicts_survive_round_trip(self):
+        """列形式の目印と同じキーを持つ辞書もそのまま復元される"""
+        cases = [
+            {"__columns__": ["a"], "__rows__": [[1]]},
+            {"__dict__": {"x": 1}},
+            {"__columnar__": 1, "body": {"__columns__": [], "__rows__": []}},
+            [{"__columns__": 1, "__rows__": 2}, {"__columns__": 3, "__rows__": 4}],
+        ]
+        for data in cases:
+            payload = {"ok": True, "data": data}
+            with self.subTest(data=data):
+                for name in ("json", "columnar"):
+                    body = codec.encode(payload, name)
+                    self.assertEqual(codec.decode(body, name), payload)
+                    self.assertEqual(codec.decode_auto(body), payload)
+
+    def test_columnar_version_is_checked(self):
+        """エンベロープの無いデータや未知の版は列形式として読まない"""
+        with self.assertRaises(ValueError):
+            codec.decode(b'{"__columns__":["a"],"__rows__":[[1]]}', "columnar")
+        with self.assertRaises(ValueError):
+            codec.decode(b'{"__columnar__":99,"body":{}}', "columnar")
+
+    def test_journal_detects_codec(self):
+        """ジャーナルはレコードごとのコーデックを自動判別する"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "response.jsonl")
+            reader = JournalReader(path)
+            append_record(path, self.RESPONSE, "columnar")
+            append_record(path, self.RESPONSE, "json")
+            append_record(path, self.RESPONSE, "no-such-codec")
+            self.assertEqual(reader.read_new(), [self.RESPONSE] * 3)
+
+
+class AtomicWriteTestCase(unittest.TestCase):
+    """アトミック書き込みのテストケース"""
+
+    def test_replace_leaves_no_temp_files(self):
+        """書き込み後は対象ファイルだけが残り、内容は完全な JSON"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "response.json")
+            for n in range(5):
+                atomic_write_json(path, {"n": n})
+            self.assertEqual(os.listdir(tmp), ["response.json"])
+            with open(path, "r", encoding="utf-8") as f:
+                self.assertEqual(json.load(f), {"n": 4})
+
+    @unittest.skipUnless(os.name == "posix", "パーミッションとシンボリックリンクは POSIX のみ")
+    def test_mode_and_symlink_are_kept(self):
+        """新規は umask どおり、既存はそのままのパーミッションで、リンク先を書き換える"""
+        old = os.umask(0o022)
+        try:
+            with tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, "export.json")
+                atomic_write_json(path, {"n": 1})
+                self.assertEqual(stat.S_IMODE(os.stat(path).st_mode), 0o644)
+
+                os.chmod(path, 0o640)
+                atomic_write_json(path, {"n": 2})
+                self.assertEqual(stat.S_IMODE(os.stat(path).st_mode), 0o640)
+
+                link = os.path.join(tmp, "link.json")
+                os.symlink(path, link)
+                atomic_write_json(link, {"n": 3})
+                self.assertTrue(os.path.islink(link))
+                with open(path, "r", encoding="utf-8") as f:
+                    self.assertEqual(json.load(f), {"n": 3})
+        finally:
+            os.umask(old)
+
+
+@unittest.skipUnless(inotify.is_available(), "inotify は Linux のみ")
+class InotifyWatcherTestCase(unittest.TestCase):
+    """inotify 監視のテストケース"""
+
+    def test_only_watched_file_is_reported(self):
+        """監視対象ファイルへの書き込み完了だけが通知される"""
+        with tempfile.TemporaryDirectory() as tmp:
+            watcher = inotify.InotifyWatcher(tmp, ["request.jsonl"])
+            try:
+                self.assertEqual(watcher.read_events(), set())
+                append_record(os.path.join(tmp, "other.jsonl"), {"n": 0})
+                self.assertEqual(watcher.read_events(), set())
+                append_record(os.path.join(tmp, "request.jsonl"), {"n": 1})
+                self.assertEqual(watcher.read_events(), {"request.jsonl"})
+            finally:
+                watcher.close()
+
+
+class FileTransportPipeliningTestCase(unittest.TestCase):
+    """ファイル経由で複数リクエストを同時に処理中にできることのテスト"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        base = self.tmp.name
+        self.req_journal = os.path.join(base, "request.jsonl")
+        self.res_journal = os.path.join(base, "response.jsonl")
+        self._patches = [
+            mock.patch.object(
+                request_handler,
+                "_paths",
+                lambda: (
+                    os.path.join(base, "request.json"),
+                    os.path.join(base, "response.json"),
+                ),
+            ),
+            mock.patch.object(
+                request_handler,
+                "_journal_paths",
+                lambda: (self.req_journal, self.res_journal),
+            ),
+        ]
+        for p in self._patches:
+            p.start()
+        request_handler.set_transport(None)
+
+    def tearDown(self):
+        for p in self._patches:
+            p.stop()
+        self.tmp.cleanup()
+
+    def _serve_pending(self):
+        reader = JournalReader(self.req_journal)
+        for payload in reader.read_new():
+            resp = _echo_handler(payload)
+            resp["_request_id"] = payload["_request_id"]
+            append_record(self.res_journal, resp)
+
+    def test_latest_marker_reads_body_from_journal(self):
+        """response.json の目印から、最新のレスポンスの本文をジャーナルで引く"""
+        request_id = request_handler.write_request({"action": "get_schedule", "n": 7})
+        self._serve_pending()
+        resp = {"_request_id": request_id, "action": "get_schedule", "ok": True}
+        atomic_write_json(os.path.join(self.tmp.name, "response.json"), latest_marker(resp))
+
+        latest = request_handler.try_read_response()
+        self.assertEqual(latest["data"]["echo"]["n"], 7)
+
+        # 目印と本文が一致しなければ返さない
+        atomic_write_json(
+            os.path.join(self.tmp.name, "response.json"),
+            latest_marker({"_request_id": "other"}),
+        )
+        self.assertIsNone(request_handler.try_read_response())
+
+    def test_in_flight_requests_are_all_answered(self):
+        """連続送信したリクエストがすべて応答され、どの順で待っても取得できる"""
+        ids = [
+            request_handler.write_request({"action": "get_schedule", "n": n})
+            for n in range(5)
+        ]
+        self._serve_pending()
+
+        for n, request_id in reversed(list(enumerate(ids))):
+            resp = request_handler.wait_for_response(
+                "get_schedule", request_id, timeout=1.0
+            )
+            self.assertIsNotNone(resp)
+            self.assertEqual(resp["data"]["echo"]["n"], n)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+"""
+月単位キャッシュのテスト
+front_end/utils/month_cache.py の LRU と、書き込みリクエストによる無効化をテストします
+"""
+
+import os
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from ipc.memory import InProcessTransport
+from front_end import request_handler
+from front_end.utils.month_cache import MonthCache, schedules_on
+
+
+def _echo_handler(payload: dict) -> dict:
+    return {"ok": True, "action": payload.get("action"), "data": {}}
+
+
+class MonthCacheTestCase(unittest.TestCase):
+    """月単位キャッシュのテストケース"""
+
+    def test_lru_eviction(self):
+        """上限を超えると最も長く使われていない月から捨てる"""
+        cache = MonthCache(2)
+        cache.put((2026, 1), "jan")
+        cache.put((2026, 2), "feb")
+        self.assertEqual(cache.get((2026, 1)), "jan")
+        cache.put((2026, 3), "mar")
+
+        self.assertIn((2026, 1), cache)
+        self.assertNotIn((2026, 2), cache)
+        self.assertIsNone(cache.get((2026, 2)))
+        self.assertEqual(len(cache), 2)
+
+    def test_stale_generation_is_not_stored(self):
+        """送信後に無効化された結果は保存しない"""
+        cache = MonthCache(4)
+        generation = cache.generation
+        cache.invalidate()
+        self.assertFalse(cache.put((2026, 1), "old", generation))
+        self.assertNotIn((2026, 1), cache)
+        self.assertTrue(cache.put((2026, 1), "new", cache.generation))
+        self.assertEqual(cache.get((2026, 1)), "new")
+
+    def test_newer_data_version_clears(self):
+        """data_version が進んだら捨て、古いバージョンの結果は保存しない"""
+        cache = MonthCache(4)
+        self.assertTrue(cache.put((2026, 1), "jan", version=5))
+        cache.observe_version(5)
+        self.assertIn((2026, 1), cache)
+
+        cache.observe_version(6)
+        self.assertNotIn((2026, 1), cache)
+        self.assertFalse(cache.put((2026, 1), "stale", version=5))
+        self.assertTrue(cache.put((2026, 1), "fresh", version=7))
+        self.assertEqual(cache.get((2026, 1)), "fresh")
+        self.assertEqual(cache.version, 7)
+
+    def test_schedules_on(self):
+        """月の一覧から、その日に重なる予定を開始時刻順に取り出す"""
+        items = [
+            {"id": 1, "start_date": "2026-01-07", "start_time": "22:00", "end_date": "2026-01-08"},
+            {"id": 2, "start_date": "2026-01-08", "start_time": "09:00", "end_date": "2026-01-08"},
+            {"id": 3, "start_date": "2026-01-09", "start_time": "08:00", "end_date": "2026-01-09"},
+        ]
+        self.assertEqual([sc["id"] for sc in schedules_on(items, "2026-01-08")], [2, 1])
+        self.assertEqual(schedules_on(items, "2026-01-10"), [])
+
+
+class WriteListenerTestCase(unittest.TestCase):
+    """書き込みリクエストの通知のテストケース"""
+
+    def setUp(self):
+        request_handler.set_transport(InProcessTransport(_echo_handler))
+        self.cache = MonthCache(4)
+        self.cache.put((2026, 1), "jan")
+        request_handler.add_write_listener(self.cache.invalidate)
+
+    def tearDown(self):
+        request_handler.remove_write_listener(self.cache.invalidate)
+        request_handler.set_transport(None)
+
+    def test_read_request_keeps_cache(self):
+        request_handler.write_request({"action": "get_month_density", "year": 2026, "month": 1})
+        self.assertIn((2026, 1), self.cache)
+        self.assertEqual(self.cache.generation, 0)
+
+    def test_write_request_invalidates(self):
+        """予定を書き換えるアクションを送るとキャッシュが破棄される"""
+        for action in sorted(request_handler.WRITE_ACTIONS):
+            with self.subTest(action=action):
+                self.cache.put((2026, 1), "jan")
+                generation = self.cache.generation
+                request_handler.write_request({"action": action})
+                self.assertNotIn((2026, 1), self.cache)
+                self.assertEqual(self.cache.generation, generation + 1)
+
+    def test_response_listener_sees_data_version(self):
+        seen = []
+        request_handler.add_response_listener(seen.append)
+        try:
+            request_id = request_handler.write_request({"action": "get_month_density"})
+            request_handler.wait_for_response("get_month_density", request_id, timeout=1)
+        finally:
+            request_handler.remove_response_listener(seen.append)
+        self.assertEqual([r["_request_id"] for r in seen], [request_id])
+
+    def test_batch_with_write_invalidates(self):
+        """書き込みを含む batch だけがキャッシュを破棄させる"""
+        reads = request_handler.batch_payload([{"action": "get_month_density"}])
+        request_handler.write_request(reads)
+        self.assertIn((2026, 1), self.cache)
+
+        mixed = request_handler.batch_payload(
+            [{"action": "delete_schedule", "id": 1}, {"action": "get_schedule"}]
+        )
+        request_handler.write_request(mixed)
+        self.assertNotIn((2026, 1), self.cache)
+
+    def test_batch_responses(self):
+        """batch のレスポンスをリクエストの件数に分け、batch のリクエストIDを付ける"""
+        resp = {
+            "ok": True,
+            "action": "batch",
+            "_request_id": "r1",
+            "data": {"responses": [{"ok": True, "action": "delete_schedule"}]},
+        }
+        deleted, refreshed = request_handler.batch_responses(resp, 2)
+        self.assertEqual(deleted["_request_id"], "r1")
+        self.assertIsNone(refreshed)
+
+        failed = {"ok": False, "action": "batch"}
+        self.assertEqual(request_handler.batch_responses(failed, 2), [failed, failed])
+        self.assertEqual(request_handler.batch_responses(None, 2), [None, None])
+
+    def test_removed_listener_is_not_called(self):
+        request_handler.remove_write_listener(self.cache.invalidate)
+        request_handler.write_request({"action": "add_schedule"})
+        self.assertIn((2026, 1), self.cache)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,205 @@
+"""
+給料一括計算のテスト
+back_end/payroll.py の NumPy 版と純 Python 版、1分ごとの判定が一致するかをテストします
+"""
+
+import os
+import random
+import sys
+import unittest
+from datetime import date, datetime, timedelta
+
+from common.worktime import EPOCH_MINUTES, to_minutes
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from back_end.payroll import calculate_payroll, calculate_payroll_minutes, has_numpy
+
+
+def _random_shifts(count, seed=0):
+    rng = random.Random(seed)
+    base = datetime(2025, 1, 1)
+    shifts = []
+    for n in range(count):
+        start = base + timedelta(minutes=rng.randrange(60 * 24 * 365))
+        end = start + timedelta(minutes=rng.randrange(1, 60 * 24 * 2))
+        shifts.append(
+            {
+                "id": n,
+                "name": f"バイト{n}",
+                "start_date": start.strftime("%Y-%m-%d"),
+                "start_time": start.strftime("%H:%M"),
+                "end_date": end.strftime("%Y-%m-%d"),
+                "end_time": end.strftime("%H:%M"),
+            }
+        )
+    return shifts
+
+
+def _loop_minutes(shift, night_start, night_end):
+    """1分ごとに深夜かを判定する素朴な実装（日をまたぐ時間帯用）"""
+    current = datetime.strptime(
+        f"{shift['start_date']} {shift['start_time']}", "%Y-%m-%d %H:%M"
+    )
+    end = datetime.strptime(f"{shift['end_date']} {shift['end_time']}", "%Y-%m-%d %H:%M")
+    total = night = 0
+    while current < end:
+        if current.hour >= night_start or current.hour < night_end:
+            night += 1
+        total += 1
+        current += timedelta(minutes=1)
+    return total, night
+
+
+class PayrollTestCase(unittest.TestCase):
+    """給料一括計算のテストケース"""
+
+    def test_python_matches_minute_loop(self):
+        shifts = _random_shifts(60)
+        result = calculate_payroll(shifts, 1000, 1.25, 22, 5, use_numpy=False)
+        for shift, row in zip(shifts, result["shifts"]):
+            self.assertEqual(
+                (row["total_minutes"], row["night_minutes"]),
+                _loop_minutes(shift, 22, 5),
+            )
+
+    @unittest.skipUnless(has_numpy(), "numpy is not installed")
+    def test_numpy_matches_python(self):
+        shifts = _random_shifts(2000, seed=1)
+        for window in [(22, 5), (1, 5), (8, 8)]:
+            with self.subTest(window=window):
+                vec = calculate_payroll(shifts, 1100, 1.3, *window, use_numpy=True)
+                ref = calculate_payroll(shifts, 1100, 1.3, *window, use_numpy=False)
+                self.assertEqual(vec, ref)
+
+    def test_totals_and_salary(self):
+        shifts = [
+            {
+                "id": 1,
+                "name": "夜勤",
+                "start_date": "2026-01-10",
+                "start_time": "21:00",
+                "end_date": "2026-01-11",
+                "end_time": "06:00",
+            },
+            {
+                "id": 2,
+                "name": "逆転",
+                "start_date": "2026-01-12",
+                "start_time": "10:00",
+                "end_date": "2026-01-12",
+                "end_time": "09:00",
+            },
+        ]
+        result = calculate_payroll(shifts, 1000, 1.25)
+        first = result["shifts"][0]
+        self.assertEqual(first["night_minutes"], 7 * 60)
+        self.assertEqual(first["normal_minutes"], 2 * 60)
+        self.assertEqual(first["salary"], 2 * 1000 + 7 * 1250)
+        self.assertEqual(result["shifts"][1]["total_minutes"], 0)
+        self.assertEqual(result["totals"]["count"], 2)
+        self.assertEqual(result["totals"]["salary"], first["salary"])
+
+    def test_period_counts_only_days_inside(self):
+        """期間をまたぐシフトは期間内の部分だけを数え、隣の期間との合計は元のシフトと同じ"""
+        shift = {
+            "id": 1,
+            "name": "年越し",
+            "start_date": "2025-12-31",
+            "start_time": "22:00",
+            "end_date": "2026-01-01",
+            "end_time": "05:00",
+        }
+        whole = calculate_payroll([shift], 1000, 1.25)["totals"]
+        for use_numpy in [False, True] if has_numpy() else [False]:
+            with self.subTest(use_numpy=use_numpy):
+                dec = calculate_payroll(
+                    [shift],
+                    1000,
+                    1.25,
+                    use_numpy=use_numpy,
+                    period=(date(2025, 12, 1), date(2025, 12, 31)),
+                )["totals"]
+                jan = calculate_payroll(
+                    [shift],
+                    1000,
+                    1.25,
+                    use_numpy=use_numpy,
+                    period=(date(2026, 1, 1), date(2026, 12, 31)),
+                )["totals"]
+                self.assertEqual((dec["total_minutes"], dec["night_minutes"]), (120, 120))
+                self.assertEqual((jan["total_minutes"], jan["night_minutes"]), (300, 300))
+                self.assertEqual(dec["salary"] + jan["salary"], whole["salary"])
+
+    @unittest.skipUnless(has_numpy(), "numpy is not installed")
+    def test_numpy_matches_python_with_period(self):
+        shifts = _random_shifts(500, seed=2)
+        period = (date(2025, 3, 1), date(2025, 3, 31))
+        vec = calculate_payroll(shifts, 1000, 1.25, use_numpy=True, period=period)
+        ref = calculate_payroll(shifts, 1000, 1.25, use_numpy=False, period=period)
+        self.assertEqual(vec, ref)
+
+    def test_minutes_match_strings(self):
+        """通算分の列から求めた結果は、日時の文字列から求めた結果と同じ"""
+        shifts = _random_shifts(300, seed=3)
+
+        def epoch(date_text, time_text):
+            t = datetime.strptime(f"{date_text} {time_text}", "%Y-%m-%d %H:%M")
+            return to_minutes(t) - EPOCH_MINUTES
+
+        columns = (
+            [s["id"] for s in shifts],
+            [s["name"] for s in shifts],
+            [epoch(s["start_date"], s["start_time"]) for s in shifts],
+            [epoch(s["end_date"], s["end_time"]) for s in shifts],
+        )
+        period = (date(2025, 6, 1), date(2025, 6, 30))
+        paths = [False, True] if has_numpy() else [False]
+        for use_numpy in paths:
+            with self.subTest(use_numpy=use_numpy):
+                self.assertEqual(
+                    calculate_payroll_minutes(
+                        *columns, 1000, 1.25, use_numpy=use_numpy, period=period
+                    ),
+                    calculate_payroll(
+                        shifts, 1000, 1.25, use_numpy=use_numpy, period=period
+                    ),
+                )
+
+    def test_bad_stamps_rejected_by_both_paths(self):
+        """NumPy の有無で受け付ける日時が変わらない（切り詰めて計算しない）"""
+        good = {
+            "start_date": "2026-01-02",
+            "start_time": "09:00",
+            "end_date": "2026-01-02",
+            "end_time": "17:30",
+        }
+        bad_values = [
+            {"start_time": "09:00:00", "end_time": "17:30:99"},
+            {"end_time": "17:30:99"},
+            {"start_date": "2026-01-022"},
+            {"start_time": "9:00"},
+            {"start_date": "2026-1-2"},
+            {"end_date": None},
+            {"start_time": "25:00"},
+        ]
+        paths = [False, True] if has_numpy() else [False]
+        for values in bad_values:
+            for use_numpy in paths:
+                with self.subTest(values=values, use_numpy=use_numpy):
+                    with self.assertRaises(ValueError):
+                        calculate_payroll([{**good, **values}], use_numpy=use_numpy)
+        for use_numpy in paths:
+            result = calculate_payroll([good], use_numpy=use_numpy)
+            self.assertEqual(result["totals"]["total_minutes"], 510)
+
+    def test_empty(self):
+        result = calculate_payroll([], 1000, 1.25)
+        self.assertEqual(result["totals"]["total_minutes"], 0)
+        self.assertEqual(result["shifts"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+"""
+読み込み結果のキャッシュのテスト
+back_end/result_cache.py と、handle_request が cacheable なアクションの結果を使い回すことをテストします
+"""
+
+import os
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from back_end import functions
+from back_end.db.db import db, Schedule
+from back_end.result_cache import ResultCache, cache_key, result_cache
+
+
+class ResultCacheTestCase(unittest.TestCase):
+    """ResultCache 単体のテストケース"""
+
+    def test_cache_key_ignores_order_and_private_fields(self):
+        a = cache_key({"action": "get_schedule", "date": "2026-01-08", "_request_id": "x"})
+        b = cache_key({"date": "2026-01-08", "action": "get_schedule", "_request_id": "y"})
+        self.assertEqual(a, b)
+        self.assertNotEqual(a, cache_key({"action": "get_schedule", "date": "2026-01-09"}))
+        self.assertNotEqual(
+            cache_key({"action": "get_schedule", "travel": {"commute_time": 30}}),
+            cache_key({"action": "get_schedule", "travel": {"commute_time": 45}}),
+        )
+
+    def test_lru_and_counters(self):
+        cache = ResultCache(maxsize=2)
+        self.assertIsNone(cache.get("a", 1))
+        for key in ("a", "b"):
+            cache.put(key, 1, {"ok": True, "data": key})
+        cache.get("a", 1)
+        cache.put("c", 1, {"ok": True, "data": "c"})
+        self.assertIsNone(cache.get("b", 1))
+        self.assertEqual(cache.get("a", 1)["data"], "a")
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (2, 2))
+        self.assertEqual(stats["size"], 2)
+        self.assertEqual(stats["hit_rate"], 0.5)
+
+    def test_newer_version_clears(self):
+        """バージョンが進んだら捨て、読み込み中に進んだ結果は保存しない"""
+        cache = ResultCache()
+        cache.put("a", 1, {"ok": True})
+        self.assertIsNone(cache.get("a", 2))
+        self.assertFalse(cache.put("b", 1, {"ok": True}))
+        self.assertEqual(len(cache), 0)
+        self.assertTrue(cache.put("b", 2, {"ok": True}))
+
+    def test_returns_copies(self):
+        """呼び出し側がレスポンスに項目を付けてもキャッシュは変わらない"""
+        cache = ResultCache()
+        resp = {"ok": True, "data": {}}
+        cache.put("a", 1, resp)
+        resp["data_version"] = 1
+        hit = cache.get("a", 1)
+        hit["_request_id"] = "r1"
+        self.assertEqual(cache.get("a", 1), {"ok": True, "data": {}})
+
+
+class HandleRequestCacheTestCase(unittest.TestCase):
+    """handle_request の読み込みキャッシュのテストケース"""
+
+    def setUp(self):
+        db.connect(reuse_if_open=True)
+        Schedule.delete().execute()
+        result_cache.clear()
+
+    def tearDown(self):
+        Schedule.delete().execute()
+
+    def _add(self, name: str) -> dict:
+        return functions.handle_request(
+            {
+                "action": "add_schedule",
+                "mode": "A",
+                "name": name,
+                "start_date": "2026-01-08",
+                "start_time": "09:00",
+                "end_date": "2026-01-08",
+                "end_time": "10:00",
+            }
+        )
+
+    def _stats(self) -> dict:
+        return functions.handle_request({"action": "get_cache_stats"})["data"]
+
+    def test_reads_hit_until_a_write(self):
+        self._add("講義")
+        payload = {"action": "get_monthly_schedule", "year": 2026, "month": 1}
+        before = self._stats()
+
+        first = functions.handle_request(dict(payload, _request_id="r1"))
+        second = functions.handle_request(dict(payload, _request_id="r2"))
+        after = self._stats()
+        self.assertEqual(after["misses"] - before["misses"], 1)
+        self.assertEqual(after["hits"] - before["hits"], 1)
+        self.assertEqual(second["data"], first["data"])
+        self.assertEqual(second["data_version"], first["data_version"])
+
+        # 書き込みでバージョンが進んだら取り直す
+        self._add("バイト")
+        third = functions.handle_request(payload)
+        self.assertEqual(
+            [s["name"] for s in third["data"]["schedules"]], ["講義", "バイト"]
+        )
+        self.assertEqual(self._stats()["misses"] - after["misses"], 1)
+
+    def test_errors_and_non_cacheable_actions_are_not_stored(self):
+        bad = {"action": "get_schedule", "date": "2026/01/08"}
+        functions.handle_request(bad)
+        functions.handle_request({"action": "calc_payroll", "shifts": []})
+        self.assertEqual(len(result_cache), 0)
+        before = self._stats()
+        functions.handle_request(bad)
+        self.assertEqual(self._stats()["misses"] - before["misses"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
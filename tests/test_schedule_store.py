@@ -0,0 +1,101 @@
+"""
+予定一覧の保持のテスト
+front_end/utils/schedule_store.py の列ごとの保持と外出時刻の計算をテストします
+"""
+
+import os
+import sys
+import unittest
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from front_end.utils.schedule_store import (
+    NO_TIME,
+    ScheduleStore,
+    departure_time,
+    parse_minute,
+)
+
+
+def _items(count):
+    for i in range(count):
+        yield {
+            "id": i + 1,
+            "mode": ("A", "B", None)[i % 3],
+            "name": f"予定{i}",
+            "start_date": "2026-01-08",
+            "start_time": f"{i % 24:02d}:{i % 60:02d}",
+            "end_date": "2026-01-09",
+            "end_time": "10:00",
+        }
+
+
+class ScheduleStoreTestCase(unittest.TestCase):
+    """予定一覧の保持のテストケース"""
+
+    def test_round_trip(self):
+        """store[i] は追加した dict と同じ内容を返す"""
+        items = list(_items(50))
+        store = ScheduleStore(items)
+        self.assertEqual(len(store), 50)
+        self.assertEqual([store[i] for i in range(len(store))], items)
+        self.assertEqual(store[-1], items[-1])
+        with self.assertRaises(IndexError):
+            store[50]
+
+    def test_strings_are_shared(self):
+        store = ScheduleStore(_items(10))
+        self.assertIs(store.start_dates[0], store.start_dates[9])
+        self.assertIs(store.end_times[0], store.end_times[9])
+
+    def test_row_matches_datetime_calculation(self):
+        """外出時刻は開始日時から移動時間を引いた時刻（A は通学、それ以外は通勤）"""
+        store = ScheduleStore(_items(100))
+        for i in range(len(store)):
+            with self.subTest(i=i):
+                sc = store[i]
+                start = datetime.strptime(
+                    f"{sc['start_date']} {sc['start_time']}", "%Y-%m-%d %H:%M"
+                )
+                minutes = 20 if sc["mode"] == "A" else 45
+                expected = (start - timedelta(minutes=minutes)).strftime("%H:%M")
+                mode, name, start_text, end_text, departure = store.row(i, 45, 20)
+                self.assertEqual((mode, name), (sc["mode"], sc["name"]))
+                self.assertEqual(start_text, f"{sc['start_date']} {sc['start_time']}")
+                self.assertEqual(end_text, "2026-01-09 10:00")
+                self.assertEqual(departure, expected)
+
+    def test_backend_minutes_and_departure(self):
+        """バックエンドの外出時刻は同じ設定の間だけ使い、設定が変われば計算し直す"""
+        item = {
+            "id": 1,
+            "mode": "B",
+            "name": "バイト",
+            "start_date": "2026-01-08",
+            "start_time": "??",
+            "end_date": "2026-01-08",
+            "end_time": "18:00",
+            "start_minutes": 29463850,  # 2026-01-08 00:10
+            "departure_time": "23:25",
+        }
+        store = ScheduleStore([item], {"commute_time": 45, "school_time": 20})
+        self.assertEqual(store.row(0, 45, 20)[4], "23:25")
+        self.assertEqual(store.row(0, 30, 20)[4], "23:40")
+        # 設定が分からなければ start_minutes から計算する（時刻の文字列は読まない）
+        store = ScheduleStore([dict(item, departure_time="x")])
+        self.assertEqual(store.row(0, 45, 20)[4], "23:25")
+
+    def test_invalid_start_time(self):
+        self.assertEqual(parse_minute("25:00"), NO_TIME)
+        self.assertEqual(parse_minute(None), NO_TIME)
+        self.assertEqual(departure_time(NO_TIME, 30), "-")
+        store = ScheduleStore([{"id": None, "name": "x", "start_time": "??"}])
+        self.assertEqual(store.row(0, 30, 30)[4], "-")
+        self.assertIsNone(store[0]["id"])
+
+
+if __name__ == "__main__":
+    unittest.main()
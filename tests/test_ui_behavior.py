@@ -106,6 +106,22 @@ class TestCalendar(TkTestCase):
         self.assertEqual(data.get("action"), "get_schedule")
         self.assertEqual(data.get("date"), target.isoformat())
 
+    def test_stale_timeout_does_not_clear_newer_view(self):
+        from front_end.calender import CalendarWindow
+
+        cw = CalendarWindow(self.root)
+        cw._fill_tree([{"id": 1, "name": "新しい表示", "mode": "A"}])
+        cw.result.delete("1.0", tk.END)
+        cw.result.insert(tk.END, "新しい表示\n")
+        cw._view_request_id = "newer"
+
+        # 先に送った日・月のリクエストがタイムアウトしても、新しい表示は消さない
+        cw._on_day_response(None, "2026-01-08", "older")
+        cw._on_month_response(None, 2026, 1, 0, "older")
+
+        self.assertEqual([i["name"] for i in cw.current_items], ["新しい表示"])
+        self.assertEqual(cw.result.get("1.0", "end").strip(), "新しい表示")
+
     def test_request_without_selection_shows_info(self):
         import front_end.calender as cal_mod
 
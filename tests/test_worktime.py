@@ -0,0 +1,79 @@
+"""
+勤務時間計算のテスト
+front_end/utils/worktime.py の区間演算を、従来の1分ごとのループと比較します
+"""
+
+import os
+import random
+import sys
+import unittest
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from front_end.utils.worktime import night_window, split_minutes
+
+
+def _loop_minutes(start, end, night_start, night_end):
+    """変更前の SalaryWindow.calculate_working_hours と同じ1分ごとの判定（分で数える）"""
+    total = night = 0
+    current = start
+    while current < end:
+        hour = current.hour
+        if hour >= night_start or hour < night_end:
+            night += 1
+        total += 1
+        current += timedelta(minutes=1)
+    return total, night
+
+
+def _random_shifts(count, seed=0):
+    rng = random.Random(seed)
+    base = datetime(2025, 12, 20)
+    for _ in range(count):
+        start = base + timedelta(minutes=rng.randrange(60 * 24 * 40))
+        yield start, start + timedelta(minutes=rng.randrange(1, 60 * 24 * 3))
+
+
+class WorktimeTestCase(unittest.TestCase):
+    """勤務時間計算のテストケース"""
+
+    def test_matches_minute_loop(self):
+        """日をまたぐ深夜時間帯で、1分ごとのループと同じ分数になる"""
+        windows = [(22, 5), (23, 6), (20, 0), (23, 1), (12, 11), (9, 9)]
+        for night_start, night_end in windows:
+            window = night_window(night_start, night_end)
+            for start, end in _random_shifts(150, seed=night_start):
+                with self.subTest(night=(night_start, night_end), start=start, end=end):
+                    self.assertEqual(
+                        split_minutes(start, end, window),
+                        _loop_minutes(start, end, night_start, night_end),
+                    )
+
+    def test_typical_night_shift(self):
+        """21:00〜翌6:00 の勤務は深夜 7時間"""
+        total, night = split_minutes(
+            datetime(2026, 1, 10, 21, 0), datetime(2026, 1, 11, 6, 0)
+        )
+        self.assertEqual((total, night), (9 * 60, 7 * 60))
+
+    def test_window_within_a_day(self):
+        """開始 < 終了 の時間帯は日をまたがずに [開始, 終了) だけを数える"""
+        window = night_window(1, 5)
+        total, night = split_minutes(
+            datetime(2026, 1, 10, 0, 30), datetime(2026, 1, 11, 2, 0), window
+        )
+        self.assertEqual(total, 25 * 60 + 30)
+        self.assertEqual(night, 4 * 60 + 60)
+
+    def test_end_before_start(self):
+        self.assertEqual(
+            split_minutes(datetime(2026, 1, 10, 9, 0), datetime(2026, 1, 10, 8, 0)),
+            (0, 0),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+"""
+書き込みスレッドのテスト
+back_end/writer.py のまとめ書き込みと、読み込みとの順序をテストします
+"""
+
+import os
+import sys
+import unittest
+import uuid
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from back_end import functions
+from back_end.db.db import db, Schedule
+from back_end.result_cache import result_cache
+from back_end.writer import ScheduleWriter
+from ipc.memory import InProcessTransport
+
+
+def _add(name: str, **extra) -> dict:
+    payload = {
+        "action": "add_schedule",
+        "mode": "A",
+        "name": name,
+        "start_date": "2026-01-08",
+        "start_time": "09:00",
+        "end_date": "2026-01-08",
+        "end_time": "10:00",
+    }
+    payload.update(extra)
+    return payload
+
+
+class ScheduleWriterTestCase(unittest.TestCase):
+    """書き込みスレッドのテストケース"""
+
+    def setUp(self):
+        db.connect(reuse_if_open=True)
+        Schedule.delete().execute()
+        result_cache.clear()
+
+    def tearDown(self):
+        Schedule.delete().execute()
+
+    def test_consecutive_writes_share_a_transaction(self):
+        """続けて積まれた書き込みはまとめて実行し、読み込みはその後ろで1件ずつ実行する"""
+        calls = []
+
+        def write_handler(payloads):
+            calls.append(("write", [p["name"] for p in payloads]))
+            return [{"ok": True, "action": p["action"]} for p in payloads]
+
+        def read_handler(payload):
+            calls.append(("read", payload["action"]))
+            return {"ok": True, "action": payload["action"]}
+
+        writer = ScheduleWriter(read_handler, write_handler, max_batch=3)
+        futures = [writer.submit(_add(f"w{i}")) for i in range(4)]
+        futures.append(writer.submit({"action": "get_schedule"}))
+        futures.append(writer.submit(_add("w4")))
+        self.assertEqual(writer.pending(), 6)
+
+        writer.start()
+        for future in futures:
+            self.assertTrue(future.result(timeout=5)["ok"])
+        writer.stop(timeout=5)
+
+        self.assertEqual(
+            calls,
+            [
+                ("write", ["w0", "w1", "w2"]),
+                ("write", ["w3"]),
+                ("read", "get_schedule"),
+                ("write", ["w4"]),
+            ],
+        )
+        self.assertEqual(writer.pending(), 0)
+        with self.assertRaises(RuntimeError):
+            writer.submit(_add("late"))
+
+    def test_failed_write_is_rolled_back_alone(self):
+        """例外になった書き込みだけが取り消され、同じ塊の他の書き込みは残る"""
+        before = functions.data_version()
+        results = functions.handle_write_batch(
+            [_add("ok1"), _add(None), _add("ok2", start_time="9時")]
+        )
+        self.assertTrue(results[0]["ok"])
+        self.assertEqual(results[1]["error"]["code"], "EXCEPTION")
+        self.assertEqual(results[2]["error"]["code"], "BAD_REQUEST")
+        self.assertEqual([s.name for s in Schedule.select()], ["ok1"])
+        # 成功した書き込みの分だけ進み、全レスポンスに最終の値が付く
+        self.assertEqual(functions.data_version(), before + 1)
+        self.assertEqual({r["data_version"] for r in results}, {before + 1})
+
+    def test_read_after_write_sees_the_write(self):
+        """書き込みスレッドに積んだ読み込みは、先に積んだ書き込みの結果を返す"""
+        writer = ScheduleWriter().start()
+        try:
+            transport = InProcessTransport(writer.submit)
+            ids = []
+            for payload in (_add("講義"), {"action": "get_schedule", "date": "2026-01-08"}):
+                payload["_request_id"] = str(uuid.uuid4())
+                ids.append(payload["_request_id"])
+                transport.submit(payload)
+            transport.drain()
+            added = transport.wait(ids[0], timeout=5)
+            read = transport.wait(ids[1], timeout=5)
+        finally:
+            writer.stop(timeout=5)
+
+        self.assertTrue(added["ok"])
+        self.assertEqual([s["name"] for s in read["data"]["schedules"]], ["講義"])
+        self.assertEqual(read["data_version"], added["data_version"])
+
+    def test_batch_runs_alone_on_the_writer(self):
+        """書き込みを含む batch は前後の書き込みとまとめず、読み込みとして1件で実行する"""
+        calls = []
+
+        def write_handler(payloads):
+            calls.append(("write", [p["action"] for p in payloads]))
+            return [{"ok": True, "action": p["action"]} for p in payloads]
+
+        def read_handler(payload):
+            calls.append(("read", payload["action"]))
+            return {"ok": True, "action": payload["action"]}
+
+        writer = ScheduleWriter(read_handler, write_handler)
+        batch = {"action": "batch", "requests": [_add("b"), {"action": "get_schedule"}]}
+        futures = [writer.submit(p) for p in (_add("w0"), batch, _add("w1"))]
+        writer.start()
+        for future in futures:
+            future.result(timeout=5)
+        writer.stop(timeout=5)
+
+        self.assertEqual(
+            calls,
+            [
+                ("write", ["add_schedule"]),
+                ("read", "batch"),
+                ("write", ["add_schedule"]),
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,24 +1,41 @@
-import json
+import os
 from pathlib import Path
 
 from PySide6.QtCore import QObject, QFileSystemWatcher, QTimer, Slot
 
 from back_end.db.init import initialize_database
 from back_end.functions import handle_request
+from ipc.atomic import atomic_write_json
+from ipc.codec import resolve_codec
+from ipc.journal import (
+    COMPACT_BYTES,
+    JournalReader,
+    append_record,
+    latest_marker,
+    reset_journal,
+)
 
 
 REQUEST_PATH = Path("json/request.json")
 RESPONSE_PATH = Path("json/response.json")
+REQUEST_JOURNAL_PATH = Path("json/request.jsonl")
+RESPONSE_JOURNAL_PATH = Path("json/response.jsonl")
+
+# レスポンスジャーナルの既定エンコード方式（FREEDOM_IPC_CODEC で変更可）
+DEFAULT_RESPONSE_CODEC = "columnar"
 
 
 class JsonRequestWatcher(QObject):
     """
-    json/request.json の変更を監視して、更新があったら
-    handle_request(payload) を実行し json/response.json に保存する。
+    json/request.jsonl（リクエストジャーナル）の変更を監視して、追記された
+    リクエストを順に handle_request(payload) で処理し json/response.jsonl に追記する。
     """
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, codec: str | None = None):
         super().__init__(parent)
+        self.codec = resolve_codec(
+            codec or os.environ.get("FREEDOM_IPC_CODEC", DEFAULT_RESPONSE_CODEC)
+        )
 
         initialize_database()
 
@@ -27,8 +44,9 @@ class JsonRequestWatcher(QObject):
         self.timer.setSingleShot(True)
         self.timer.timeout.connect(self._process_request)
 
-        # 変更イベントが連続で飛ぶことがあるので、最後のイベントから少し待って処理
-        self.debounce_ms = 120
+        # 連続した変更イベントを1回の処理にまとめる。ジャーナルのレコードは
+        # 長さと CRC 付きで書き込み途中を読まないので、待ち時間は不要
+        self.debounce_ms = 0
 
         # request.json が存在しない場合に備える
         if not REQUEST_PATH.parent.exists():
@@ -38,6 +56,14 @@ class JsonRequestWatcher(QObject):
             # 空の request.json を作る（とりあえず action なしで）
             REQUEST_PATH.write_text("{}", encoding="utf-8")
 
+        # 起動前に残っていたリクエストは再実行しない
+        reset_journal(str(REQUEST_JOURNAL_PATH))
+        reset_journal(str(RESPONSE_JOURNAL_PATH))
+        # リクエストジャーナルを読むのはこのウォッチャーだけなので、読み終えたら切り詰める
+        self._journal = JournalReader(
+            str(REQUEST_JOURNAL_PATH), compact_bytes=COMPACT_BYTES
+        )
+
         self._add_watch_target()
 
         self.watcher.fileChanged.connect(self._on_file_changed)
@@ -46,44 +72,30 @@ class JsonRequestWatcher(QObject):
         # QFileSystemWatcher は、ファイルが置き換わると監視が外れることがあるため、
         # 監視対象が消えたら再登録する。
         paths = self.watcher.files()
-        if str(REQUEST_PATH) not in paths:
-            self.watcher.addPath(str(REQUEST_PATH))
+        if str(REQUEST_JOURNAL_PATH) not in paths:
+            self.watcher.addPath(str(REQUEST_JOURNAL_PATH))
 
     @Slot(str)
     def _on_file_changed(self, path: str):
         # 置き換え保存で監視が外れる場合があるので、毎回監視を張り直す
         self._add_watch_target()
 
-        # debounce：保存途中で読み込むと壊れることがあるので少し待つ
+        # イベントループに戻ってから処理する（連続イベントはまとめて1回）
         self.timer.start(self.debounce_ms)
 
-    def _read_json_safely(self) -> dict:
-        """
-        書き込み途中で壊れたJSONを読んでしまうのを避けるため、
-        失敗したら少し待って1回だけリトライする。
-        """
-        for i in range(2):
-            try:
-                text = REQUEST_PATH.read_text(encoding="utf-8")
-                if not text.strip():
-                    return {}
-                return json.loads(text)
-            except Exception:
-                if i == 0:
-                    # 1回だけ待って再挑戦
-                    QTimer.singleShot(80, lambda: None)
-                else:
-                    return {"action": "unknown", "__parse_error__": True}
-        return {}
-
     def _write_response(self, data: dict) -> None:
         if not RESPONSE_PATH.parent.exists():
             RESPONSE_PATH.parent.mkdir(parents=True, exist_ok=True)
-        RESPONSE_PATH.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        append_record(str(RESPONSE_JOURNAL_PATH), data, self.codec)
+        # 本文はジャーナルにだけ書き、response.json には最新のレスポンスの目印を書く
+        atomic_write_json(str(RESPONSE_PATH), latest_marker(data))
 
     def _process_request(self):
-        payload = self._read_json_safely()
+        # 追記されたリクエストをすべて到着順に処理する
+        for payload in self._journal.read_new():
+            self._process_one(payload)
 
+    def _process_one(self, payload: dict):
         # JSONが壊れてた場合のレスポンス
         if isinstance(payload, dict) and payload.get("__parse_error__"):
             self._write_response({
@@ -103,4 +115,6 @@ class JsonRequestWatcher(QObject):
             return
 
         result = handle_request(payload)
+        if payload.get("_request_id"):
+            result["_request_id"] = payload["_request_id"]
         self._write_response(result)
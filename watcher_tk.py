@@ -1,25 +1,67 @@
-import json
+import os
+import queue
+import tkinter as tk
+from concurrent.futures import Future
 from pathlib import Path
 
 from back_end.db.init import initialize_database
-from back_end.functions import handle_request
+from back_end.dispatcher import Dispatcher
+from ipc import inotify
+from ipc.atomic import atomic_write_json
+from ipc.codec import resolve_codec
+from ipc.journal import (
+    COMPACT_BYTES,
+    JournalReader,
+    append_record,
+    latest_marker,
+    reset_journal,
+)
+from ipc.memory import InProcessTransport
 
 REQUEST_PATH = Path("json/request.json")
 RESPONSE_PATH = Path("json/response.json")
+REQUEST_JOURNAL_PATH = Path("json/request.jsonl")
+RESPONSE_JOURNAL_PATH = Path("json/response.jsonl")
+
+# レスポンスジャーナルの既定エンコード方式（FREEDOM_IPC_CODEC で変更可）
+DEFAULT_RESPONSE_CODEC = "columnar"
 
 # デバッグモード（False にするとログが出ない）
 DEBUG = False
 
+# ワーカーで完了したリクエストを確認する間隔（ミリ秒）
+COMPLETION_POLL_MS = 20
+
 
 class JsonRequestWatcherTk:
     """
-    Tkinter の after() で request.json を監視し、
-    変更があれば handle_request(payload) を実行して response.json に書く。
+    Tkinter の after() で request.jsonl（リクエストジャーナル）を監視し、
+    追記されたリクエストを順に handle_request(payload) で処理して
+    response.jsonl に追記する（response.json には最新のレスポンスの目印だけを書く）。
+    インプロセス転送（self.transport）に積まれたリクエストも同じ周期で処理する。
+
+    Linux では inotify の fd を Tk の createfilehandler に登録し、
+    書き込み完了時だけ起床する。使えない環境では interval_ms ごとのポーリングに戻る。
+    レスポンスは codec（ipc.codec のコーデック名）でエンコードしてジャーナルに書く。
+
+    リクエストは Dispatcher（back_end/dispatcher.py）でワーカーに渡し、Tk のスレッドでは
+    handle_request を実行しない（読み込みは並列、書き込みは書き込みスレッドで直列）。
+    ジャーナル経由のリクエストは、完了したらキューに入り after() でジャーナルに書き出す。
+    インプロセス転送のリクエストは、完了した Future をフロントエンドが after() で受け取る。
     """
 
-    def __init__(self, tk_root, interval_ms: int = 100):
+    def __init__(
+        self,
+        tk_root,
+        interval_ms: int = 100,
+        use_inotify: bool = True,
+        codec: str | None = None,
+    ):
         self.root = tk_root
         self.interval_ms = interval_ms
+        self.codec = resolve_codec(
+            codec or os.environ.get("FREEDOM_IPC_CODEC", DEFAULT_RESPONSE_CODEC)
+        )
 
         initialize_database()
 
@@ -31,49 +73,146 @@ class JsonRequestWatcherTk:
         if not RESPONSE_PATH.exists():
             RESPONSE_PATH.write_text("{}", encoding="utf-8")
 
+        # 起動前に残っていたリクエストは再実行しない
+        reset_journal(str(REQUEST_JOURNAL_PATH))
+        reset_journal(str(RESPONSE_JOURNAL_PATH))
+        # リクエストジャーナルを読むのはこのウォッチャーだけなので、読み終えたら切り詰める
+        self._journal = JournalReader(
+            str(REQUEST_JOURNAL_PATH), compact_bytes=COMPACT_BYTES
+        )
+
         self._last_mtime = self._get_mtime()
-        self._debounce_id = None
 
-        # 監視開始
-        self._tick()
+        # アクションを実行するワーカーと、完了したジャーナル経由のリクエスト
+        self.dispatcher = Dispatcher().start()
+        self._completed: "queue.Queue[tuple[dict, Future]]" = queue.Queue()
+        self._completion_poll_id = None
+        self._tick_id = None
+
+        # ファイルを介さないインプロセス転送（request_handler.set_transport で有効化）
+        self.transport = InProcessTransport(self.dispatcher.submit)
+        self._drain_scheduled = False
+
+        self._inotify = self._start_inotify() if use_inotify else None
+        if self._inotify is not None:
+            # イベント駆動：書き込み完了時とインプロセス送信時だけ処理する
+            self.transport.on_submit = self._schedule_drain
+            self._process_pending()
+        else:
+            # 監視開始（ポーリング）
+            self._tick()
+
+    def close(self) -> None:
+        """ワーカーに渡した分を処理し終えてから止める"""
+        # ポーリングを止める（閉じた後にジャーナルを読み続けないように）
+        if self._tick_id is not None:
+            self.root.after_cancel(self._tick_id)
+            self._tick_id = None
+        if self._inotify is not None:
+            # fd を閉じる前に Tk から外す（閉じた fd で呼ばれないように）
+            try:
+                self.root.tk.deletefilehandler(self._inotify.fileno())
+            except (AttributeError, tk.TclError):
+                pass
+            self._inotify.close()
+            self._inotify = None
+        self.dispatcher.shutdown(timeout=10.0)
+        self._drain_completed()
+
+    def _on_completed(self, payload: dict, future: Future) -> None:
+        # ワーカーのスレッドから呼ばれるので、キューに入れるだけにする
+        self._completed.put((payload, future))
+
+    def _schedule_completion_poll(self) -> None:
+        if self._completion_poll_id is None:
+            self._completion_poll_id = self.root.after(
+                COMPLETION_POLL_MS, self._drain_completed
+            )
+
+    def _drain_completed(self) -> None:
+        """ワーカーで完了したリクエストのレスポンスを書き出す"""
+        self._completion_poll_id = None
+        while True:
+            try:
+                payload, future = self._completed.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {
+                    "ok": False,
+                    "action": "unknown",
+                    "error": {"code": "EXCEPTION", "message": str(e)},
+                }
+            self._finish_request(payload, result)
+        if self.dispatcher.pending() or not self._completed.empty():
+            self._schedule_completion_poll()
+
+    def _finish_request(self, payload: dict, result: dict) -> None:
+        # レスポンスにリクエストIDを含める
+        request_id = payload.get("_request_id")
+        if request_id:
+            result["_request_id"] = request_id
+        self._write_response(result)
+
+    def _start_inotify(self):
+        """inotify の監視を Tk のイベントループに登録する（失敗時は None）"""
+        if not inotify.is_available():
+            return None
+        try:
+            watcher = inotify.InotifyWatcher(
+                str(REQUEST_JOURNAL_PATH.parent), [REQUEST_JOURNAL_PATH.name]
+            )
+        except OSError:
+            return None
+        try:
+            self.root.tk.createfilehandler(
+                watcher.fileno(), tk.READABLE, self._on_inotify
+            )
+        except (AttributeError, tk.TclError):
+            watcher.close()
+            return None
+        return watcher
+
+    def _on_inotify(self, fd, mask) -> None:
+        if self._inotify is not None and self._inotify.read_events():
+            self._process_pending()
+
+    def _schedule_drain(self) -> None:
+        if self._drain_scheduled:
+            return
+        self._drain_scheduled = True
+        self.root.after_idle(self._drain_transport)
+
+    def _drain_transport(self) -> None:
+        self._drain_scheduled = False
+        self.transport.drain()
 
     def _get_mtime(self) -> float:
         try:
-            return REQUEST_PATH.stat().st_mtime
+            return REQUEST_JOURNAL_PATH.stat().st_mtime
         except FileNotFoundError:
             return 0.0
 
-    def _read_json_safely(self) -> dict:
-        # 保存途中の一瞬で壊れることがあるので2回読む
-        for _ in range(2):
-            try:
-                text = REQUEST_PATH.read_text(encoding="utf-8")
-                if not text.strip():
-                    return {}
-                return json.loads(text)
-            except Exception:
-                # 少し待ってリトライ（Tkinterのafterで待つ都合上、ここは素直に続行）
-                pass
-        return {"__parse_error__": True}
-
     def _write_response(self, data: dict) -> None:
-        RESPONSE_PATH.write_text(
-            json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8"
-        )
-
-    def _process_request(self) -> None:
+        append_record(str(RESPONSE_JOURNAL_PATH), data, self.codec)
+        # 本文はジャーナルにだけ書き、response.json には最新のレスポンスの目印を書く
+        atomic_write_json(str(RESPONSE_PATH), latest_marker(data))
+
+    def _process_pending(self) -> int:
+        """ジャーナルに追記されたリクエストをすべて到着順に処理する"""
+        payloads = self._journal.read_new()
+        for payload in payloads:
+            self._process_request(payload)
+        return len(payloads)
+
+    def _process_request(self, payload: dict) -> None:
         import time
         import sys
         from datetime import datetime
 
         try:
-            print(
-                f"[{datetime.now()}] _process_request started",
-                file=sys.stderr,
-                flush=True,
-            )
-
-            payload = self._read_json_safely()
             print(
                 f"[{datetime.now()}] Payload read: {payload}",
                 file=sys.stderr,
@@ -111,23 +250,10 @@ class JsonRequestWatcherTk:
                 flush=True,
             )
 
-            result = handle_request(payload)
-            print(
-                f"[{datetime.now()}] handle_request returned: {result}",
-                file=sys.stderr,
-                flush=True,
-            )
-
-            # レスポンスにリクエストIDを含める
-            if request_id:
-                result["_request_id"] = request_id
-
-            self._write_response(result)
-            print(
-                f"[{datetime.now()}] Response written successfully",
-                file=sys.stderr,
-                flush=True,
-            )
+            # ワーカーで実行する。完了したら _drain_completed が書き出す
+            future = self.dispatcher.submit(payload)
+            future.add_done_callback(lambda f, p=payload: self._on_completed(p, f))
+            self._schedule_completion_poll()
 
         except Exception as e:
             import traceback
@@ -135,22 +261,27 @@ class JsonRequestWatcherTk:
             print(f"[{datetime.now()}] Exception: {e}", file=sys.stderr, flush=True)
             print(traceback.format_exc(), file=sys.stderr, flush=True)
             # ★ここが重要：どんな例外でも response.json に出す
-            self._write_response(
-                {
-                    "ok": False,
-                    "action": "unknown",
-                    "error": {"code": "EXCEPTION", "message": str(e)},
-                }
-            )
+            error_response = {
+                "ok": False,
+                "action": "unknown",
+                "error": {"code": "EXCEPTION", "message": str(e)},
+            }
+            # 待機中の呼び出し元がタイムアウトしないようリクエストIDを付ける
+            if isinstance(payload, dict) and payload.get("_request_id"):
+                error_response["_request_id"] = payload["_request_id"]
+            self._write_response(error_response)
 
     def _tick(self) -> None:
         import sys
         from datetime import datetime
 
+        # 待機されずに積まれたインプロセスリクエストを処理
+        self.transport.drain()
+
         mtime = self._get_mtime()
 
-        # 変更検知
-        if mtime != self._last_mtime:
+        # 変更検知（同じ mtime 内に複数回追記されても未読分があれば処理する）
+        if mtime != self._last_mtime or self._journal.has_new_data():
             print(
                 f"[{datetime.now()}] [_tick] File change detected! mtime: {mtime}, last: {self._last_mtime}",
                 file=sys.stderr,
@@ -159,21 +290,9 @@ class JsonRequestWatcherTk:
             self._last_mtime = mtime
 
             # 即座に処理（debounce は廃止）
-            self._process_request()
+            self._process_pending()
         else:
             # ログを少なく出すため、変更がない場合はスキップ
             pass
 
-        self.root.after(self.interval_ms, self._tick)
-
-    def _debounced_process(self) -> None:
-        import sys
-        from datetime import datetime
-
-        print(
-            f"[{datetime.now()}] [_debounced_process] Started",
-            file=sys.stderr,
-            flush=True,
-        )
-        self._debounce_id = None
-        self._process_request()
+        self._tick_id = self.root.after(self.interval_ms, self._tick)